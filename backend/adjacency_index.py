@@ -0,0 +1,147 @@
+import os
+import hashlib
+import numpy as np
+
+from backend.utils import cache_path
+from backend.archives import source_signature
+
+
+class AdjacencyIndex:
+    """
+    Kompakter Adjazenzindex im CSR-Format.
+
+    Knoten werden auf 0..n-1 abgebildet; die Nachbarn von Knoten i stehen in
+    indices[indptr[i]:indptr[i+1]]. Mehrfachkanten werden zusammengefasst und
+    Schleifen entfernt. Ungerichtete Indizes enthalten jede Kante in beide Richtungen,
+    gerichtete Indizes nur die ausgehenden Kanten.
+    """
+
+    def __init__(self, nodes, indptr, indices, directed=False):
+        self.nodes = list(nodes)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.directed = directed
+        self._positions = None
+
+    @classmethod
+    def from_graph(cls, G, directed=False):
+        """
+        Baut den Index aus einem NetworkX-Graphen. Mit directed=False werden die
+        Kantenrichtungen ignoriert (zugrunde liegender ungerichteter Graph).
+        """
+        nodes = list(G.nodes())
+        position = {n: i for i, n in enumerate(nodes)}
+        edges = np.array([(position[u], position[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+        directed = directed and G.is_directed()
+        return cls.from_edge_array(nodes, edges, directed=directed)
+
+    @classmethod
+    def from_edge_array(cls, nodes, edges, directed=False):
+        """
+        Baut den Index aus einem Kantenarray der Form (m, 2) mit Knotenpositionen.
+        """
+        n = len(nodes)
+        src, dst = edges[:, 0], edges[:, 1]
+        if not directed:
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        keep = src != dst
+        keys = np.unique(src[keep] * max(n, 1) + dst[keep])
+        src, dst = keys // max(n, 1), keys % max(n, 1)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        return cls(nodes, indptr, dst, directed=directed)
+
+    @property
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def position(self, node):
+        """
+        Position (0..n-1) eines Knotennamens oder None.
+        """
+        if self._positions is None:
+            self._positions = {str(n): i for i, n in enumerate(self.nodes)}
+        return self._positions.get(str(node))
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbors_of(self, ids):
+        """
+        Alle Nachbarn (mit Wiederholungen) einer Menge von Knotenpositionen, vektorisiert.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return np.zeros(0, dtype=np.int64)
+        starts, ends = self.indptr[ids], self.indptr[ids + 1]
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return self.indices[np.arange(lengths.sum()) + offsets]
+
+    def structure_hash(self):
+        """
+        Hash der Struktur (Knotennamen, Richtung und Kanten), unabhängig von Datei und
+        Attributen; Schlüssel für zwischengespeicherte Berechnungen je Graph.
+        """
+        digest = hashlib.sha1()
+        digest.update(b"directed" if self.directed else b"undirected")
+        digest.update("\x00".join(str(n) for n in self.nodes).encode("utf-8"))
+        digest.update(self.indptr.tobytes())
+        digest.update(self.indices.tobytes())
+        return digest.hexdigest()
+
+    def to_scipy(self):
+        """
+        Adjazenzmatrix als scipy.sparse.csr_array (Einträge 1.0).
+        """
+        from scipy.sparse import csr_array
+        n = self.number_of_nodes
+        data = np.ones(len(self.indices), dtype=float)
+        return csr_array((data, self.indices, self.indptr), shape=(n, n))
+
+    def save(self, path):
+        np.savez(path, nodes=np.array([str(n) for n in self.nodes]), indptr=self.indptr,
+                 indices=self.indices, directed=np.array(self.directed))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["nodes"].tolist(), data["indptr"], data["indices"],
+                       directed=bool(data["directed"]))
+
+
+def _index_cache_file(graph_path):
+    return cache_path("adjacency", source_signature(graph_path), ".npz")
+
+
+def load_cached_index(graph_path):
+    """
+    Lädt den vorberechneten Index einer Graphdatei, falls er zur aktuellen Dateiversion passt.
+    """
+    try:
+        cache_file = _index_cache_file(graph_path)
+    except OSError:
+        return None
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        return AdjacencyIndex.load(cache_file)
+    except Exception as e:
+        print("Fehler beim Laden des Adjazenzindex:", e)
+        return None
+
+
+def build_cached_index(graph_path, G):
+    """
+    Baut den Index aus dem bereits geladenen Graphen und speichert ihn für spätere Aufrufe.
+    """
+    index = AdjacencyIndex.from_graph(G)
+    try:
+        index.save(_index_cache_file(graph_path))
+    except OSError as e:
+        print("Adjazenzindex konnte nicht gespeichert werden:", e)
+    return index
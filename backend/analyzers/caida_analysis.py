@@ -2,13 +2,15 @@ import os
 import networkx as nx
 import json
 try:
-    from backend.database_handler import save_analysis_results
+    from backend.database_handler import save_analysis_results, save_metric_timings, save_deferred_metrics
 except ModuleNotFoundError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-    from backend.database_handler import save_analysis_results
+    from backend.database_handler import save_analysis_results, save_metric_timings, save_deferred_metrics
+from backend.archives import read_graph
+from backend.metrics import MetricTimer
 
-def analyze_graph(graph_file, project_name="CAIDA", database_path="./network_analysis.db"):
+def analyze_graph(graph_file, project_name="CAIDA", database_path="./network_analysis.db", file_name=None, precomputed=None, source_path=None):
     """
     Analysiert eine einzelne GraphML-Datei aus dem CAIDA-Datensatz und speichert die Ergebnisse
     in der SQLite-Datenbank. Die Ergebnisse werden auch als Dictionary zurückgegeben.
@@ -17,19 +19,29 @@ def analyze_graph(graph_file, project_name="CAIDA", database_path="./network_ana
       graph_file (str): Pfad zur GraphML-Datei, die analysiert werden soll.
       project_name (str): Name des Projekts oder der Datenquelle (Standard: "CAIDA").
       database_path (str): Pfad zur SQLite-Datenbank.
+      file_name (str): Optional, Name für die DB (z. B. Mitgliedsverweis "archiv.zip!datei.graphml");
+                       sonst der Dateiname von graph_file.
+      precomputed (dict): Optional, bereits in anderen Worker-Prozessen berechnete Metriken
+                          (Name -> Wert, siehe backend/metrics.py).
+      source_path (str): Optional, Pfad bzw. Mitgliedsverweis, unter dem zurückgestellte Metriken
+                         den Graphen erneut einlesen (Standard: graph_file).
       
     Rückgabe:
       dict: Ein Dictionary mit den berechneten Netzwerkmetriken.
     """
+    metrics = MetricTimer(precomputed)
     try:
         # Graph einlesen
-        G = nx.read_graphml(graph_file)
+        G = metrics.time("read_graph", read_graph, graph_file)
 
         
 
         # Basis-Metriken
         number_of_nodes = G.number_of_nodes()
         number_of_edges = G.number_of_edges()
+        # Metriken laufen auf der zwischengespeicherten einfachen Sicht (Mehrfachkanten
+        # zusammengefasst, ohne externe Nachbarn, siehe backend/graph_views.py)
+        H = metrics.view(G)
         print("Number of nodes:", number_of_nodes)
         print("Number of edges:", number_of_edges)
 
@@ -39,67 +51,129 @@ def analyze_graph(graph_file, project_name="CAIDA", database_path="./network_ana
         print("Is the graph directed?", is_directed)
 
         # Konnektivitäts-Metriken
-        is_strongly_connected = nx.is_strongly_connected(G)
-        is_weakly_connected = nx.is_weakly_connected(G)
+        is_strongly_connected = nx.is_strongly_connected(H)
+        is_weakly_connected = nx.is_weakly_connected(H)
+        # Komponenten einmal extrahieren; Distanzmetriken laufen auf der größten
+        components = metrics.components(G)
+        print("Components:", components["number_of_components"], "- largest:", components["largest_component_size"])
         print("The graph is strongly connected:", is_strongly_connected)
         print("The graph is weakly connected:", is_weakly_connected)
 
-        node_connectivity = nx.node_connectivity(G) 
-        edge_connectivity = nx.edge_connectivity(G) 
+        node_connectivity, node_connectivity_method = metrics.compute("node_connectivity", H)
+        edge_connectivity, edge_connectivity_method = metrics.compute("edge_connectivity", H)
         print("Node connectivity:", node_connectivity)
         print("Edge connectivity:", edge_connectivity)
 
         # Multigraph-Check und Planarität
         is_multigraph = isinstance(G, nx.MultiDiGraph)
-        is_planar, _ = nx.check_planarity(G)
+        is_planar, _ = metrics.compute("is_planar", H)
         print("G is a MultiDiGraph:", is_multigraph)
         print("Is the graph planar:", is_planar)
 
-        # Strukturmetriken für stark verbundene Graphen
-        if is_strongly_connected:
-            is_tree = nx.is_tree(G)
-            is_forest = nx.is_forest(G)
-            diameter = nx.diameter(G)
-            graph_radius = nx.radius(G)
-            is_bipartite = nx.is_bipartite(G)
-            print("Is the graph a tree?", is_tree)
-            print("Is the graph a forest?", is_forest)
-            print("Diameter:", diameter)
-            print("Radius:", graph_radius)
-            print("Is the graph bipartite?", is_bipartite)
-        else:
-            is_tree = is_forest = diameter = graph_radius = is_bipartite = "N/A"
+        # Durchmesser und Radius (bei fehlendem starkem Zusammenhang auf der größten
+        # stark zusammenhängenden Komponente, siehe backend/graph_views.py)
+        diameter = metrics.compute("diameter", H)
+        graph_radius = metrics.compute("radius", H)
+        print("Diameter:", diameter)
+        print("Radius:", graph_radius)
+
+        # Strukturmetriken (auch für nicht zusammenhängende Graphen definiert)
+        is_tree = nx.is_tree(H)
+        is_forest = nx.is_forest(H)
+        is_bipartite = nx.is_bipartite(H)
+        print("Is the graph a tree?", is_tree)
+        print("Is the graph a forest?", is_forest)
+        print("Is the graph bipartite?", is_bipartite)
 
         # Dichte
-        density = nx.density(G)
+        density = nx.density(H)
         print("Density:", density)
 
+        # Distanzverteilung (Hop-Plot, effektiver Durchmesser), große Graphen per HyperANF geschätzt
+        effective_diameter, effective_diameter_error = metrics.compute("effective_diameter", H)
+        average_distance, average_distance_error = metrics.compute("average_distance", H)
+        approx_global_efficiency, approx_global_efficiency_error = metrics.compute("approx_global_efficiency", H)
+        hop_plot, hop_plot_error = metrics.compute("hop_plot", H)
+        print("Effective diameter:", effective_diameter, "±", effective_diameter_error)
+
+        # Spektrale Kennzahlen (ungerichteter einfacher Graph, siehe backend/spectral.py)
+        algebraic_connectivity = metrics.compute("algebraic_connectivity", H)
+        spectral_radius = metrics.compute("spectral_radius", H)
+        spectral_gap = metrics.compute("spectral_gap", H)
+        natural_connectivity = metrics.compute("natural_connectivity", H)
+        eigenvector_centrality = metrics.compute("eigenvector_centrality", H)
+        print("Algebraic connectivity:", algebraic_connectivity, "- spectral radius:", spectral_radius)
+
+        # k-Core-Zerlegung, Rich-Club und Assortativität (siehe backend/structure.py)
+        coreness = metrics.compute("coreness", H)
+        degeneracy = metrics.compute("degeneracy", H)
+        rich_club = metrics.compute("rich_club", H)
+        degree_assortativity = metrics.compute("degree_assortativity", H)
+        print("Degeneracy:", degeneracy, "- assortativity:", degree_assortativity)
+
+        # Communities (Louvain/Leiden, je Graph zwischengespeichert, siehe backend/communities.py)
+        communities = metrics.compute("communities", H)
+        modularity = metrics.compute("modularity", H)
+        number_of_communities = metrics.compute("number_of_communities", H)
+        print("Communities:", number_of_communities, "- modularity:", modularity)
+
         # Ergebnisse zusammenfassen
         results = {
             "project_name": project_name,
-            "file_name": os.path.basename(graph_file),
+            "file_name": file_name or os.path.basename(str(graph_file)),
             "is_directed": is_directed,
             "number_of_nodes": number_of_nodes,
             "number_of_edges": number_of_edges,
             "is_strongly_connected": is_strongly_connected,
             "is_weakly_connected": is_weakly_connected,
+            "number_of_components": components["number_of_components"],
+            "largest_component_size": components["largest_component_size"],
+            "component_sizes": components["component_sizes"],
+            "strong_component_sizes": components["strong_component_sizes"],
             "node_connectivity": node_connectivity,
             "edge_connectivity": edge_connectivity,
+            "node_connectivity_method": node_connectivity_method,
+            "edge_connectivity_method": edge_connectivity_method,
             "is_multigraph": is_multigraph,
             "is_planar": is_planar,
             "is_tree": is_tree,
             "is_forest": is_forest,
             "diameter": diameter,
             "radius": graph_radius,
+            "effective_diameter": effective_diameter,
+            "effective_diameter_error": effective_diameter_error,
+            "average_distance": average_distance,
+            "average_distance_error": average_distance_error,
+            "approx_global_efficiency": approx_global_efficiency,
+            "approx_global_efficiency_error": approx_global_efficiency_error,
+            "hop_plot": json.dumps(hop_plot),
+            "hop_plot_error": hop_plot_error,
+            "algebraic_connectivity": algebraic_connectivity,
+            "spectral_radius": spectral_radius,
+            "spectral_gap": spectral_gap,
+            "natural_connectivity": natural_connectivity,
+            "eigenvector_centrality": json.dumps(eigenvector_centrality),
+            "coreness": json.dumps(coreness),
+            "degeneracy": degeneracy,
+            "rich_club": json.dumps(rich_club),
+            "degree_assortativity": degree_assortativity,
+            "communities": json.dumps(communities),
+            "modularity": modularity,
+            "number_of_communities": number_of_communities,
             "is_bipartite": is_bipartite,
             "density": density,
         }
 
+        # Zurückgestellte Metriken (Ingest-Profil) bleiben leer, bis sie angefordert werden
+        metrics.mark_pending(results)
         # Speichere  Ergebnisse in der SQLite-Datenbank
-        save_analysis_results(database_path, results)
+        result_id = save_analysis_results(database_path, results)
+        save_deferred_metrics(database_path, result_id, source_path or graph_file, metrics.pending)
+        # Laufzeiten je Metrik für das Kostenmodell des Schedulers
+        save_metric_timings(database_path, number_of_nodes, number_of_edges, metrics.timings)
 
         return results
 
     except Exception as e:
         print(f"Fehler bei der Analyse von {graph_file}: {e}")
-        return {"project_name": project_name, "file_name": os.path.basename(graph_file), "error": str(e)}
+        return {"project_name": project_name, "file_name": file_name or os.path.basename(str(graph_file)), "error": str(e)}
@@ -2,13 +2,15 @@ import os
 import networkx as nx
 import json
 try:
-    from backend.database_handler import save_analysis_results
+    from backend.database_handler import save_analysis_results, save_metric_timings, save_deferred_metrics
 except ModuleNotFoundError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-    from backend.database_handler import save_analysis_results
+    from backend.database_handler import save_analysis_results, save_metric_timings, save_deferred_metrics
+from backend.archives import read_graph
+from backend.metrics import MetricTimer
 
-def analyze_graph(graph_file, project_name="Topology Zoo", database_path="./network_analysis.db"):
+def analyze_graph(graph_file, project_name="Topology Zoo", database_path="./network_analysis.db", file_name=None, precomputed=None, source_path=None):
     """
     Analysiert eine einzelne GraphML-Datei und speichert die Ergebnisse in der SQLite-Datenbank.
     Zusätzlich wird ein Ergebnis-Dictionary erzeugt, das später auch für den JSON-Export genutzt werden kann.
@@ -17,18 +19,28 @@ def analyze_graph(graph_file, project_name="Topology Zoo", database_path="./netw
       graph_file (str): Pfad zur GraphML-Datei, die analysiert werden soll.
       project_name (str): Name des Projekts oder der Datenquelle (Default: "Topology Zoo").
       database_path (str): Pfad zur SQLite-Datenbank.
+      file_name (str): Optional, Name für die DB (z. B. Mitgliedsverweis "archiv.zip!datei.graphml");
+                       sonst der Dateiname von graph_file.
+      precomputed (dict): Optional, bereits in anderen Worker-Prozessen berechnete Metriken
+                          (Name -> Wert, siehe backend/metrics.py).
+      source_path (str): Optional, Pfad bzw. Mitgliedsverweis, unter dem zurückgestellte Metriken
+                         den Graphen erneut einlesen (Standard: graph_file).
     
     Rückgabe:
       dict: Ein Dictionary mit den berechneten Netzwerkmetriken.
     """
+    metrics = MetricTimer(precomputed)
     try:
         # Lese den Graph aus der GraphML-Datei
-        G = nx.read_graphml(graph_file)
+        G = metrics.time("read_graph", read_graph, graph_file)
         print(f"Analysiere Datei: {graph_file}")
         
         # Knoten und Kanten
         number_of_nodes = G.number_of_nodes()
         number_of_edges = G.number_of_edges()
+        # Metriken laufen auf der zwischengespeicherten einfachen Sicht (Mehrfachkanten
+        # zusammengefasst, ohne externe Nachbarn, siehe backend/graph_views.py)
+        H = metrics.view(G)
         print("Number of nodes:", number_of_nodes)
         print("Number of edges:", number_of_edges)
 
@@ -38,58 +50,121 @@ def analyze_graph(graph_file, project_name="Topology Zoo", database_path="./netw
         print("Is the graph directed?", is_directed)
         
         # Konnektivität (nur für ungerichtete Graphen)
-        is_connected = nx.is_connected(G) 
+        is_connected = nx.is_connected(H) 
+        # Komponenten einmal extrahieren; Distanzmetriken laufen auf der größten
+        components = metrics.components(G)
+        print("Components:", components["number_of_components"], "- largest:", components["largest_component_size"])
         print("The graph is connected:", is_connected)
-        node_connectivity = nx.node_connectivity(G) 
-        edge_connectivity = nx.edge_connectivity(G) 
+        node_connectivity, node_connectivity_method = metrics.compute("node_connectivity", H)
+        edge_connectivity, edge_connectivity_method = metrics.compute("edge_connectivity", H)
         
-        # Effizienz
-        global_efficiency = nx.global_efficiency(G) 
-        local_efficiency = nx.local_efficiency(G)
+        # Effizienz und Clustering (Dreieckszählen, siehe backend/triangles.py)
+        global_efficiency = metrics.compute("global_efficiency", H) 
+        local_efficiency = metrics.compute("local_efficiency", H)
+        average_clustering = metrics.compute("average_clustering", H)
+        transitivity = metrics.compute("transitivity", H)
         
         # Zentralitätsmetriken
-        graph_center = nx.center(G) 
-        degree_centrality = nx.degree_centrality(G)
-        betweenness_centrality = nx.betweenness_centrality(G)
-        closeness_centrality = nx.closeness_centrality(G)
+        graph_center = metrics.compute("graph_center", H) 
+        degree_centrality = nx.degree_centrality(H)
+        betweenness_centrality = metrics.compute("betweenness_centrality", H)
+        edge_betweenness = metrics.compute("edge_betweenness", H)
+        closeness_centrality = metrics.compute("closeness_centrality", H)
         
         # PageRank
-        pagerank = nx.pagerank(G)
+        pagerank = metrics.compute("pagerank", H)
         
         # Graphstruktur
-        diameter = nx.diameter(G) 
-        graph_radius = nx.radius(G) 
-        graph_periphery = nx.periphery(G) 
+        diameter = metrics.compute("diameter", H) 
+        graph_radius = metrics.compute("radius", H) 
+        graph_periphery = metrics.compute("periphery", H) 
         
         # Baum- und Waldstruktur (nur für ungerichtete Graphen)
-        is_tree = nx.is_tree(G) 
-        is_forest = nx.is_forest(G) 
+        is_tree = nx.is_tree(H) 
+        is_forest = nx.is_forest(H) 
         
         # Weitere Eigenschaften
-        is_bipartite = nx.is_bipartite(G)
-        is_planar, embedding = nx.check_planarity(G)
+        is_bipartite = nx.is_bipartite(H)
+        is_planar, embedding = metrics.compute("is_planar", H)
         is_multigraph = isinstance(G, nx.MultiGraph)
-        density = nx.density(G)
+        density = nx.density(H)
         
+        # Distanzverteilung (Hop-Plot, effektiver Durchmesser), große Graphen per HyperANF geschätzt
+        effective_diameter, effective_diameter_error = metrics.compute("effective_diameter", H)
+        average_distance, average_distance_error = metrics.compute("average_distance", H)
+        approx_global_efficiency, approx_global_efficiency_error = metrics.compute("approx_global_efficiency", H)
+        hop_plot, hop_plot_error = metrics.compute("hop_plot", H)
+        print("Effective diameter:", effective_diameter, "±", effective_diameter_error)
+
+        # Spektrale Kennzahlen (ungerichteter einfacher Graph, siehe backend/spectral.py)
+        algebraic_connectivity = metrics.compute("algebraic_connectivity", H)
+        spectral_radius = metrics.compute("spectral_radius", H)
+        spectral_gap = metrics.compute("spectral_gap", H)
+        natural_connectivity = metrics.compute("natural_connectivity", H)
+        eigenvector_centrality = metrics.compute("eigenvector_centrality", H)
+        print("Algebraic connectivity:", algebraic_connectivity, "- spectral radius:", spectral_radius)
+
+        # k-Core-Zerlegung, Rich-Club und Assortativität (siehe backend/structure.py)
+        coreness = metrics.compute("coreness", H)
+        degeneracy = metrics.compute("degeneracy", H)
+        rich_club = metrics.compute("rich_club", H)
+        degree_assortativity = metrics.compute("degree_assortativity", H)
+        print("Degeneracy:", degeneracy, "- assortativity:", degree_assortativity)
+
+        # Communities (Louvain/Leiden, je Graph zwischengespeichert, siehe backend/communities.py)
+        communities = metrics.compute("communities", H)
+        modularity = metrics.compute("modularity", H)
+        number_of_communities = metrics.compute("number_of_communities", H)
+        print("Communities:", number_of_communities, "- modularity:", modularity)
+
         # Ergebnisse zusammenstellen
         results = {
             "project_name": project_name,
-            "file_name": os.path.basename(graph_file),
+            "file_name": file_name or os.path.basename(str(graph_file)),
             "is_directed": is_directed,
             "number_of_nodes": number_of_nodes,
             "number_of_edges": number_of_edges,
             "is_connected": is_connected,
+            "number_of_components": components["number_of_components"],
+            "largest_component_size": components["largest_component_size"],
+            "component_sizes": components["component_sizes"],
+            "strong_component_sizes": components["strong_component_sizes"],
             "node_connectivity": node_connectivity,
             "edge_connectivity": edge_connectivity,
+            "node_connectivity_method": node_connectivity_method,
+            "edge_connectivity_method": edge_connectivity_method,
             "global_efficiency": global_efficiency,
             "local_efficiency": local_efficiency,
+            "average_clustering": average_clustering,
+            "transitivity": transitivity,
             "graph_center": json.dumps(graph_center),
             "degree_centrality": json.dumps(degree_centrality),
             "betweenness_centrality": json.dumps(betweenness_centrality),
+            "edge_betweenness": json.dumps(edge_betweenness),
             "closeness_centrality": json.dumps(closeness_centrality),
             "pagerank": json.dumps(pagerank),
             "diameter": diameter,
             "radius": graph_radius,
+            "effective_diameter": effective_diameter,
+            "effective_diameter_error": effective_diameter_error,
+            "average_distance": average_distance,
+            "average_distance_error": average_distance_error,
+            "approx_global_efficiency": approx_global_efficiency,
+            "approx_global_efficiency_error": approx_global_efficiency_error,
+            "hop_plot": json.dumps(hop_plot),
+            "hop_plot_error": hop_plot_error,
+            "algebraic_connectivity": algebraic_connectivity,
+            "spectral_radius": spectral_radius,
+            "spectral_gap": spectral_gap,
+            "natural_connectivity": natural_connectivity,
+            "eigenvector_centrality": json.dumps(eigenvector_centrality),
+            "coreness": json.dumps(coreness),
+            "degeneracy": degeneracy,
+            "rich_club": json.dumps(rich_club),
+            "degree_assortativity": degree_assortativity,
+            "communities": json.dumps(communities),
+            "modularity": modularity,
+            "number_of_communities": number_of_communities,
             "periphery": json.dumps(graph_periphery),
             "density": density,
             "is_tree": is_tree,
@@ -99,11 +174,16 @@ def analyze_graph(graph_file, project_name="Topology Zoo", database_path="./netw
             "is_multigraph": is_multigraph
         }
         
+        # Zurückgestellte Metriken (Ingest-Profil) bleiben leer, bis sie angefordert werden
+        metrics.mark_pending(results)
         # Speichere Ergebnisse in SQLite-Datenbank
-        save_analysis_results(database_path, results)
+        result_id = save_analysis_results(database_path, results)
+        save_deferred_metrics(database_path, result_id, source_path or graph_file, metrics.pending)
+        # Laufzeiten je Metrik für das Kostenmodell des Schedulers
+        save_metric_timings(database_path, number_of_nodes, number_of_edges, metrics.timings)
         
         return results
 
     except Exception as e:
         print(f"Fehler bei der Analyse von {graph_file}: {e}")
-        return {"project_name": project_name, "file_name": os.path.basename(graph_file), "error": str(e)}
+        return {"project_name": project_name, "file_name": file_name or os.path.basename(str(graph_file)), "error": str(e)}
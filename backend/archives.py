@@ -0,0 +1,148 @@
+import os
+import io
+import hashlib
+import tarfile
+import zipfile
+
+from backend.utils import cache_path, file_signature
+
+# Unterstützte Archivformate (Endungen in Kleinbuchstaben)
+ARCHIVE_EXTENSIONS = (".zip", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2")
+
+# Endungen der Archivmitglieder, die verarbeitet werden (wie beim direkten Upload)
+MEMBER_EXTENSIONS = (".graphml", ".xml", ".cch", ".txt")
+
+# Trennzeichen zwischen Archivpfad und Mitgliedsname, z. B.
+#   temp_uploads/topologyzoo.zip!Abilene.graphml
+# So verweisen File_name in der DB und die Visualisierung direkt auf das Mitglied im Archiv.
+MEMBER_SEPARATOR = "!"
+
+
+def is_archive(path):
+    return str(path).lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def member_ref(archive_path, member):
+    return f"{archive_path}{MEMBER_SEPARATOR}{member}"
+
+
+def split_member_ref(path):
+    """
+    Zerlegt einen Mitgliedsverweis in (Archivpfad, Mitgliedsname).
+    Für normale Dateipfade wird (None, path) zurückgegeben.
+    """
+    path = str(path)
+    if MEMBER_SEPARATOR in path:
+        archive_path, member = path.split(MEMBER_SEPARATOR, 1)
+        if is_archive(archive_path):
+            return archive_path, member
+    return None, path
+
+
+def graphml_member_name(member):
+    """
+    Name, unter dem ein Mitglied nach der Konvertierung geführt wird (Endung .graphml).
+    """
+    return os.path.splitext(member)[0] + ".graphml"
+
+
+def converted_member_path(archive_path, member):
+    """
+    Ablageort der konvertierten GraphML-Datei eines Archivmitglieds im Cache.
+    Nur das Konvertierungsergebnis wird geschrieben, nie das Rohmitglied selbst.
+    """
+    key = hashlib.sha1(f"{file_signature(archive_path)}|{graphml_member_name(member)}".encode("utf-8")).hexdigest()
+    return cache_path("archives", key, ".graphml")
+
+
+def _is_supported_member(name):
+    return name.lower().endswith(MEMBER_EXTENSIONS) and not os.path.basename(name).startswith(".")
+
+
+def list_members(archive_path):
+    """
+    Namen aller verarbeitbaren Mitglieder eines Archivs.
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            return [info.filename for info in archive.infolist()
+                    if not info.is_dir() and _is_supported_member(info.filename)]
+    with tarfile.open(archive_path, "r:*") as archive:
+        return [info.name for info in archive if info.isfile() and _is_supported_member(info.name)]
+
+
+def iter_member_data(archive_path):
+    """
+    Liest die Mitglieder eines Archivs nacheinander (gestreamt, ohne Entpacken auf die Platte).
+    tar-Archive werden dabei genau einmal sequenziell durchlaufen.
+
+    Liefert:
+      tuple: (Mitgliedsname, Inhalt als bytes)
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_supported_member(info.filename):
+                    continue
+                with archive.open(info) as member:
+                    yield info.filename, member.read()
+        return
+    with tarfile.open(archive_path, "r|*") as archive:
+        for info in archive:
+            if not info.isfile() or not _is_supported_member(info.name):
+                continue
+            member = archive.extractfile(info)
+            yield info.name, member.read()
+
+
+def open_member(archive_path, member):
+    """
+    Öffnet ein einzelnes Mitglied als Binärstrom.
+    """
+    if archive_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            return io.BytesIO(archive.read(member))
+    with tarfile.open(archive_path, "r:*") as archive:
+        return io.BytesIO(archive.extractfile(member).read())
+
+
+def _resolve_member(archive_path, member):
+    """
+    Liefert eine lesbare GraphML-Quelle für ein Mitglied: konvertierte Mitglieder liegen
+    im Cache, GraphML-Mitglieder werden direkt aus dem Archiv gelesen.
+    """
+    converted = converted_member_path(archive_path, member)
+    if os.path.exists(converted):
+        return converted
+    return open_member(archive_path, member)
+
+
+def read_graph(source):
+    """
+    Liest einen Graphen aus einer GraphML-Datei, einem Archivmitglied (Mitgliedsverweis)
+    oder einem bereits geöffneten Binärstrom.
+    """
+    # Import erst hier, damit das Modul beim GUI-Start (Upload-Staging) leichtgewichtig bleibt
+    import networkx as nx
+
+    if not isinstance(source, str):
+        return nx.read_graphml(source)
+    archive_path, member = split_member_ref(source)
+    if archive_path is None:
+        return nx.read_graphml(source)
+    return nx.read_graphml(_resolve_member(archive_path, member))
+
+
+def source_exists(path):
+    archive_path, _ = split_member_ref(path)
+    return os.path.exists(archive_path or path)
+
+
+def source_signature(path):
+    """
+    Wie utils.file_signature, für Mitgliedsverweise aus Archiv-Signatur und Mitgliedsname.
+    """
+    archive_path, member = split_member_ref(path)
+    if archive_path is None:
+        return file_signature(path)
+    return hashlib.sha1(f"{file_signature(archive_path)}|{member}".encode("utf-8")).hexdigest()
@@ -0,0 +1,191 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+# Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne)
+WORKERS_ENV = "NETWORK_ANALYZER_BETWEENNESS_WORKERS"
+# Kleinere Graphen werden im aufrufenden Prozess berechnet (Start der Worker lohnt nicht)
+PARALLEL_NODE_LIMIT = 2000
+# Obergrenze für die Kanten des Kürzeste-Wege-DAGs eines Quellenblocks (Speicher je Worker)
+BATCH_ARCS = 2_000_000
+# Quellenblöcke je Worker-Prozess (Lastausgleich bei ungleich teuren Quellen)
+TASKS_PER_WORKER = 4
+
+# Im Worker-Prozess eingeblendeter Adjazenzindex (siehe _attach)
+_shared = {}
+
+
+def _expand(indptr, frontier):
+    """
+    Positionen aller ausgehenden Kanten der Knoten in frontier im CSR-Array indices,
+    zusammen mit dem Index des jeweiligen Frontier-Eintrags.
+    """
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    owner = np.repeat(np.arange(len(frontier)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return starts[owner] + offsets, owner
+
+
+def accumulate(indptr, indices, sources, batch=None):
+    """
+    Brandes-Akkumulation für mehrere Quellen gleichzeitig: Breitensuche ebenenweise für
+    einen Block von Quellen (Paare Knoten x Quelle als flache Arrays), danach Rücklauf
+    über die gespeicherten Ebenen des Kürzeste-Wege-DAGs. Jede Kante des DAGs liefert
+    ihren Anteil sowohl an der Abhängigkeit des Vorgängers (Knoten-Betweenness) als auch
+    an der Kanten-Betweenness.
+
+    Parameter:
+      indptr, indices (np.ndarray): Adjazenzindex im CSR-Format (ausgehende Kanten).
+      sources (np.ndarray): Knotenpositionen der Quellen.
+      batch (int): Quellen je Block (Standard: aus BATCH_ARCS).
+
+    Rückgabe:
+      tuple: (Abhängigkeiten je Knoten, Anteile je CSR-Kante), nicht normiert
+    """
+    n, arcs = len(indptr) - 1, len(indices)
+    vertex = np.zeros(n)
+    edge = np.zeros(arcs)
+    if batch is None:
+        batch = max(1, min(256, BATCH_ARCS // max(arcs, 1)))
+    for start in range(0, len(sources), batch):
+        block = np.asarray(sources[start:start + batch], dtype=np.int64)
+        k = len(block)
+        dist = np.full(n * k, -1, dtype=np.int32)
+        sigma = np.zeros(n * k)
+        # Paare (Knoten, Quelle) als flacher Schlüssel Knoten * k + Quelle
+        frontier = block * k + np.arange(k)
+        dist[frontier] = 0
+        sigma[frontier] = 1.0
+        levels = []
+        depth = 0
+        while len(frontier):
+            positions, owner = _expand(indptr, frontier // k)
+            parent = frontier[owner]
+            child = indices[positions] * k + parent % k
+            unseen = child[dist[child] < 0]
+            dist[unseen] = depth + 1
+            on_path = dist[child] == depth + 1
+            positions, parent, child = positions[on_path], parent[on_path], child[on_path]
+            sigma += np.bincount(child, weights=sigma[parent], minlength=n * k)
+            levels.append((positions, parent, child))
+            # Neu erreichte Paare, sortiert und ohne Wiederholungen
+            frontier = np.flatnonzero(dist == depth + 1)
+            depth += 1
+
+        delta = np.zeros(n * k)
+        for positions, parent, child in reversed(levels):
+            share = sigma[parent] / sigma[child] * (1.0 + delta[child])
+            edge += np.bincount(positions, weights=share, minlength=arcs)
+            delta += np.bincount(parent, weights=share, minlength=n * k)
+        # Die Quelle selbst zählt nicht als Zwischenknoten
+        delta[block * k + np.arange(k)] = 0.0
+        vertex += delta.reshape(n, k).sum(axis=1)
+    return vertex, edge
+
+
+def _attach(names, sizes):
+    """
+    Initialisierung eines Worker-Prozesses: blendet indptr und indices aus dem
+    gemeinsamen Speicher ein, ohne sie zu kopieren.
+    """
+    for key, name, size in zip(("indptr", "indices"), names, sizes):
+        memory = SharedMemory(name=name)
+        _shared[key] = (memory, np.ndarray((size,), dtype=np.int64, buffer=memory.buf))
+
+
+def _accumulate_shared(sources):
+    return accumulate(_shared["indptr"][1], _shared["indices"][1], sources)
+
+
+def _share(array):
+    memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)[:] = array
+    return memory
+
+
+def default_workers():
+    """
+    Worker-Prozesse für die Betweenness (Umgebungsvariable oder Anzahl der CPU-Kerne).
+    """
+    configured = os.environ.get(WORKERS_ENV)
+    return max(int(configured), 1) if configured else (os.cpu_count() or 1)
+
+
+def dependencies(index, workers=None):
+    """
+    Summe der Abhängigkeiten über alle Quellen, bei mehreren Workern parallel: Die
+    Quellen werden in Blöcke aufgeteilt, jeder Worker-Prozess liest den Adjazenzindex
+    aus dem gemeinsamen Speicher, und die Teilvektoren werden im Hauptprozess addiert.
+
+    Rückgabe:
+      tuple: (Abhängigkeiten je Knoten, Anteile je CSR-Kante), nicht normiert
+    """
+    n = index.number_of_nodes
+    workers = default_workers() if workers is None else workers
+    sources = np.arange(n)
+    if workers <= 1 or n < PARALLEL_NODE_LIMIT:
+        return accumulate(index.indptr, index.indices, sources)
+
+    # Reihum verteilt, damit jeder Block Quellen aus allen Teilen des Graphen enthält
+    tasks = min(workers * TASKS_PER_WORKER, n)
+    chunks = [sources[i::tasks] for i in range(tasks)]
+    memories = [_share(index.indptr), _share(index.indices)]
+    try:
+        names = [memory.name for memory in memories]
+        sizes = [len(index.indptr), len(index.indices)]
+        vertex, edge = np.zeros(n), np.zeros(len(index.indices))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                 initializer=_attach, initargs=(names, sizes)) as executor:
+            for partial_vertex, partial_edge in executor.map(_accumulate_shared, chunks):
+                vertex += partial_vertex
+                edge += partial_edge
+        return vertex, edge
+    finally:
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+
+def betweenness(G, workers=None):
+    """
+    Knoten- und Kanten-Betweenness (normiert wie nx.betweenness_centrality und
+    nx.edge_betweenness_centrality) aus einem gemeinsamen Brandes-Lauf. Mehrfachkanten
+    und Schleifen werden wie bei NetworkX ignoriert; Kanten werden einmal je Knotenpaar
+    ausgegeben (ungerichtet mit beiden Richtungen zusammengefasst).
+
+    Parameter:
+      G (networkx.Graph): Graph (auch gerichtet oder Multigraph).
+      workers (int): Anzahl der Worker-Prozesse (Standard: default_workers()).
+
+    Rückgabe:
+      dict: {"betweenness_centrality": {Knoten: Wert}, "edge_betweenness": [[u, v, Wert], ...]}
+    """
+    directed = G.is_directed()
+    index = AdjacencyIndex.from_graph(G, directed=directed)
+    n = index.number_of_nodes
+    vertex, edge = dependencies(index, workers)
+
+    if n > 2:
+        vertex /= (n - 1) * (n - 2)
+    if n > 1:
+        edge /= n * (n - 1)
+    tails = np.repeat(np.arange(n), index.degree)
+    heads = index.indices
+    if not directed:
+        # Beide Richtungen einer Kante addieren (die Gegenrichtung steht an der Stelle von (v, u))
+        reverse = np.argsort(heads * n + tails, kind="stable")
+        edge = edge + edge[reverse]
+        keep = tails < heads
+        tails, heads, edge = tails[keep], heads[keep], edge[keep]
+
+    nodes = index.nodes
+    return {
+        "betweenness_centrality": dict(zip(nodes, vertex.tolist())),
+        "edge_betweenness": [[nodes[u], nodes[v], value] for u, v, value in zip(tails.tolist(), heads.tolist(), edge.tolist())],
+    }
@@ -0,0 +1,230 @@
+import os
+import re
+import sys
+import time
+import argparse
+
+from backend.database_handler import initialize_database, save_catalog_entry, get_catalog_entry, get_catalog_entries
+from backend.archives import is_archive, iter_member_data, member_ref
+
+# Pfad zur SQLite-Datenbank
+database_path = "./network_analysis.db"
+
+# Format und Datenquelle je Dateiendung (wie in file_converter.convert_file)
+FORMATS = {
+    ".graphml": ("GraphML", "TopologyZoo"),
+    ".xml": ("SNDlib-XML", "SNDlib"),
+    ".cch": ("Rocketfuel-CCH", "Rocketfuel"),
+    ".txt": ("CAIDA-AS", "CAIDA_AS"),
+}
+
+CHUNK_SIZE = 1 << 20
+
+NODE_TAG = re.compile(rb"<node[\s>/]")
+EDGE_TAG = re.compile(rb"<edge[\s>/]")
+LINK_TAG = re.compile(rb"<link[\s>/]")
+DIRECTED_DEFAULT = re.compile(rb"<graph[^>]*edgedefault=[\"']directed[\"']")
+EXTERNAL_NEIGHBOR = re.compile(rb"{(-?\d+)}")
+
+
+def _count_tags(stream, patterns, stop=None):
+    """
+    Zählt Tags in einem Binärstrom blockweise, ohne das Dokument zu parsen. Tags, die in
+    den letzten Bytes eines Blocks beginnen, werden erst mit dem nächsten Block gezählt,
+    damit über Blockgrenzen geteilte Tags weder fehlen noch doppelt zählen.
+    Mit stop (bytes) endet das Lesen beim ersten Vorkommen dieser Zeichenkette.
+
+    Rückgabe:
+      tuple: (Anzahl je Muster als Liste, gelesener Anfang des Dokuments)
+    """
+    counts = [0] * len(patterns)
+    head = b""
+    tail = b""
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        data = tail + chunk
+        if len(head) < 4096:
+            head = (head + chunk)[:4096]
+        end = data.find(stop) if stop else -1
+        if end >= 0:
+            data = data[:end]
+        cut = len(data) if end >= 0 else max(len(data) - 16, 0)
+        for index, pattern in enumerate(patterns):
+            counts[index] += sum(1 for match in pattern.finditer(data) if match.start() < cut)
+        tail = data[cut:]
+        if end >= 0:
+            return counts, head
+    for index, pattern in enumerate(patterns):
+        counts[index] += len(pattern.findall(tail))
+    return counts, head
+
+
+def scan_graphml(stream):
+    """
+    GraphML: zählt <node>- und <edge>-Elemente; gerichtet laut edgedefault des Graphen.
+    """
+    (nodes, edges), head = _count_tags(stream, [NODE_TAG, EDGE_TAG])
+    return {"nodes": nodes, "edges": edges, "directed": bool(DIRECTED_DEFAULT.search(head))}
+
+
+def scan_sndlib(stream):
+    """
+    SNDlib-XML: zählt <node> im Abschnitt <nodes> und <link> im Abschnitt <links>.
+    Der (meist deutlich größere) Abschnitt <demands> danach wird nicht mehr gelesen.
+    """
+    (nodes, edges), _ = _count_tags(stream, [NODE_TAG, LINK_TAG], stop=b"</links>")
+    return {"nodes": nodes, "edges": edges, "directed": False}
+
+
+def scan_cch(stream):
+    """
+    Rocketfuel-CCH: eine Zeile je Router mit Nachbarn als <uid>- und externen Nachbarn als
+    {uid}-Token. Der Konverter legt je Token eine Kante an (Multigraph, interne Kanten also
+    in beiden Richtungen), externe Nachbarn kommen als eigene Knoten hinzu.
+    Zeilen mit "-" am Anfang beschreiben externe Adressen und zählen nicht.
+    """
+    nodes = edges = 0
+    external = set()
+    for line in stream:
+        if line.startswith(b"-") or not line.strip():
+            continue
+        nodes += 1
+        edges += line.count(b"<")
+        found = EXTERNAL_NEIGHBOR.findall(line)
+        edges += len(found)
+        external.update(found)
+    return {"nodes": nodes + len(external), "edges": edges, "directed": False}
+
+
+def scan_caida(stream):
+    """
+    CAIDA-AS-Beziehungen: eine Zeile "von bis Beziehung" je Kante, Kommentare mit "#".
+    Die Knotenzahl ergibt sich aus den verschiedenen AS-Nummern.
+    """
+    edges = 0
+    seen = set()
+    for line in stream:
+        if line.startswith(b"#"):
+            continue
+        parts = line.split()
+        if len(parts) >= 2:
+            seen.update(parts[:2])
+            edges += 1
+    return {"nodes": len(seen), "edges": edges, "directed": True}
+
+
+SCANNERS = {
+    ".graphml": scan_graphml,
+    ".xml": scan_sndlib,
+    ".cch": scan_cch,
+    ".txt": scan_caida,
+}
+
+
+def scan_stream(stream, name):
+    """
+    Erfasst Format, Datenquelle, Knoten- und Kantenzahl einer Datei anhand ihres Namens.
+
+    Rückgabe:
+      dict: {"format", "data_source", "nodes", "edges", "directed", "scan_seconds"}
+    """
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in SCANNERS:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {ext}")
+    start = time.perf_counter()
+    entry = SCANNERS[ext](stream)
+    entry["format"], entry["data_source"] = FORMATS[ext]
+    entry["scan_seconds"] = time.perf_counter() - start
+    return entry
+
+
+def scan_file(database_path, path, force=False):
+    """
+    Katalogeintrag einer Datei; unveränderte Dateien (Größe und Änderungszeit) werden
+    nicht erneut gelesen. Für Archive werden auch alle Mitglieder erfasst (scan_archive).
+
+    Rückgabe:
+      dict: {"path", "format", "data_source", "size", "nodes", "edges", "directed", "members", "scan_seconds"}
+    """
+    stat = os.stat(path)
+    if not force:
+        entry = get_catalog_entry(database_path, path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+    if is_archive(path):
+        return scan_archive(database_path, path)[0]
+
+    with open(path, "rb") as stream:
+        entry = scan_stream(stream, path)
+    entry.update(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns, members=None)
+    save_catalog_entry(database_path, entry)
+    return entry
+
+
+def scan_archive(database_path, path):
+    """
+    Erfasst ein Archiv gestreamt in einem Durchlauf: je Mitglied ein Eintrag unter dem
+    Mitgliedsverweis (archiv.zip!datei) und ein Eintrag für das Archiv mit den Summen.
+
+    Rückgabe:
+      tuple: (Archiveintrag, Liste der Mitgliedseinträge)
+    """
+    import io
+
+    stat = os.stat(path)
+    start = time.perf_counter()
+    members = []
+    for member, data in iter_member_data(path):
+        try:
+            entry = scan_stream(io.BytesIO(data), member)
+        except ValueError:
+            continue
+        entry.update(path=member_ref(path, member), size=len(data), mtime_ns=stat.st_mtime_ns, members=None)
+        save_catalog_entry(database_path, entry)
+        members.append(entry)
+
+    archive = {
+        "path": path, "format": "Archiv", "data_source": "Archiv", "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns, "nodes": sum(m["nodes"] for m in members),
+        "edges": sum(m["edges"] for m in members), "directed": None, "members": len(members),
+        "scan_seconds": time.perf_counter() - start,
+    }
+    save_catalog_entry(database_path, archive)
+    return archive, members
+
+
+def archive_members(database_path, path):
+    """
+    Mitgliedseinträge eines Archivs (scannt das Archiv, falls es sich geändert hat).
+    """
+    archive = scan_file(database_path, path)
+    members = [entry for entry in get_catalog_entries(database_path, member_ref(path, ""))
+               if entry["mtime_ns"] == archive["mtime_ns"]]
+    if len(members) != archive["members"]:
+        members = scan_archive(database_path, path)[1]
+    return members
+
+
+def describe(entry):
+    """
+    Kurzbeschreibung für die Upload-Liste, z. B. "1.787 Knoten / 6.919 Kanten".
+    """
+    size = f"{entry['nodes']:,} Knoten / {entry['edges']:,} Kanten".replace(",", ".")
+    if entry.get("members") is not None:
+        return f"{entry['members']} Dateien, {size}"
+    return size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Erfasst Format, Größe und Knoten-/Kantenzahl von Eingabedateien.")
+    parser.add_argument("paths", nargs="+", help="Dateien oder Archive")
+    parser.add_argument("--force", action="store_true", help="Auch unveränderte Dateien neu einlesen")
+    args = parser.parse_args()
+
+    initialize_database(database_path)
+    for path in args.paths:
+        try:
+            entry = scan_file(database_path, path, force=args.force)
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            continue
+        print(f"{path}: {entry['format']}, {entry['size']} Bytes, {describe(entry)}")
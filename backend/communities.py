@@ -0,0 +1,199 @@
+import os
+from collections import deque
+
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+from backend.utils import cache_path
+
+# Auflösung der Modularität (1.0 = klassische Modularität nach Newman)
+DEFAULT_RESOLUTION = 1.0
+# Mindestgewinn, ab dem ein Knoten die Community wechselt (verhindert Pendeln bei Gleichstand)
+MIN_GAIN = 1e-12
+
+
+def _local_moving(indptr, indices, weights, node_weight, m2, resolution, rng):
+    """
+    Lokales Verschieben wie bei Louvain mit der Warteschlange von Leiden: Jeder Knoten
+    wechselt in die benachbarte Community mit dem größten Modularitätsgewinn; nach einem
+    Wechsel werden nur die Nachbarn außerhalb der neuen Community erneut geprüft.
+
+    Rückgabe:
+      tuple: (Community je Knoten als np.ndarray, True falls ein Knoten gewechselt hat)
+    """
+    n = len(node_weight)
+    community = list(range(n))
+    total = node_weight.tolist()
+    k = node_weight.tolist()
+    indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+    scale = resolution / m2
+
+    queue = deque(rng.permutation(n).tolist())
+    queued = [True] * n
+    moved = False
+    while queue:
+        v = queue.popleft()
+        queued[v] = False
+        start, stop = indptr[v], indptr[v + 1]
+        links = {}
+        for u, w in zip(indices[start:stop], weights[start:stop]):
+            if u != v:
+                c = community[u]
+                links[c] = links.get(c, 0.0) + w
+        current = community[v]
+        kv = k[v]
+        # Gewinn relativ zum isolierten Knoten: Kanten in die Community minus erwartete Kanten
+        total[current] -= kv
+        best, best_gain = current, links.get(current, 0.0) - scale * total[current] * kv
+        for c, w in links.items():
+            gain = w - scale * total[c] * kv
+            if gain > best_gain + MIN_GAIN:
+                best, best_gain = c, gain
+        total[best] += kv
+        if best != current:
+            community[v] = best
+            moved = True
+            for u in indices[start:stop]:
+                if not queued[u] and community[u] != best:
+                    queued[u] = True
+                    queue.append(u)
+    return np.array(community, dtype=np.int64), moved
+
+
+def _split_disconnected(indptr, indices, community):
+    """
+    Teilt Communities in ihre Zusammenhangskomponenten (wie die Verfeinerung bei Leiden:
+    keine Community zerfällt; die Modularität steigt dabei nie). Die Communities werden
+    fortlaufend ab 0 nummeriert.
+    """
+    from scipy.sparse import csr_array
+    from scipy.sparse.csgraph import connected_components
+
+    n = len(community)
+    tails = np.repeat(np.arange(n), np.diff(indptr))
+    inside = community[tails] == community[indices]
+    A = csr_array((np.ones(int(inside.sum())), (tails[inside], indices[inside])), shape=(n, n))
+    return connected_components(A, directed=False)[1].astype(np.int64)
+
+
+def _aggregate(indptr, indices, weights, community):
+    """
+    Community-Graph: ein Knoten je Community, Kantengewichte summiert, Kanten innerhalb
+    einer Community als Schleife (in beiden Richtungen gezählt wie im Ausgangsgraphen).
+
+    Rückgabe:
+      tuple: (indptr, indices, weights) des Community-Graphen im CSR-Format
+    """
+    size = int(community.max()) + 1
+    tails = np.repeat(np.arange(len(community)), np.diff(indptr))
+    keys, inverse = np.unique(community[tails] * size + community[indices], return_inverse=True)
+    rows = keys // size
+    aggregated_indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=size))])
+    return aggregated_indptr, keys % size, np.bincount(inverse, weights=weights)
+
+
+def modularity(index, membership, resolution=DEFAULT_RESOLUTION):
+    """
+    Modularität einer Partition des ungerichteten Index (wie nx.community.modularity):
+    Σ_c [ L_c / m - γ (d_c / 2m)² ].
+    """
+    degree = index.degree.astype(float)
+    m2 = degree.sum()
+    if m2 == 0:
+        return 0.0
+    size = int(membership.max()) + 1
+    tails = np.repeat(np.arange(index.number_of_nodes), index.degree)
+    inside = membership[tails] == membership[index.indices]
+    internal = np.bincount(membership[tails[inside]], minlength=size)
+    total = np.bincount(membership, weights=degree, minlength=size)
+    return float((internal / m2 - resolution * (total / m2) ** 2).sum())
+
+
+def louvain(index, resolution=DEFAULT_RESOLUTION, seed=0):
+    """
+    Community-Erkennung auf dem ungerichteten Index: lokales Verschieben, Aufteilen
+    zerfallener Communities und Zusammenfassen zum Community-Graphen, bis kein Knoten mehr
+    wechselt. Die Communities werden nach Größe nummeriert (0 = größte).
+
+    Rückgabe:
+      tuple: (Community je Knotenposition als np.ndarray, Modularität)
+    """
+    n = index.number_of_nodes
+    membership = np.arange(n, dtype=np.int64)
+    node_weight = index.degree.astype(float)
+    m2 = node_weight.sum()
+    if m2 == 0:
+        return membership, 0.0
+
+    rng = np.random.default_rng(seed)
+    indptr, indices, weights = index.indptr, index.indices, np.ones(len(index.indices))
+    while True:
+        community, moved = _local_moving(indptr, indices, weights, node_weight, m2, resolution, rng)
+        community = _split_disconnected(indptr, indices, community)
+        membership = community[membership]
+        if not moved or community.max() + 1 == len(node_weight):
+            break
+        indptr, indices, weights = _aggregate(indptr, indices, weights, community)
+        node_weight = np.bincount(community, weights=node_weight)
+
+    # Nach Größe nummerieren (bei gleicher Größe nach erstem Knoten)
+    sizes = np.bincount(membership)
+    first = np.full(len(sizes), n, dtype=np.int64)
+    np.minimum.at(first, membership, np.arange(n))
+    rank = np.empty(len(sizes), dtype=np.int64)
+    rank[np.lexsort((first, -sizes))] = np.arange(len(sizes))
+    membership = rank[membership]
+    return membership, modularity(index, membership, resolution)
+
+
+def partition(index, resolution=DEFAULT_RESOLUTION):
+    """
+    Partition des Index, je Strukturhash und Auflösung zwischengespeichert (gleiche
+    Topologien in mehreren Dateien, erneute Analysen und die GUI teilen sich das Ergebnis).
+
+    Rückgabe:
+      tuple: (Community je Knotenposition als np.ndarray, Modularität)
+    """
+    cache_file = cache_path("communities", f"{index.structure_hash()}-{resolution:g}", ".npz")
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                if len(data["membership"]) == index.number_of_nodes:
+                    return data["membership"], float(data["modularity"])
+        except Exception as e:
+            print("Community-Cache konnte nicht gelesen werden:", e)
+    membership, value = louvain(index, resolution)
+    try:
+        np.savez(cache_file, membership=membership, modularity=value)
+    except OSError as e:
+        print("Community-Cache konnte nicht gespeichert werden:", e)
+    return membership, value
+
+
+def node_communities(index):
+    """
+    Knoten -> Community des (zwischengespeicherten) Partitionierens, z. B. für die Färbung
+    in der GUI.
+    """
+    membership, _ = partition(index)
+    return dict(zip(index.nodes, membership.tolist()))
+
+
+def community_metrics(G):
+    """
+    Communities des ungerichteten einfachen Graphen (Richtungen, Mehrfachkanten und
+    Schleifen werden ignoriert):
+      communities           - Knoten -> Community (0 = größte)
+      modularity            - Modularität der Partition
+      number_of_communities - Anzahl der Communities (isolierte Knoten bilden eigene)
+
+    Rückgabe:
+      dict: Name (siehe metrics.COMMUNITY_METRICS) -> Wert
+    """
+    index = AdjacencyIndex.from_graph(G)
+    membership, value = partition(index)
+    return {
+        "communities": dict(zip(index.nodes, membership.tolist())),
+        "modularity": value,
+        "number_of_communities": int(membership.max()) + 1 if len(membership) else 0,
+    }
@@ -0,0 +1,219 @@
+import itertools
+import random
+
+import networkx as nx
+from networkx.algorithms.connectivity import (
+    build_auxiliary_edge_connectivity, build_auxiliary_node_connectivity,
+    local_edge_connectivity, local_node_connectivity,
+)
+from networkx.algorithms.flow import build_residual_network
+
+# Ab dieser Knotenzahl wird die Knotenkonnektivität nicht mehr exakt per Max-Flow
+# (ein Fluss je Nicht-Nachbar des Knotens mit minimalem Grad), sondern mit dem
+# Näherungsverfahren von White und Newman bestimmt.
+FLOW_NODE_LIMIT = 5000
+
+# Oberhalb von FLOW_NODE_LIMIT wird die Kantenkonnektivität nur über lokale Schnitte
+# zwischen dem Knoten mit minimalem Grad und so vielen zufällig gewählten Knoten bestimmt.
+EDGE_CUT_SAMPLES = 16
+
+# Rechenweg, der den gespeicherten Wert geliefert hat (Spalten *_connectivity_method)
+DISCONNECTED = "disconnected"              # nicht (stark) zusammenhängend: 0
+COMPLETE = "complete"                      # vollständiger Graph: n - 1
+MIN_DEGREE = "min_degree"                  # untere Schranke erreicht den minimalen Grad
+ARTICULATION_POINT = "articulation_point"  # Artikulationspunkt: Knotenkonnektivität 1
+BRIDGE = "bridge"                          # Brücke: Kantenkonnektivität 1
+MAX_FLOW = "max_flow"                      # Max-Flow mit Abbruch an der unteren Schranke
+APPROXIMATION = "approximation"            # Näherung für sehr große Graphen
+TRIVIAL = "trivial"                        # weniger als drei Knoten (NetworkX direkt)
+
+
+def _simple_graph(G):
+    """
+    Graph ohne Mehrfachkanten und Schleifen. Die Flussnetzwerke von NetworkX fassen
+    parallele Kanten ohnehin zusammen; die Gradschranken müssen dazu passen.
+    """
+    if not G.is_multigraph() and nx.number_of_selfloops(G) == 0:
+        return G
+    H = nx.DiGraph(G) if G.is_directed() else nx.Graph(G)
+    H.remove_edges_from(list(nx.selfloop_edges(H)))
+    return H
+
+
+def _min_degree(G):
+    """
+    Obere Schranke beider Konnektivitäten: minimaler Grad (gerichtet: min. Ein- bzw. Ausgangsgrad).
+    """
+    if G.is_directed():
+        return min(min(G.in_degree(v), G.out_degree(v)) for v in G)
+    return min(d for _, d in G.degree())
+
+
+def _is_connected(G):
+    return nx.is_strongly_connected(G) if G.is_directed() else nx.is_connected(G)
+
+
+def _underlying(G):
+    return G.to_undirected(as_view=True) if G.is_directed() else G
+
+
+def node_connectivity(G):
+    """
+    Knotenkonnektivität mit Abkürzungen vor der Max-Flow-Berechnung:
+    nicht zusammenhängend (0), vollständig (n - 1), Artikulationspunkt (1, lineare Zeit)
+    und minimaler Grad als obere Schranke. Gerichtete Graphen gelten wie bei NetworkX
+    nur bei starkem Zusammenhang als verbunden.
+
+    Rückgabe:
+      tuple: (Wert, Rechenweg)
+    """
+    G = _simple_graph(G)
+    n = G.number_of_nodes()
+    if n < 3:
+        return nx.node_connectivity(G), TRIVIAL
+    if not _is_connected(G):
+        return 0, DISCONNECTED
+    upper = _min_degree(G)
+    if upper == n - 1:
+        return n - 1, COMPLETE
+    if upper == 1:
+        return 1, MIN_DEGREE
+    # Ein Artikulationspunkt trennt auch den gerichteten Graphen
+    if next(nx.articulation_points(_underlying(G)), None) is not None:
+        return 1, ARTICULATION_POINT
+    # Ungerichtet ist der Graph jetzt zweifach zusammenhängend; gerichtet fehlt diese Garantie
+    lower = 1 if G.is_directed() else 2
+    if upper == lower:
+        return upper, MIN_DEGREE
+    if n > FLOW_NODE_LIMIT:
+        from networkx.algorithms import approximation
+        return approximation.node_connectivity(G), APPROXIMATION
+    return _flow_node_connectivity(G, upper, lower), MAX_FLOW
+
+
+def edge_connectivity(G):
+    """
+    Kantenkonnektivität mit Abkürzungen vor der Max-Flow-Berechnung:
+    nicht zusammenhängend (0), vollständig (n - 1), Brücke (1, lineare Zeit)
+    und minimaler Grad als obere Schranke.
+
+    Rückgabe:
+      tuple: (Wert, Rechenweg)
+    """
+    G = _simple_graph(G)
+    n = G.number_of_nodes()
+    if n < 3:
+        return nx.edge_connectivity(G), TRIVIAL
+    if not _is_connected(G):
+        return 0, DISCONNECTED
+    upper = _min_degree(G)
+    if upper == n - 1:
+        return n - 1, COMPLETE
+    if upper == 1:
+        return 1, MIN_DEGREE
+    # Brücke im zugrunde liegenden Graphen: bei starkem Zusammenhang sind beide Richtungen
+    # die einzige Verbindung, das Entfernen einer davon trennt den gerichteten Graphen
+    if nx.has_bridges(_underlying(G)):
+        return 1, BRIDGE
+    lower = 1 if G.is_directed() else 2
+    if upper == lower:
+        return upper, MIN_DEGREE
+    if n > FLOW_NODE_LIMIT:
+        return _sampled_edge_connectivity(G, upper, lower), APPROXIMATION
+    return _flow_edge_connectivity(G, upper, lower), MAX_FLOW
+
+
+def _flow_node_connectivity(G, upper, lower):
+    """
+    Algorithmus von nx.node_connectivity (Flüsse ab dem Knoten mit minimalem Grad),
+    beginnend bei der oberen Schranke und beendet, sobald die untere Schranke erreicht ist.
+    """
+    H = build_auxiliary_node_connectivity(G)
+    R = build_residual_network(H, "capacity")
+    kwargs = {"auxiliary": H, "residual": R}
+
+    v = min(G, key=G.degree)
+    if G.is_directed():
+        pairs = itertools.permutations
+
+        def neighbors(v):
+            return itertools.chain(G.predecessors(v), G.successors(v))
+
+        # Gerichtet in beide Richtungen: NetworkX prüft nur Wege von v aus und
+        # überschätzt dadurch z. B. Graphen, in die ein Knoten nur über einen Vorgänger führt
+        candidates = [(v, w) for w in G if w != v and w not in G.succ[v]]
+        candidates += [(w, v) for w in G if w != v and w not in G.pred[v]]
+    else:
+        pairs = itertools.combinations
+        neighbors = G.neighbors
+        candidates = [(v, w) for w in set(G) - set(G[v]) - {v}]
+
+    K = upper
+    for s, t in candidates:
+        if K <= lower:
+            return K
+        K = min(K, local_node_connectivity(G, s, t, cutoff=K, **kwargs))
+    for x, y in pairs(set(neighbors(v)), 2):
+        if K <= lower:
+            return K
+        if y in G[x]:
+            continue
+        K = min(K, local_node_connectivity(G, x, y, cutoff=K, **kwargs))
+    return K
+
+
+def _flow_edge_connectivity(G, upper, lower):
+    """
+    Algorithmus von nx.edge_connectivity (ungerichtet über eine dominierende Menge,
+    gerichtet reihum), beginnend bei der oberen Schranke und mit Abbruch an der unteren.
+    """
+    H = build_auxiliary_edge_connectivity(G)
+    R = build_residual_network(H, "capacity")
+    kwargs = {"auxiliary": H, "residual": R}
+
+    L = upper
+    if G.is_directed():
+        nodes = list(G)
+        for i, u in enumerate(nodes):
+            if L <= lower:
+                break
+            L = min(L, local_edge_connectivity(G, u, nodes[(i + 1) % len(nodes)], cutoff=L, **kwargs))
+        return L
+
+    # Eine dominierende Menge mit mindestens zwei Knoten überdeckt jeden minimalen Schnitt
+    for node in G:
+        D = nx.dominating_set(G, start_with=node)
+        v = D.pop()
+        if D:
+            break
+    else:
+        return L
+    for w in D:
+        if L <= lower:
+            break
+        L = min(L, local_edge_connectivity(G, v, w, cutoff=L, **kwargs))
+    return L
+
+
+def _sampled_edge_connectivity(G, upper, lower, samples=EDGE_CUT_SAMPLES, seed=0):
+    """
+    Näherung für sehr große Graphen: minimaler Grad als obere Schranke, verschärft durch
+    lokale Schnitte zwischen dem Knoten mit minimalem Grad und samples zufälligen Knoten
+    (gerichtet in beide Richtungen). Das Ergebnis ist eine obere Schranke der exakten
+    Kantenkonnektivität; es ist exakt, sobald die untere Schranke erreicht wird.
+    """
+    H = build_auxiliary_edge_connectivity(G)
+    R = build_residual_network(H, "capacity")
+    kwargs = {"auxiliary": H, "residual": R}
+
+    v = min(G, key=G.degree)
+    others = [w for w in G if w != v]
+    targets = random.Random(seed).sample(others, min(samples, len(others)))
+    L = upper
+    for w in targets:
+        if L <= lower:
+            break
+        L = min(L, local_edge_connectivity(G, v, w, cutoff=L, **kwargs))
+        if G.is_directed() and L > lower:
+            L = min(L, local_edge_connectivity(G, w, v, cutoff=L, **kwargs))
+    return L
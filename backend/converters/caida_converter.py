@@ -1,18 +1,22 @@
 import os
 import networkx as nx
+from backend.utils import open_text
 
-def convert_to_graphml(input_file):
+def convert_to_graphml(input_file, output_file=None):
     """
     Konvertiert eine CAIDA .txt-Datei in das GraphML-Format.
     Liest die Datei zeilenweise ein, überspringt Kommentare,
     extrahiert 'from_node', 'to_node' und 'relationship' und erstellt einen gerichteten Graphen.
     Speichert den Graphen als .graphml-Datei im gleichen Verzeichnis.
+
+    input_file kann auch ein Binärstrom sein (z. B. ein Archivmitglied); dann muss
+    output_file angegeben werden.
     """
     # Erstelle einen gerichteten Graphen
     G = nx.DiGraph()
 
     # Lese die Datei Zeile für Zeile
-    with open(input_file, 'r') as file:
+    with open_text(input_file) as file:
         for line in file:
             # Überspringe Kommentare
             if line.startswith('#'):
@@ -27,7 +31,8 @@ def convert_to_graphml(input_file):
             G.add_edge(from_node, to_node, relationship=relationship)
 
     # Erstelle den Namen für die GraphML-Datei
-    output_file = os.path.splitext(input_file)[0] + '.graphml'
+    if output_file is None:
+        output_file = os.path.splitext(input_file)[0] + '.graphml'
     # Speichere den Graphen als GraphML-Datei
     nx.write_graphml(G, output_file)
     print(f"Die Konvertierung von {input_file} ist abgeschlossen. GraphML-Datei: {output_file}")
@@ -1,6 +1,7 @@
 import re
 import networkx as nx
 import os
+from backend.utils import open_text
 
 def parse_cch(file_path):
     nodes = {}
@@ -8,7 +9,7 @@ def parse_cch(file_path):
     ambiguous_nodes = 0
     disconnected_nodes = 0
 
-    with open(file_path, 'r') as file:
+    with open_text(file_path) as file:
         for line in file:
             if line.startswith('-'):
                 # Skip lines that start with '-euid =externaladdress rn'
@@ -27,7 +28,7 @@ def parse_cch(file_path):
             ext_conns = int(ext_conns_match.group(1)) if ext_conns_match else 0
 
             neighbors = re.findall(r'<(\d+)>', line)
-            ext_neighbors = re.findall(r'{(\d+)}', line)
+            ext_neighbors = re.findall(r'{(-?\d+)}', line)
 
             name_match = re.search(r'=(\S+)', line)
             name = name_match.group(1) if name_match else ""
@@ -79,12 +80,14 @@ def build_graph_from_cch(nodes):
 def export_graph_to_graphml(G, output_path):
     nx.write_graphml(G, output_path)
 
-def convert_cch_to_graphml(file_path):
+def convert_cch_to_graphml(file_path, output_path=None):
+    # file_path may also be a binary stream (archive member); output_path is then required
     nodes = parse_cch(file_path)
     G = build_graph_from_cch(nodes)
     
     # Determine the filename for the GraphML file in the same directory
-    output_path = os.path.splitext(file_path)[0] + '.graphml'
+    if output_path is None:
+        output_path = os.path.splitext(file_path)[0] + '.graphml'
     export_graph_to_graphml(G, output_path)
 
     return output_path
@@ -2,8 +2,8 @@ import os
 import xml.etree.ElementTree as ET
 import networkx as nx
 
-def convert_xml_to_graphml(xml_file):
-    # Read the XML file
+def convert_xml_to_graphml(xml_file, graphml_filename=None):
+    # Read the XML file (path or binary stream, e.g. an archive member)
     tree = ET.parse(xml_file)
     root = tree.getroot()
 
@@ -27,7 +27,8 @@ def convert_xml_to_graphml(xml_file):
         G.add_edge(source, target, id=link_id, capacity=capacity, cost=cost)
 
     # Determine the filename for the GraphML file
-    graphml_filename = os.path.splitext(xml_file)[0] + '.graphml'
+    if graphml_filename is None:
+        graphml_filename = os.path.splitext(xml_file)[0] + '.graphml'
 
     # Save the graph as a GraphML file
     nx.write_graphml(G, graphml_filename)
@@ -1,6 +1,6 @@
 import os
 
-def analyze_file(file_path, data_source, database_path):
+def analyze_file(file_path, data_source, database_path, file_name=None, precomputed=None, source_path=None):
     """
     Analysiert eine einzelne konvertierte GraphML-Datei und speichert die Ergebnisse in der Datenbank.
     
@@ -9,24 +9,28 @@ def analyze_file(file_path, data_source, database_path):
       data_source (str): Kennzeichnung der Datenquelle 
                          (z.B. "TopologyZoo", "SNDlib", "Rocketfuel", "CAIDA_AS").
       database_path (str): Pfad zur SQLite-Datenbank.
+      file_name (str): Optional, Name für die DB (z. B. Mitgliedsverweis bei Archivmitgliedern).
+      precomputed (dict): Optional, von Teil-Jobs bereits berechnete Metriken (siehe backend/scheduler.py).
+      source_path (str): Optional, Pfad bzw. Mitgliedsverweis, unter dem der Graph für zurückgestellte
+                         Metriken erneut eingelesen wird (nötig, wenn file_path ein Datenstrom ist).
     
     Die Funktion wählt basierend auf data_source den passenden Analyzer aus und gibt
     das Ergebnis-Dictionary zurück.
     """
     # Optionl: Ein Output-Pfad für die JSON-Ergebnisse
-    output_file = os.path.splitext(file_path)[0] + "_analysis.json"
+    output_file = os.path.splitext(str(file_path))[0] + "_analysis.json"
     
     if data_source == "TopologyZoo":
         from backend.analyzers import topology_zoo_analysis
-        return topology_zoo_analysis.analyze_graph(file_path, project_name="TopologyZoo", database_path=database_path)
+        return topology_zoo_analysis.analyze_graph(file_path, project_name="TopologyZoo", database_path=database_path, file_name=file_name, precomputed=precomputed, source_path=source_path)
     elif data_source == "SNDlib":
         from backend.analyzers import sndlib_analysis
-        return sndlib_analysis.analyze_graph(file_path, project_name="SNDlibrary", database_path=database_path)
+        return sndlib_analysis.analyze_graph(file_path, project_name="SNDlibrary", database_path=database_path, file_name=file_name, precomputed=precomputed, source_path=source_path)
     elif data_source == "Rocketfuel":
         from backend.analyzers import rocketfuel_analysis
-        return rocketfuel_analysis.analyze_graph(file_path, project_name="Rocketfuel", database_path=database_path)
+        return rocketfuel_analysis.analyze_graph(file_path, project_name="Rocketfuel", database_path=database_path, file_name=file_name, precomputed=precomputed, source_path=source_path)
     elif data_source == "CAIDA_AS":
         from backend.analyzers import caida_analysis
-        return caida_analysis.analyze_graph(file_path, project_name="CAIDA", database_path=database_path)
+        return caida_analysis.analyze_graph(file_path, project_name="CAIDA", database_path=database_path, file_name=file_name, precomputed=precomputed, source_path=source_path)
     else:
         raise ValueError(f"Unbekannte Datenquelle: {data_source}")
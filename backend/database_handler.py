@@ -1,3 +1,6 @@
+import os
+import time
+import pickle
 import sqlite3
 
 def connect_database(database_path):
@@ -7,6 +10,17 @@ def connect_database(database_path):
     connection = sqlite3.connect(database_path)
     return connection
 
+def _add_missing_columns(cursor, table, columns):
+    """
+    Ergänzt Spalten, die in einer älteren Datenbank noch fehlen (CREATE TABLE IF NOT EXISTS
+    ändert bestehende Tabellen nicht).
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
 def initialize_database(database_path):
     """
     Initialisiert die Datenbankstruktur und erstellt erforderliche Tabellen.
@@ -46,14 +60,223 @@ def initialize_database(database_path):
             is_multigraph BOOLEAN
         )
     """)
+    # Rechenweg der Konnektivität (backend/connectivity.py), z. B. "articulation_point" oder "max_flow"
+    _add_missing_columns(cursor, "analysis_results", [
+        ("node_connectivity_method", "TEXT"),
+        ("edge_connectivity_method", "TEXT"),
+    ])
+    # Distanzverteilung (backend/hyperanf.py) mit Fehlerschranken; hop_plot als JSON-Liste
+    _add_missing_columns(cursor, "analysis_results", [
+        ("effective_diameter", "REAL"),
+        ("effective_diameter_error", "REAL"),
+        ("average_distance", "REAL"),
+        ("average_distance_error", "REAL"),
+        ("approx_global_efficiency", "REAL"),
+        ("approx_global_efficiency_error", "REAL"),
+        ("hop_plot", "TEXT"),
+        ("hop_plot_error", "REAL"),
+    ])
+    # Kanten-Betweenness (backend/betweenness.py) als JSON-Liste [[u, v, Wert], ...]
+    _add_missing_columns(cursor, "analysis_results", [
+        ("edge_betweenness", "TEXT"),
+    ])
+    # Clustering aus dem Dreieckszählen (backend/triangles.py)
+    _add_missing_columns(cursor, "analysis_results", [
+        ("average_clustering", "REAL"),
+        ("transitivity", "REAL"),
+    ])
+    # Komponenten der Metrik-Sicht; Größenverteilungen als JSON [[Größe, Anzahl], ...]
+    _add_missing_columns(cursor, "analysis_results", [
+        ("number_of_components", "INTEGER"),
+        ("largest_component_size", "INTEGER"),
+        ("component_sizes", "TEXT"),
+        ("strong_component_sizes", "TEXT"),
+    ])
+    # Spektrale Kennzahlen (backend/spectral.py); Eigenvektorzentralität als JSON je Knoten
+    _add_missing_columns(cursor, "analysis_results", [
+        ("algebraic_connectivity", "REAL"),
+        ("spectral_radius", "REAL"),
+        ("spectral_gap", "REAL"),
+        ("natural_connectivity", "REAL"),
+        ("eigenvector_centrality", "TEXT"),
+    ])
+    # k-Core, Rich-Club und Assortativität (backend/structure.py); Kernzahlen als JSON je Knoten,
+    # Rich-Club als JSON-Liste φ(k) für k = 0, 1, 2, …
+    _add_missing_columns(cursor, "analysis_results", [
+        ("coreness", "TEXT"),
+        ("degeneracy", "INTEGER"),
+        ("rich_club", "TEXT"),
+        ("degree_assortativity", "REAL"),
+    ])
+    # Communities (backend/communities.py): Partition als JSON Knoten -> Community, Modularität
+    _add_missing_columns(cursor, "analysis_results", [
+        ("communities", "TEXT"),
+        ("modularity", "REAL"),
+        ("number_of_communities", "INTEGER"),
+    ])
+
+    # Datenversion: wird per Trigger bei jeder Änderung an analysis_results erhöht,
+    # damit die GUI zwischengespeicherte Abfragen/Diagramme nur bei neuen Daten neu aufbaut
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS analysis_results_{event.lower()}_version
+            AFTER {event} ON analysis_results
+            BEGIN
+                UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+    # Tabelle "thumbnails": Vorschaubilder je Graphdatei (graph_hash erkennt unveränderte Graphen)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            file_path TEXT PRIMARY KEY,
+            File_name TEXT,
+            graph_hash TEXT,
+            thumbnail_path TEXT,
+            created_at TEXT
+        )
+    """)
+
+    # Tabelle "staged_files": Inhaltshash je bereitgestellter Upload-Datei (Staging in temp_uploads/),
+    # damit nachgelagerte Caches den Hash nicht erneut berechnen müssen
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS staged_files (
+            staged_path TEXT PRIMARY KEY,
+            content_hash TEXT,
+            original_path TEXT,
+            size INTEGER,
+            mtime_ns INTEGER,
+            staged_at TEXT
+        )
+    """)
+
+    # Tabelle "watched_files": zuletzt verarbeiteter Stand je Datei in überwachten Ordnern
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS watched_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime_ns INTEGER,
+            content_hash TEXT,
+            processed_at TEXT
+        )
+    """)
+
+    # Tabelle "jobs": persistente Analyse-Queue (siehe backend/job_queue.py).
+    # state: queued / running / done / failed; Zeitpunkte als Unix-Zeit
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL,
+            priority INTEGER DEFAULT 0,
+            state TEXT NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            not_before REAL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires REAL,
+            created_at REAL,
+            started_at REAL,
+            finished_at REAL,
+            error TEXT,
+            convert_seconds REAL,
+            analysis_seconds REAL,
+            progress_done INTEGER DEFAULT 0,
+            progress_failed INTEGER DEFAULT 0
+        )
+    """)
+    # Scheduler (backend/scheduler.py): vorhergesagte Laufzeit und Teil-Jobs, die einzelne
+    # Metriken eines großen Graphen parallel berechnen (kind = "metrics", parent_id = Datei-Job)
+    _add_missing_columns(cursor, "jobs", [
+        ("kind", "TEXT DEFAULT 'file'"),
+        ("parent_id", "INTEGER"),
+        ("metrics", "TEXT"),
+        ("predicted_seconds", "REAL DEFAULT 0"),
+        ("converted_file", "TEXT"),
+        ("data_source", "TEXT"),
+        # Speicher-Admission: geschätzte Graphgröße und Spitzenspeicher, gemessene Spitzenwerte (Bytes)
+        ("nodes", "INTEGER"),
+        ("edges", "INTEGER"),
+        ("predicted_memory", "REAL DEFAULT 0"),
+        ("peak_rss", "INTEGER"),
+        ("peak_traced", "INTEGER"),
+        # Nachträglich angeforderte Metriken (kind = "lazy"): Zeile in analysis_results
+        ("result_id", "INTEGER"),
+    ])
+    cursor.execute("CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (state, priority DESC, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS jobs_parent ON jobs (parent_id)")
+
+    # Tabelle "metric_timings": gemessene Laufzeit je Metrik und Graphgröße (Kostenmodell)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS metric_timings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            metric TEXT,
+            nodes INTEGER,
+            edges INTEGER,
+            seconds REAL,
+            recorded_at REAL
+        )
+    """)
+
+    # Tabelle "metric_results": Werte, die Teil-Jobs für ihren Datei-Job berechnet haben
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS metric_results (
+            job_id INTEGER,
+            metric TEXT,
+            value BLOB,
+            PRIMARY KEY (job_id, metric)
+        )
+    """)
+
+    # Tabelle "lazy_metrics": beim Einlesen zurückgestellte Metriken je Ergebniszeile
+    # (siehe backend/lazy_metrics.py). state: deferred / pending / done / failed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS lazy_metrics (
+            result_id INTEGER,
+            metric TEXT,
+            state TEXT,
+            graph_file TEXT,
+            job_id INTEGER,
+            error TEXT,
+            updated_at REAL,
+            PRIMARY KEY (result_id, metric)
+        )
+    """)
+
+    # Tabelle "catalog": Vorab-Erfassung der Eingabedateien (siehe backend/catalog.py).
+    # Archivmitglieder stehen unter ihrem Mitgliedsverweis (archiv.zip!datei)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog (
+            path TEXT PRIMARY KEY,
+            format TEXT,
+            data_source TEXT,
+            size INTEGER,
+            mtime_ns INTEGER,
+            nodes INTEGER,
+            edges INTEGER,
+            directed INTEGER,
+            members INTEGER,
+            scan_seconds REAL,
+            scanned_at TEXT
+        )
+    """)
 
     # Änderungen speichern und Verbindung schließen
     connection.commit()
+
+    # WAL erlaubt Lesezugriffe der GUI, während Worker-Prozesse schreiben
+    cursor.execute("PRAGMA journal_mode=WAL").fetchone()
     connection.close()
 
 def save_analysis_results(database_path, results):
     """
-    Speichert die Analyseergebnisse in der SQLite-Datenbank.
+    Speichert die Analyseergebnisse in der SQLite-Datenbank und gibt die id der neuen Zeile zurück.
     """
     connection = connect_database(database_path)
     cursor = connection.cursor()
@@ -63,10 +286,17 @@ def save_analysis_results(database_path, results):
         INSERT INTO analysis_results (
             Project_name, File_name, is_directed, number_of_nodes, number_of_edges, is_connected,
             is_strongly_connected, is_weakly_connected, node_connectivity, edge_connectivity,
-            global_efficiency, local_efficiency, graph_center, degree_centrality,
+            node_connectivity_method, edge_connectivity_method, global_efficiency, local_efficiency, graph_center, degree_centrality,
             betweenness_centrality, closeness_centrality, pagerank, diameter, radius,
-            periphery, density, is_tree, is_forest, is_bipartite, is_planar, is_multigraph
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            periphery, density, is_tree, is_forest, is_bipartite, is_planar, is_multigraph,
+            effective_diameter, effective_diameter_error, average_distance, average_distance_error,
+            approx_global_efficiency, approx_global_efficiency_error, hop_plot, hop_plot_error,
+            edge_betweenness, average_clustering, transitivity, number_of_components,
+            largest_component_size, component_sizes, strong_component_sizes, algebraic_connectivity,
+            spectral_radius, spectral_gap, natural_connectivity, eigenvector_centrality, coreness,
+            degeneracy, rich_club, degree_assortativity, communities, modularity, number_of_communities
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                  ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         results.get("project_name"),
         results.get("file_name"),
@@ -78,6 +308,8 @@ def save_analysis_results(database_path, results):
         results.get("is_weakly_connected"),
         results.get("node_connectivity"),
         results.get("edge_connectivity"),
+        results.get("node_connectivity_method"),
+        results.get("edge_connectivity_method"),
         results.get("global_efficiency"),
         results.get("local_efficiency"),
         results.get("graph_center"),
@@ -93,12 +325,41 @@ def save_analysis_results(database_path, results):
         results.get("is_forest"),
         results.get("is_bipartite"),
         results.get("is_planar"),
-        results.get("is_multigraph")
+        results.get("is_multigraph"),
+        results.get("effective_diameter"),
+        results.get("effective_diameter_error"),
+        results.get("average_distance"),
+        results.get("average_distance_error"),
+        results.get("approx_global_efficiency"),
+        results.get("approx_global_efficiency_error"),
+        results.get("hop_plot"),
+        results.get("hop_plot_error"),
+        results.get("edge_betweenness"),
+        results.get("average_clustering"),
+        results.get("transitivity"),
+        results.get("number_of_components"),
+        results.get("largest_component_size"),
+        results.get("component_sizes"),
+        results.get("strong_component_sizes"),
+        results.get("algebraic_connectivity"),
+        results.get("spectral_radius"),
+        results.get("spectral_gap"),
+        results.get("natural_connectivity"),
+        results.get("eigenvector_centrality"),
+        results.get("coreness"),
+        results.get("degeneracy"),
+        results.get("rich_club"),
+        results.get("degree_assortativity"),
+        results.get("communities"),
+        results.get("modularity"),
+        results.get("number_of_communities")
     ))
+    result_id = cursor.lastrowid
 
     # Änderungen speichern und Verbindung schließen
     connection.commit()
     connection.close()
+    return result_id
 
 def query_results(database_path, query):
     """
@@ -121,10 +382,248 @@ def clear_analysis_results(database_path):
     cursor = connection.cursor()
 
     cursor.execute("DELETE FROM analysis_results")
+    cursor.execute("DELETE FROM lazy_metrics")
+
+    connection.commit()
+    connection.close()
+
+def get_data_version(database_path):
+    """
+    Gibt die aktuelle Datenversion von analysis_results zurück (steigt bei jeder Änderung).
+    """
+    rows = query_results(database_path, "SELECT version FROM data_version WHERE id = 1")
+    return rows[0][0] if rows else 0
+
+def save_thumbnail(database_path, file_path, graph_hash, thumbnail_path):
+    """
+    Speichert (oder ersetzt) den Vorschaubild-Pfad einer Graphdatei.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO thumbnails (file_path, File_name, graph_hash, thumbnail_path, created_at)
+        VALUES (?, ?, ?, ?, datetime('now'))
+    """, (file_path, os.path.basename(file_path), graph_hash, thumbnail_path))
+
+    connection.commit()
+    connection.close()
+
+def get_thumbnails(database_path):
+    """
+    Gibt ein Dictionary file_path -> (graph_hash, thumbnail_path) aller gespeicherten Vorschaubilder zurück.
+    """
+    rows = query_results(database_path, "SELECT file_path, graph_hash, thumbnail_path FROM thumbnails")
+    return {file_path: (graph_hash, thumbnail_path) for file_path, graph_hash, thumbnail_path in rows}
+
+def save_staged_file(database_path, staged_path, content_hash, original_path, size, mtime_ns):
+    """
+    Speichert (oder ersetzt) den Inhaltshash einer bereitgestellten Datei.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO staged_files (staged_path, content_hash, original_path, size, mtime_ns, staged_at)
+        VALUES (?, ?, ?, ?, ?, datetime('now'))
+    """, (staged_path, content_hash, original_path, size, mtime_ns))
+
+    connection.commit()
+    connection.close()
+
+def get_staged_file(database_path, staged_path):
+    """
+    Gibt (content_hash, size, mtime_ns) einer bereitgestellten Datei zurück oder None.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute(
+        "SELECT content_hash, size, mtime_ns FROM staged_files WHERE staged_path = ?", (staged_path,)
+    )
+    row = cursor.fetchone()
+
+    connection.close()
+    return row
+
+def save_watched_file(database_path, path, size, mtime_ns, content_hash):
+    """
+    Speichert (oder ersetzt) den verarbeiteten Stand einer Datei aus einem überwachten Ordner.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO watched_files (path, size, mtime_ns, content_hash, processed_at)
+        VALUES (?, ?, ?, ?, datetime('now'))
+    """, (path, size, mtime_ns, content_hash))
+
+    connection.commit()
+    connection.close()
+
+def get_watched_file(database_path, path):
+    """
+    Gibt (size, mtime_ns, content_hash) des zuletzt verarbeiteten Stands zurück oder None.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("SELECT size, mtime_ns, content_hash FROM watched_files WHERE path = ?", (path,))
+    row = cursor.fetchone()
+
+    connection.close()
+    return row
+
+def save_metric_timings(database_path, nodes, edges, timings):
+    """
+    Speichert die gemessenen Laufzeiten (Metrik -> Sekunden) einer Analyse.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    now = time.time()
+    cursor.executemany(
+        "INSERT INTO metric_timings (metric, nodes, edges, seconds, recorded_at) VALUES (?, ?, ?, ?, ?)",
+        [(metric, nodes, edges, seconds, now) for metric, seconds in timings.items()]
+    )
 
     connection.commit()
     connection.close()
 
+def get_metric_timings(database_path, limit_per_metric=200):
+    """
+    Gibt die jüngsten Messungen je Metrik als Liste von (metric, nodes, edges, seconds) zurück.
+    """
+    return query_results(database_path, f"""
+        SELECT metric, nodes, edges, seconds FROM (
+            SELECT metric, nodes, edges, seconds,
+                   ROW_NUMBER() OVER (PARTITION BY metric ORDER BY id DESC) AS position
+            FROM metric_timings
+        ) WHERE position <= {int(limit_per_metric)}
+    """)
+
+def get_job_memory_samples(database_path, limit=100):
+    """
+    Gemessener Spitzenspeicher der zuletzt erfolgreich abgeschlossenen Jobs mit bekannter Graphgröße
+    als Liste von (file_path, metrics, nodes, edges, peak_rss, peak_traced). Aufgeteilte Datei-Jobs
+    fehlen, da ihre Metriken in den Teil-Jobs berechnet wurden.
+    """
+    return query_results(database_path, f"""
+        SELECT file_path, metrics, nodes, edges, peak_rss, peak_traced FROM jobs
+        WHERE state = 'done' AND nodes IS NOT NULL AND (peak_rss > 0 OR peak_traced > 0)
+          AND (kind = 'metrics' OR converted_file IS NULL)
+        ORDER BY finished_at DESC LIMIT {int(limit)}
+    """)
+
+def save_metric_results(database_path, job_id, values):
+    """
+    Speichert die von einem Teil-Job berechneten Metriken (Name -> Wert) für den Datei-Job job_id.
+    """
+    connection = connect_database(database_path)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    cursor = connection.cursor()
+
+    cursor.executemany(
+        "INSERT OR REPLACE INTO metric_results (job_id, metric, value) VALUES (?, ?, ?)",
+        [(job_id, metric, pickle.dumps(value)) for metric, value in values.items()]
+    )
+
+    connection.commit()
+    connection.close()
+
+def pop_metric_results(database_path, job_id):
+    """
+    Gibt die für einen Datei-Job vorberechneten Metriken zurück und löscht sie.
+    """
+    connection = connect_database(database_path)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    cursor = connection.cursor()
+
+    cursor.execute("SELECT metric, value FROM metric_results WHERE job_id = ?", (job_id,))
+    values = {metric: pickle.loads(value) for metric, value in cursor.fetchall()}
+    cursor.execute("DELETE FROM metric_results WHERE job_id = ?", (job_id,))
+
+    connection.commit()
+    connection.close()
+    return values
+
+def save_deferred_metrics(database_path, result_id, graph_file, metrics):
+    """
+    Merkt die beim Einlesen zurückgestellten Metriken einer Ergebniszeile vor. graph_file
+    muss ein Pfad oder Mitgliedsverweis sein, aus dem backend/lazy_metrics.py den Graphen
+    erneut einlesen kann (kein Datenstrom).
+    """
+    if not metrics:
+        return
+    if not isinstance(graph_file, (str, os.PathLike)):
+        raise TypeError(f"Zurückgestellte Metriken brauchen einen Dateipfad, keinen {type(graph_file).__name__}")
+    connection = connect_database(database_path)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    cursor = connection.cursor()
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO lazy_metrics (result_id, metric, state, graph_file, updated_at)
+        VALUES (?, ?, 'deferred', ?, ?)
+    """, [(result_id, metric, os.fspath(graph_file), time.time()) for metric in metrics])
+
+    connection.commit()
+    connection.close()
+
+CATALOG_COLUMNS = ("path", "format", "data_source", "size", "mtime_ns", "nodes", "edges",
+                   "directed", "members", "scan_seconds")
+
+def save_catalog_entry(database_path, entry):
+    """
+    Speichert (oder ersetzt) den Katalogeintrag einer Datei oder eines Archivmitglieds.
+    """
+    connection = connect_database(database_path)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    cursor = connection.cursor()
+
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO catalog ({", ".join(CATALOG_COLUMNS)}, scanned_at)
+        VALUES ({", ".join("?" for _ in CATALOG_COLUMNS)}, datetime('now'))
+    """, tuple(entry.get(column) for column in CATALOG_COLUMNS))
+
+    connection.commit()
+    connection.close()
+
+def _catalog_row(row):
+    entry = dict(zip(CATALOG_COLUMNS, row))
+    if entry["directed"] is not None:
+        entry["directed"] = bool(entry["directed"])
+    return entry
+
+def get_catalog_entry(database_path, path):
+    """
+    Gibt den Katalogeintrag einer Datei als Dictionary zurück oder None.
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute(f"SELECT {', '.join(CATALOG_COLUMNS)} FROM catalog WHERE path = ?", (path,))
+    row = cursor.fetchone()
+
+    connection.close()
+    return _catalog_row(row) if row else None
+
+def get_catalog_entries(database_path, prefix=""):
+    """
+    Gibt alle Katalogeinträge zurück, deren Pfad mit prefix beginnt (z. B. alle Mitglieder
+    eines Archivs über "archiv.zip!").
+    """
+    connection = connect_database(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute(
+        f"SELECT {', '.join(CATALOG_COLUMNS)} FROM catalog WHERE substr(path, 1, ?) = ? ORDER BY path",
+        (len(prefix), prefix)
+    )
+    rows = cursor.fetchall()
+
+    connection.close()
+    return [_catalog_row(row) for row in rows]
+
 # Initialisierung der Datenbank
 if __name__ == "__main__":
     database_path = "./network_analysis.db"
@@ -0,0 +1,166 @@
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+def largest_component(G):
+    """
+    Knoten der größten (bei gerichteten Graphen stark) zusammenhängenden Komponente als
+    Adjazenzindex, zusammen mit dem transponierten Index für Rückwärtsdistanzen.
+
+    Rückgabe:
+      tuple: (Knotenliste, CSR-Matrix vorwärts, CSR-Matrix rückwärts)
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    directed = G.is_directed()
+    A = AdjacencyIndex.from_graph(G, directed=directed).to_scipy()
+    nodes = list(G.nodes())
+    count, labels = connected_components(A, directed=directed, connection="strong")
+    if count > 1:
+        keep = np.flatnonzero(labels == np.argmax(np.bincount(labels)))
+        A = A[keep][:, keep]
+        nodes = [nodes[i] for i in keep]
+    A = A.tocsr()
+    return nodes, A, (A.T.tocsr() if directed else A)
+
+
+def _bfs(A, source):
+    """
+    Hop-Distanzen von source (Knotenposition) zu allen Knoten der Komponente. Die
+    Breitensuche selbst läuft in scipy; da die Reihenfolge nach Distanz sortiert ist,
+    ergeben sich die Distanzen ebenenweise aus den Vorgängern.
+    """
+    from scipy.sparse.csgraph import breadth_first_order
+
+    order, predecessors = breadth_first_order(A, source, directed=True, return_predecessors=True)
+    dist = np.zeros(A.shape[0], dtype=np.int64)
+    reached, parents = order[1:], predecessors[order[1:]]
+    while True:
+        levels = dist[parents] + 1
+        if np.array_equal(levels, dist[reached]):
+            return dist
+        dist[reached] = levels
+
+
+class EccentricityBounds:
+    """
+    Exzentrizitätsschranken (BoundingDiameters nach Takes und Kosters) statt einer
+    Breitensuche je Knoten; die Suche läuft nur so weit, wie die angefragte Kennzahl es
+    verlangt, und setzt bei der nächsten Anfrage fort.
+
+    Jede Breitensuche von v liefert ecc(v) und für alle w die Schranken
+        max(d(w, v), ecc(v) - d(v, w)) <= ecc(w) <= d(w, v) + ecc(v).
+    Ausgewählt wird abwechselnd der offene Knoten mit der größten oberen Schranke und ein
+    zentraler Knoten (siehe _refine). Die Schranken von Blättern und ihren Nachbarn werden
+    gegenseitig übertragen.
+      - Durchmesser und Radius stehen fest, sobald max(lower) == max(upper) bzw.
+        min(upper) == min(lower); dafür genügen auf großen, dünnen Graphen wenige Suchen.
+      - Peripherie bzw. Zentrum verlangen zusätzlich, dass für jeden Knoten mit oberer
+        Schranke = Durchmesser (bzw. unterer Schranke = Radius) die Exzentrizität feststeht,
+        und werden deshalb nur bei Bedarf ausgewertet.
+
+    Nicht (stark) zusammenhängende Graphen werden auf ihrer größten (stark)
+    zusammenhängenden Komponente ausgewertet; gerichtet gilt wie bei NetworkX die
+    Exzentrizität über ausgehende Wege.
+    """
+
+    def __init__(self, G):
+        if G.number_of_nodes() == 0:
+            raise ValueError("Exzentrizität eines leeren Graphen ist nicht definiert")
+        self.nodes, self.forward, self.backward = largest_component(G)
+        n = len(self.nodes)
+        self.directed = self.forward is not self.backward
+        self.degree = np.diff(self.forward.indptr) + (np.diff(self.backward.indptr) if self.directed else 0)
+        self.lower = np.zeros(n, dtype=np.int64)
+        self.upper = np.full(n, n, dtype=np.int64)
+        self.runs = 0
+        self._pick_upper = True
+        # Ungerichtet hat ein Blatt genau die Exzentrizität seines Nachbarn plus eins
+        self._leaves = (np.flatnonzero(self.degree == 1) if not self.directed and n > 2
+                        else np.zeros(0, dtype=np.int64))
+        self._parents = self.forward.indices[self.forward.indptr[self._leaves]]
+
+    def _search(self, v):
+        """
+        Breitensuche(n) von v und Verschärfen aller Schranken.
+        """
+        dist_out = _bfs(self.forward, v)
+        dist_in = _bfs(self.backward, v) if self.directed else dist_out
+        self.runs += 1 + self.directed
+        ecc = int(dist_out.max())
+        lower = np.maximum(self.lower, np.maximum(dist_in, ecc - dist_out))
+        upper = np.minimum(self.upper, dist_in + ecc)
+        lower[v] = upper[v] = ecc
+        leaves, parents = self._leaves, self._parents
+        if len(leaves):
+            np.maximum.at(lower, parents, lower[leaves] - 1)
+            np.minimum.at(upper, parents, upper[leaves] - 1)
+            lower[leaves] = np.maximum(lower[leaves], lower[parents] + 1)
+            upper[leaves] = np.minimum(upper[leaves], upper[parents] + 1)
+        self.lower, self.upper = lower, upper
+
+    def _refine(self, open_nodes):
+        """
+        Sucht, bis kein Knoten mehr offen ist (open_nodes: Funktion -> Maske). Abwechselnd
+        vom offenen Knoten mit der größten oberen Schranke und vom noch nicht exakten Knoten
+        mit der kleinsten oberen Schranke (zentral, senkt die oberen Schranken seiner ganzen
+        Umgebung). Die erste Suche startet beim Knoten mit dem höchsten Grad.
+        """
+        if self.runs == 0:
+            self._search(int(np.argmax(self.degree)))
+        while True:
+            candidates = np.flatnonzero(open_nodes())
+            if len(candidates) == 0:
+                return
+            if self._pick_upper:
+                key = self.upper[candidates]
+            else:
+                candidates = np.flatnonzero(self.lower < self.upper)
+                key = -self.upper[candidates]
+            best = candidates[key == key.max()]
+            self._search(int(best[np.argmax(self.degree[best])]))
+            self._pick_upper = not self._pick_upper
+
+    def diameter(self):
+        self._refine(lambda: (self.upper > self.lower.max()) | (self.lower < self.upper.min()))
+        return int(self.upper.max())
+
+    def radius(self):
+        self.diameter()
+        return int(self.lower.min())
+
+    def center(self):
+        radius = self.radius()
+        self._refine(lambda: (self.lower == radius) & (self.upper > radius))
+        return [self.nodes[i] for i in np.flatnonzero(self.upper == radius)]
+
+    def periphery(self):
+        diameter = self.diameter()
+        self._refine(lambda: (self.upper == diameter) & (self.lower < diameter))
+        return [self.nodes[i] for i in np.flatnonzero(self.lower == diameter)]
+
+    def metric(self, name):
+        """
+        Wert einer Metrik aus metrics.ECCENTRICITY_METRICS.
+        """
+        return getattr(self, "center" if name == "graph_center" else name)()
+
+
+def extrema(G, center=True, periphery=True):
+    """
+    Exakter Durchmesser und Radius (siehe EccentricityBounds), Zentrum und Peripherie nur
+    falls angefragt.
+
+    Rückgabe:
+      dict: {"diameter", "radius", "center", "periphery", "component_nodes", "bfs_runs"}
+            (nicht angefragtes Zentrum bzw. Peripherie: None)
+    """
+    bounds = EccentricityBounds(G)
+    return {
+        "diameter": bounds.diameter(),
+        "radius": bounds.radius(),
+        "center": bounds.center() if center else None,
+        "periphery": bounds.periphery() if periphery else None,
+        "component_nodes": len(bounds.nodes),
+        "bfs_runs": bounds.runs,
+    }
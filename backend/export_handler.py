@@ -6,11 +6,18 @@ ALL_COLUMNS = [
     "Project_name", "File_name", "is_directed",
     "number_of_nodes", "number_of_edges",
     "is_connected", "is_strongly_connected", "is_weakly_connected",
+    "number_of_components", "largest_component_size", "component_sizes", "strong_component_sizes",
     "node_connectivity", "edge_connectivity",
-    "global_efficiency", "local_efficiency",
-    "graph_center", "degree_centrality", "betweenness_centrality",
-    "closeness_centrality", "pagerank",
+    "node_connectivity_method", "edge_connectivity_method",
+    "global_efficiency", "local_efficiency", "average_clustering", "transitivity",
+    "graph_center", "degree_centrality", "betweenness_centrality", "edge_betweenness",
+    "closeness_centrality", "pagerank", "eigenvector_centrality",
+    "coreness", "degeneracy", "rich_club", "degree_assortativity",
+    "communities", "modularity", "number_of_communities",
     "diameter", "radius", "periphery", "density",
+    "algebraic_connectivity", "spectral_radius", "spectral_gap", "natural_connectivity",
+    "effective_diameter", "effective_diameter_error", "average_distance", "average_distance_error",
+    "approx_global_efficiency", "approx_global_efficiency_error", "hop_plot", "hop_plot_error",
     "is_tree", "is_forest", "is_bipartite", "is_planar", "is_multigraph"
 ]
 
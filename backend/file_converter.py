@@ -5,12 +5,17 @@ from backend.converters import (
     convert_to_graphml,
 )
 
-def convert_file(file_path):
+def convert_file(file_path, stream=None, output_path=None):
     """
     Konvertiert die übergebene Datei in das GraphML-Format, falls erforderlich.
     Die Funktion bestimmt anhand der Dateiendung den passenden Konverter
     und gibt ein Tupel zurück: (konvertierter Dateipfad, data_source).
 
+    Für Archivmitglieder ist file_path der Mitgliedsname, stream der Inhalt als Binärstrom
+    und output_path das Ziel der GraphML-Datei. GraphML-Mitglieder werden nicht geschrieben;
+    zurückgegeben wird dann der Strom selbst. Archive als Ganzes verarbeitet
+    pipeline.process_archive.
+
     Unterstützte Formate:
       - .graphml: Bereits im gewünschten Format. (Datenquelle: "TopologyZoo")
       - .xml: Konvertierung mittels convert_xml_to_graphml() (Datenquelle: "SNDlib")
@@ -19,17 +24,19 @@ def convert_file(file_path):
     """
     ext = os.path.splitext(file_path)[1].lower()  # Ermittelt die Dateiendung in Kleinbuchstaben
 
+    source = stream if stream is not None else file_path
+
     if ext == ".graphml":
         # Keine Konvertierung erforderlich; da es sich um TopologyZoo-Daten handelt.
-        return file_path, "TopologyZoo"
+        return source, "TopologyZoo"
     elif ext == ".xml":
-        converted_file = convert_xml_to_graphml(file_path)
+        converted_file = convert_xml_to_graphml(source, output_path)
         return converted_file, "SNDlib"
     elif ext == ".cch":
-        converted_file = convert_cch_to_graphml(file_path)
+        converted_file = convert_cch_to_graphml(source, output_path)
         return converted_file, "Rocketfuel"
     elif ext == ".txt":
-        converted_file = convert_to_graphml(file_path)
+        converted_file = convert_to_graphml(source, output_path)
         return converted_file, "CAIDA_AS"
     else:
         raise ValueError(f"Nicht unterstütztes Dateiformat: {ext}")
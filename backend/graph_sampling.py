@@ -0,0 +1,113 @@
+import numpy as np
+import networkx as nx
+
+# Ab dieser Knotenzahl wird ein Graph nur noch als begrenzter Ausschnitt dargestellt
+FOCUS_NODE_THRESHOLD = 2000
+# Obergrenze der Knoten einer Fokusansicht (begrenzt die Darstellungskosten)
+FOCUS_MAX_NODES = 500
+# Maximal hinzugefügte Nachbarn pro Erweiterung per Klick
+FOCUS_EXPAND_LIMIT = 50
+
+
+def pagerank_scores(index, alpha=0.85, tol=1e-8, max_iter=100):
+    """
+    PageRank per Potenzmethode direkt auf dem CSR-Index (vektorisiert, ohne NetworkX).
+    """
+    n = index.number_of_nodes
+    if n == 0:
+        return np.zeros(0)
+    degree = index.degree.astype(float)
+    rows = np.repeat(np.arange(n), index.degree)
+    dangling = degree == 0
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        share = np.divide(x, degree, out=np.zeros(n), where=~dangling)
+        spread = np.bincount(index.indices, weights=share[rows], minlength=n)
+        x_new = alpha * (spread + x[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x_new - x).sum() < n * tol:
+            return x_new
+        x = x_new
+    return x
+
+
+def top_k_nodes(index, k=FOCUS_MAX_NODES, metric="degree"):
+    """
+    Positionen der k wichtigsten Knoten nach Grad oder PageRank.
+    """
+    if metric == "degree":
+        scores = index.degree
+    elif metric == "pagerank":
+        scores = pagerank_scores(index)
+    else:
+        raise ValueError(f"Unbekannte Metrik: {metric}")
+    k = min(k, index.number_of_nodes)
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def ego_nodes(index, center, hops=1, max_nodes=FOCUS_MAX_NODES):
+    """
+    Knotenpositionen des k-Hop-Ego-Netzes um center (BFS schichtweise).
+    Wird max_nodes überschritten, werden aus der letzten Schicht die Knoten mit
+    dem höchsten Grad übernommen.
+    """
+    seen = np.zeros(index.number_of_nodes, dtype=bool)
+    seen[center] = True
+    result = [np.array([center], dtype=np.int64)]
+    frontier = result[0]
+    remaining = max_nodes - 1
+    for _ in range(hops):
+        if remaining <= 0 or len(frontier) == 0:
+            break
+        layer = np.unique(index.neighbors_of(frontier))
+        layer = layer[~seen[layer]]
+        if len(layer) > remaining:
+            layer = layer[np.argsort(-index.degree[layer], kind="stable")[:remaining]]
+        seen[layer] = True
+        result.append(layer)
+        remaining -= len(layer)
+        frontier = layer
+    return np.concatenate(result)
+
+
+def degree_preserving_sample(index, max_nodes=FOCUS_MAX_NODES, seed=None):
+    """
+    Geschichtete Stichprobe, die die Gradverteilung erhält: Knoten werden nach
+    log2(Grad) in Klassen eingeteilt und jede Klasse proportional zu ihrer Größe
+    (mindestens ein Knoten) gezogen.
+    """
+    n = index.number_of_nodes
+    if n <= max_nodes:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    buckets = np.floor(np.log2(index.degree + 1)).astype(np.int64)
+    labels, counts = np.unique(buckets, return_counts=True)
+    quota = np.maximum(1, np.floor(counts * max_nodes / n)).astype(np.int64)
+    chosen = []
+    for label, size in zip(labels, np.minimum(quota, counts)):
+        members = np.flatnonzero(buckets == label)
+        chosen.append(rng.choice(members, size=size, replace=False))
+    sample = np.concatenate(chosen)
+    if len(sample) > max_nodes:
+        sample = rng.choice(sample, size=max_nodes, replace=False)
+    return sample
+
+
+def induced_subgraph(index, ids):
+    """
+    Erzeugt den induzierten Teilgraphen der Knotenpositionen ids als nx.Graph
+    (Knotennamen wie im Originalgraphen).
+    """
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    mask = np.zeros(index.number_of_nodes, dtype=bool)
+    mask[ids] = True
+    rows = np.repeat(ids, index.degree[ids])
+    cols = index.neighbors_of(ids)
+    keep = mask[cols] & (rows < cols)
+
+    H = nx.Graph()
+    H.add_nodes_from(index.nodes[i] for i in ids)
+    H.add_edges_from((index.nodes[u], index.nodes[v]) for u, v in zip(rows[keep], cols[keep]))
+    return H
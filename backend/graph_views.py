@@ -0,0 +1,168 @@
+import networkx as nx
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+
+def simple_projection(G):
+    """
+    Zusammengefasster einfacher Graph (Graph bzw. DiGraph) eines Multigraphen: eine Kante
+    je Knotenpaar ohne Schleifen. Jede Kante trägt die Anzahl der zusammengefassten Kanten
+    als "multiplicity"; "capacity" wird summiert (parallele Links addieren ihre Kapazität),
+    "cost" ist die des günstigsten Links, "external" nur gesetzt, wenn alle Kanten extern
+    sind. Übrige Attribute stammen von der ersten Kante, Knotenattribute bleiben erhalten.
+
+    Rückgabe:
+      networkx.Graph oder networkx.DiGraph
+    """
+    H = nx.DiGraph() if G.is_directed() else nx.Graph()
+    H.graph.update(G.graph)
+    H.add_nodes_from(G.nodes(data=True))
+    for u, v, data in G.edges(data=True):
+        if u == v:
+            continue
+        if not H.has_edge(u, v):
+            H.add_edge(u, v, **data)
+            attributes = H[u][v]
+            attributes["multiplicity"] = 1
+            attributes["external"] = bool(data.get("external", False))
+            continue
+        attributes = H[u][v]
+        attributes["multiplicity"] += 1
+        attributes["external"] = attributes["external"] and bool(data.get("external", False))
+        if "capacity" in data:
+            attributes["capacity"] = attributes.get("capacity", 0.0) + data["capacity"]
+        if "cost" in data:
+            attributes["cost"] = min(attributes.get("cost", data["cost"]), data["cost"])
+    return H
+
+
+def internal_projection(H):
+    """
+    Nur interne Topologie eines einfachen Graphen: Kanten mit external=True (Rocketfuel:
+    Links zu Nachbarn außerhalb des AS) und Knoten, die nur über solche Kanten angebunden
+    sind, werden entfernt.
+
+    Rückgabe:
+      networkx.Graph oder networkx.DiGraph
+    """
+    external_edges = [(u, v) for u, v, external in H.edges(data="external") if external]
+    external_nodes = [n for n in H if H.degree(n) > 0
+                      and all(external for _, _, external in H.edges(n, data="external"))]
+    if H.is_directed():
+        # Bei gerichteten Graphen zählen auch eingehende Kanten
+        external_nodes = [n for n in external_nodes
+                          if all(external for _, _, external in H.in_edges(n, data="external"))]
+    I = H.copy()
+    I.remove_edges_from(external_edges)
+    I.remove_nodes_from(external_nodes)
+    return I
+
+
+class GraphViews:
+    """
+    Zwischengespeicherte Sichten auf einen eingelesenen Graphen. Jede Sicht wird beim
+    ersten Zugriff einmal berechnet und dann von allen Metriken wiederverwendet:
+      simple   - einfacher Graph mit Vielfachheit, Kapazität und Kosten je Kante
+      internal - einfacher Graph ohne externe Nachbarn (Rocketfuel)
+      largest  - größte (bei gerichteten Graphen stark) zusammenhängende Komponente der
+                 Metrik-Sicht, auf der die Distanzmetriken laufen
+    Einfache Graphen ohne Schleifen werden nicht kopiert (Vielfachheit implizit 1).
+    """
+
+    def __init__(self, G):
+        self.original = G
+        self._simple = None
+        self._internal = None
+        self._has_external = None
+        self._components = None
+        self._largest = None
+
+    @property
+    def simple(self):
+        if self._simple is None:
+            G = self.original
+            if G.is_multigraph() or nx.number_of_selfloops(G) > 0:
+                self._simple = simple_projection(G)
+            else:
+                self._simple = G
+        return self._simple
+
+    @property
+    def has_external(self):
+        """
+        True, wenn der Graph Kanten mit external=True enthält (Rocketfuel-Konverter).
+        """
+        if self._has_external is None:
+            self._has_external = any(external for _, _, external in self.original.edges(data="external"))
+        return self._has_external
+
+    @property
+    def internal(self):
+        if self._internal is None:
+            self._internal = internal_projection(self.simple) if self.has_external else self.simple
+        return self._internal
+
+    @property
+    def metric_graph(self):
+        """
+        Sicht, auf der die Metriken berechnet werden: die interne Topologie, falls externe
+        Nachbarn vorhanden sind, sonst der einfache Graph.
+        """
+        return self.internal if self.has_external else self.simple
+
+    @property
+    def components(self):
+        """
+        Zusammenhangskomponenten der Metrik-Sicht in linearer Zeit (scipy auf dem
+        Adjazenzindex), einmal je Graph für alle Metriken.
+
+        Rückgabe:
+          dict: {"weak": Größen der (schwach) zusammenhängenden Komponenten,
+                 "strong": Größen der stark zusammenhängenden Komponenten (nur gerichtet, sonst None),
+                 "largest": Knoten der größten (stark) zusammenhängenden Komponente}
+        """
+        if self._components is None:
+            from scipy.sparse.csgraph import connected_components
+
+            H = self.metric_graph
+            directed = H.is_directed()
+            index = AdjacencyIndex.from_graph(H, directed=directed)
+            if index.number_of_nodes == 0:
+                self._components = {"weak": [], "strong": [] if directed else None, "largest": []}
+                return self._components
+            A = index.to_scipy()
+            _, weak = connected_components(A, directed=directed, connection="weak")
+            strong = connected_components(A, directed=True, connection="strong")[1] if directed else weak
+            strong_sizes = np.bincount(strong)
+            largest = np.flatnonzero(strong == np.argmax(strong_sizes))
+            self._components = {
+                "weak": np.bincount(weak).tolist(),
+                "strong": strong_sizes.tolist() if directed else None,
+                "largest": [index.nodes[i] for i in largest],
+            }
+        return self._components
+
+    @property
+    def largest(self):
+        if self._largest is None:
+            H = self.metric_graph
+            nodes = self.components["largest"]
+            self._largest = H if len(nodes) == H.number_of_nodes() else H.subgraph(nodes).copy()
+        return self._largest
+
+    def is_view(self, G):
+        """
+        True, wenn G der Ausgangsgraph oder eine bereits berechnete Sicht ist.
+        """
+        return G is self.original or G is self._simple or G is self._internal or G is self._largest
+
+
+def size_distribution(sizes):
+    """
+    Verteilung der Komponentengrößen als [[Größe, Anzahl], ...], absteigend nach Größe.
+    """
+    if sizes is None:
+        return None
+    values, counts = np.unique(np.asarray(sizes, dtype=np.int64), return_counts=True)
+    return [[int(v), int(c)] for v, c in zip(values[::-1], counts[::-1])]
@@ -0,0 +1,199 @@
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+# HyperLogLog-Register je Knoten: 2 ** REGISTER_BITS Register zu je einem Byte.
+# Relativer Standardfehler eines Zählers ≈ 1.04 / sqrt(2 ** REGISTER_BITS) (6,5 % bei 8 Bit).
+REGISTER_BITS = 8
+# Unabhängige Läufe mit verschiedenen Hashfunktionen; Mittelwert und Standardfehler über die Läufe
+RUNS = 4
+# Bis zu dieser Knotenzahl wird die Distanzverteilung exakt per Breitensuche bestimmt
+EXACT_NODE_LIMIT = 2000
+# Anteil der erreichbaren Paare für den effektiven Durchmesser
+EFFECTIVE_QUANTILE = 0.9
+
+
+def _hash(ids, seed):
+    """
+    64-Bit-Hash (splitmix64) der Knotenpositionen, vektorisiert.
+    """
+    with np.errstate(over="ignore"):
+        x = ids.astype(np.uint64) + np.uint64(seed + 1) * np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def initial_registers(n, bits=REGISTER_BITS, seed=0):
+    """
+    HyperLogLog-Zähler je Knoten, die zunächst nur den Knoten selbst enthalten:
+    Register = untere bits des Hashes, Wert = Position des ersten gesetzten Bits im Rest.
+    """
+    m = 1 << bits
+    h = _hash(np.arange(n), seed)
+    register = (h & np.uint64(m - 1)).astype(np.int64)
+    rest = h >> np.uint64(bits)
+    with np.errstate(over="ignore"):
+        lowest = rest & (~rest + np.uint64(1))
+    rank = np.where(rest == 0, 64 - bits + 1, np.log2(np.maximum(lowest, 1).astype(np.float64)).astype(np.int64) + 1)
+    registers = np.zeros((n, m), dtype=np.uint8)
+    registers[np.arange(n), register] = rank
+    return registers
+
+
+def estimate(registers):
+    """
+    Geschätzte Mengengröße je Zeile (HyperLogLog mit Linear Counting für kleine Werte).
+    """
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    powers = np.ldexp(1.0, -np.arange(256)).astype(np.float64)
+    raw = alpha * m * m / powers[registers].sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    raw[small] = m * np.log(m / zeros[small])
+    return raw
+
+
+def neighbor_slots(index):
+    """
+    Nachbarn nach Position sortiert: Knoten absteigend nach Grad umnummeriert, so dass die
+    k-ten Nachfolger aller Knoten mit Grad > k einen zusammenhängenden Anfang bilden.
+
+    Rückgabe:
+      list: je k ein Array mit den (umnummerierten) k-ten Nachfolgern der ersten Knoten
+    """
+    degree = index.degree
+    order = np.argsort(-degree, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    starts = index.indptr[order]
+    sorted_degree = degree[order]
+    slots = []
+    for k in range(int(sorted_degree[0]) if len(order) else 0):
+        count = int(np.searchsorted(-sorted_degree, -k, side="left"))
+        slots.append(rank[index.indices[starts[:count] + k]])
+    return slots
+
+
+def _merge_step(slots, registers):
+    """
+    Ein HyperANF-Schritt: Zähler von v := Vereinigung mit den Zählern der Nachfolger
+    (Maximum je Register), ein zusammenhängender Block je Nachbarposition.
+
+    Rückgabe:
+      tuple: (neue Register, Positionen der Knoten mit geänderten Registern)
+    """
+    result = registers.copy()
+    for targets in slots:
+        block = result[:len(targets)]
+        np.maximum(block, registers[targets], out=block)
+    return result, np.flatnonzero((result != registers).any(axis=1))
+
+
+def neighborhood_function(index, bits=REGISTER_BITS, seed=0, max_hops=None, slots=None):
+    """
+    Geschätzte Nachbarschaftsfunktion N(t) = Anzahl der Paare (u, v) mit d(u, v) <= t
+    (inklusive u = v) für t = 0, 1, ... bis sich kein Zähler mehr ändert (HyperANF).
+
+    Rückgabe:
+      list: N(t) je Schritt t
+    """
+    if slots is None:
+        slots = neighbor_slots(index)
+    registers = initial_registers(index.number_of_nodes, bits, seed)
+    sizes = estimate(registers)
+    values = [float(sizes.sum())]
+    while max_hops is None or len(values) <= max_hops:
+        registers, changed = _merge_step(slots, registers)
+        if len(changed) == 0:
+            break
+        # Nur Zähler mit geänderten Registern neu schätzen
+        sizes[changed] = estimate(registers[changed])
+        values.append(float(sizes.sum()))
+    return values
+
+
+def exact_distance_counts(index, chunk=256):
+    """
+    Anzahl der Paare je Distanz (Index = Distanz, ohne u = v) per Breitensuche von jedem Knoten.
+    """
+    from scipy.sparse.csgraph import shortest_path
+
+    A = index.to_scipy()
+    counts = np.zeros(1, dtype=np.int64)
+    for start in range(0, index.number_of_nodes, chunk):
+        sources = np.arange(start, min(start + chunk, index.number_of_nodes))
+        dist = shortest_path(A, method="D", directed=index.directed, unweighted=True, indices=sources)
+        finite = dist[np.isfinite(dist)].astype(np.int64)
+        found = np.bincount(finite)
+        if len(found) > len(counts):
+            counts = np.pad(counts, (0, len(found) - len(counts)))
+        counts[:len(found)] += found
+    counts[0] = 0
+    return counts
+
+
+def summarize(pairs, n):
+    """
+    Kennzahlen aus der kumulierten Paarzahl pairs[t] (Paare u != v mit d <= t, pairs[0] = 0).
+
+    Rückgabe:
+      dict: effective_diameter (interpoliert), average_distance, approx_global_efficiency
+    """
+    pairs = np.maximum.accumulate(np.asarray(pairs, dtype=float))
+    total = pairs[-1]
+    if total <= 0:
+        return {"effective_diameter": 0.0, "average_distance": 0.0, "approx_global_efficiency": 0.0}
+    exact_at = np.diff(pairs)
+    hops = np.arange(1, len(pairs))
+    target = EFFECTIVE_QUANTILE * total
+    t = int(np.argmax(pairs >= target))
+    step = pairs[t] - pairs[t - 1] if t > 0 else 0.0
+    effective = t - 1 + (target - pairs[t - 1]) / step if step > 0 else float(t)
+    return {
+        "effective_diameter": float(effective),
+        "average_distance": float((hops * exact_at).sum() / total),
+        "approx_global_efficiency": float((exact_at / hops).sum() / (n * (n - 1))) if n > 1 else 0.0,
+    }
+
+
+def distance_statistics(G, bits=REGISTER_BITS, runs=RUNS):
+    """
+    Hop-Plot, effektiver Durchmesser (90 %-Quantil der Distanzen, interpoliert),
+    mittlere Distanz und globale Effizienz über alle erreichbaren Paare. Große Graphen
+    werden mit HyperANF (Boldi, Rosa, Vigna) in nahezu linearer Zeit geschätzt, kleine
+    (bis EXACT_NODE_LIMIT Knoten) exakt berechnet. Gerichtete Graphen zählen gerichtete
+    Wege; Mehrfachkanten und Schleifen werden ignoriert.
+
+    Rückgabe:
+      dict: Name (siehe metrics.SKETCH_METRICS) -> (Wert, Fehler). Der Fehler ist der Standardfehler
+            über die Läufe (0 bei exakter Berechnung), beim Hop-Plot der relative
+            Standardfehler der Paarzahlen. hop_plot[t] = Paare u != v mit d(u, v) <= t.
+    """
+    index = AdjacencyIndex.from_graph(G, directed=True)
+    n = index.number_of_nodes
+    if n <= EXACT_NODE_LIMIT:
+        pairs = np.cumsum(exact_distance_counts(index)).astype(float)
+        stats = summarize(pairs, n)
+        result = {name: (value, 0.0) for name, value in stats.items()}
+        result["hop_plot"] = ([float(p) for p in pairs], 0.0)
+        return result
+
+    slots = neighbor_slots(index)
+    curves = []
+    for seed in range(runs):
+        values = np.asarray(neighborhood_function(index, bits, seed, slots=slots))
+        curves.append(np.maximum(values - values[0], 0.0))
+    length = max(len(curve) for curve in curves)
+    curves = np.array([np.pad(curve, (0, length - len(curve)), mode="edge") for curve in curves])
+
+    result = {}
+    per_run = [summarize(curve, n) for curve in curves]
+    for name in per_run[0]:
+        values = np.array([stats[name] for stats in per_run])
+        error = values.std(ddof=1) / np.sqrt(runs) if runs > 1 else 0.0
+        result[name] = (float(values.mean()), float(error))
+    relative_error = 1.04 / np.sqrt(1 << bits) / np.sqrt(runs)
+    result["hop_plot"] = ([float(p) for p in curves.mean(axis=0)], float(relative_error))
+    return result
@@ -0,0 +1,718 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import multiprocessing
+
+from backend.database_handler import (
+    connect_database, initialize_database, save_metric_results, save_metric_timings, pop_metric_results
+)
+from backend.archives import is_archive
+
+# Pfad zur SQLite-Datenbank
+database_path = "./network_analysis.db"
+
+# Zustände eines Jobs
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Arten von Jobs: eine Datei (bzw. ein Archiv), eine Gruppe von Metriken eines
+# aufgeteilten Datei-Jobs (siehe backend/scheduler.py) oder nachträglich angeforderte
+# Metriken einer bereits analysierten Datei (siehe backend/lazy_metrics.py)
+FILE_JOB = "file"
+METRICS_JOB = "metrics"
+LAZY_JOB = "lazy"
+
+# Priorität für Dateien, die interaktiv in der GUI gestartet werden (höher = früher)
+INTERACTIVE_PRIORITY = 10
+BATCH_PRIORITY = 0
+
+# Ein Worker hält einen Job für LEASE_SECONDS; läuft die Lease ab (Worker abgestürzt oder
+# beendet), wird der Job wieder eingereiht. Laufende Jobs verlängern die Lease regelmäßig.
+LEASE_SECONDS = 60.0
+HEARTBEAT_INTERVAL = LEASE_SECONDS / 4
+
+MAX_ATTEMPTS = 3
+# Wartezeit vor dem n-ten Wiederholungsversuch: BACKOFF_BASE * 2**(n-1) Sekunden
+BACKOFF_BASE = 5.0
+
+# Wartezeit eines Workers, wenn die Queue leer ist
+IDLE_SLEEP = 1.0
+
+# Speicher-Admission: so viele der vordersten wartenden Jobs werden darauf geprüft,
+# ob sie noch ins Budget passen (kleinere Jobs dürfen an zu großen vorbeiziehen)
+ADMISSION_WINDOW = 200
+# Abtastintervall des Speicherverbrauchs laufender Jobs (Sekunden)
+MEMORY_SAMPLE_INTERVAL = 0.2
+
+
+def _connect(database_path):
+    """
+    Verbindung für die Queue: mehrere Worker-Prozesse schreiben gleichzeitig, daher
+    mit Wartezeit bei gesperrter Datenbank.
+    """
+    connection = connect_database(database_path)
+    connection.execute("PRAGMA busy_timeout = 30000")
+    return connection
+
+
+def enqueue_files(database_path, file_paths, priority=BATCH_PRIORITY, max_attempts=MAX_ATTEMPTS, predict=True):
+    """
+    Reiht Dateien als Jobs ein. Dateien, die bereits wartend oder in Bearbeitung sind,
+    werden nicht doppelt eingereiht; ihre Priorität wird höchstens angehoben.
+    Mit predict werden Laufzeit und Spitzenspeicher jeder Datei vorhergesagt; innerhalb
+    einer Priorität werden lange Jobs zuerst bearbeitet, der Speicher begrenzt die Parallelität.
+
+    Rückgabe:
+      list: Job-IDs in der Reihenfolge von file_paths.
+    """
+    # Vorhersagen vor der Schreibtransaktion: der Katalog schreibt in dieselbe Datenbank
+    plans = {}
+    if predict:
+        from backend import scheduler
+        model = scheduler.CostModel.fit(database_path)
+        memory_model = scheduler.MemoryModel.fit(database_path)
+        for file_path in file_paths:
+            try:
+                plans[file_path] = scheduler.plan_file(database_path, model, file_path, memory_model)
+            except Exception as e:
+                print(f"Keine Vorhersage für {file_path}: {e}")
+
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+    now = time.time()
+
+    job_ids = []
+    for file_path in file_paths:
+        cursor.execute(
+            "SELECT id FROM jobs WHERE file_path = ? AND state IN (?, ?) ORDER BY id DESC LIMIT 1",
+            (file_path, QUEUED, RUNNING)
+        )
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("UPDATE jobs SET priority = MAX(priority, ?) WHERE id = ?", (priority, row[0]))
+            job_ids.append(row[0])
+            continue
+        plan = plans.get(file_path, {"seconds": 0.0, "memory": 0.0, "nodes": None, "edges": None})
+        cursor.execute("""
+            INSERT INTO jobs (file_path, priority, state, attempts, max_attempts, not_before, created_at,
+                              kind, predicted_seconds, predicted_memory, nodes, edges)
+            VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (file_path, priority, QUEUED, max_attempts, now, now, FILE_JOB,
+              plan["seconds"], plan["memory"], plan["nodes"], plan["edges"]))
+        job_ids.append(cursor.lastrowid)
+
+    connection.commit()
+    connection.close()
+    return job_ids
+
+
+def requeue_expired(database_path):
+    """
+    Gibt Jobs mit abgelaufener Lease wieder frei (Worker abgestürzt oder beendet).
+    Jobs, deren Versuche aufgebraucht sind, gelten als fehlgeschlagen.
+
+    Rückgabe:
+      int: Anzahl der freigegebenen Jobs.
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+    now = time.time()
+
+    cursor.execute("""
+        UPDATE jobs SET state = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,
+               error = COALESCE(error, 'Lease abgelaufen'), lease_owner = NULL, lease_expires = NULL,
+               finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END
+        WHERE state = ? AND lease_expires < ?
+    """, (FAILED, QUEUED, now, RUNNING, now))
+    count = cursor.rowcount
+
+    connection.commit()
+    connection.close()
+    return count
+
+
+def release_jobs(database_path, worker_ids):
+    """
+    Reiht die laufenden Jobs der angegebenen Worker sofort wieder ein (z. B. beim Beenden der GUI),
+    ohne das Ablaufen der Lease abzuwarten. Der abgebrochene Versuch wird nicht gezählt.
+    """
+    if not worker_ids:
+        return 0
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    placeholders = ", ".join("?" for _ in worker_ids)
+    cursor.execute(f"""
+        UPDATE jobs SET state = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires = NULL
+        WHERE state = ? AND lease_owner IN ({placeholders})
+    """, (QUEUED, RUNNING, *worker_ids))
+    count = cursor.rowcount
+
+    connection.commit()
+    connection.close()
+    return count
+
+
+def claim_job(database_path, worker_id, lease_seconds=LEASE_SECONDS, memory_budget=None):
+    """
+    Übernimmt den fälligen Job mit der höchsten Priorität; bei gleicher Priorität den mit
+    der längsten vorhergesagten Laufzeit (LPT), dann den ältesten. Aufgeteilte Datei-Jobs
+    warten, bis ihre Teil-Jobs abgeschlossen sind. Die Transaktion wird sofort exklusiv
+    geöffnet, damit zwei Worker nie denselben Job erhalten.
+
+    Mit memory_budget (Bytes) wird nur ein Job übernommen, dessen geschätzter Spitzenspeicher
+    zusammen mit dem der laufenden Jobs ins Budget passt. Läuft nichts, wird auch ein
+    Job über dem Budget übernommen (er läuft dann allein).
+
+    Rückgabe:
+      dict: Job ({"id", "file_path", "attempts", "kind", "parent_id", "metrics", "converted_file",
+            "data_source", "priority", "max_attempts", "predicted_seconds", "predicted_memory",
+            "nodes", "edges", "result_id"}) oder None.
+    """
+    connection = _connect(database_path)
+    connection.isolation_level = None
+    cursor = connection.cursor()
+    now = time.time()
+
+    fields = ("id", "file_path", "attempts", "kind", "parent_id", "metrics", "converted_file",
+              "data_source", "priority", "max_attempts", "predicted_seconds", "predicted_memory",
+              "nodes", "edges", "result_id")
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"""
+            SELECT {', '.join(fields)} FROM jobs
+            WHERE state = ? AND not_before <= ?
+              AND NOT EXISTS (SELECT 1 FROM jobs AS part WHERE part.parent_id = jobs.id AND part.state IN (?, ?))
+            ORDER BY priority DESC, predicted_seconds DESC, id
+            LIMIT ?
+        """, (QUEUED, now, QUEUED, RUNNING, ADMISSION_WINDOW if memory_budget else 1))
+        candidates = [dict(zip(fields, row)) for row in cursor.fetchall()]
+
+        if memory_budget and candidates:
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(predicted_memory), 0) FROM jobs WHERE state = ?",
+                           (RUNNING,))
+            running, used = cursor.fetchone()
+            if running:
+                candidates = [c for c in candidates if used + (c["predicted_memory"] or 0) <= memory_budget]
+        if not candidates:
+            cursor.execute("COMMIT")
+            return None
+        job = candidates[0]
+        job["attempts"] += 1
+        cursor.execute("""
+            UPDATE jobs SET state = ?, attempts = ?, lease_owner = ?, lease_expires = ?,
+                   started_at = COALESCE(started_at, ?), finished_at = NULL
+            WHERE id = ?
+        """, (RUNNING, job["attempts"], worker_id, now + lease_seconds, now, job["id"]))
+        cursor.execute("COMMIT")
+        return job
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+
+def split_job(database_path, job, worker_id, converted_file, data_source, groups):
+    """
+    Teilt einen übernommenen Datei-Job in Teil-Jobs je Metrikgruppe auf. Der Datei-Job
+    wird wieder eingereiht (ohne den Versuch zu zählen) und erst übernommen, wenn alle
+    Teil-Jobs abgeschlossen sind; er übernimmt dann deren Werte.
+
+    Parameter:
+      groups (list): [(Liste der Metriken, vorhergesagte Sekunden, geschätzter Speicher), ...].
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+    now = time.time()
+
+    for metrics, predicted, memory in groups:
+        cursor.execute("""
+            INSERT INTO jobs (file_path, priority, state, attempts, max_attempts, not_before, created_at,
+                              kind, parent_id, metrics, predicted_seconds, converted_file, data_source,
+                              predicted_memory, nodes, edges)
+            VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (job["file_path"], job["priority"], QUEUED, job["max_attempts"], now, now,
+              METRICS_JOB, job["id"], ",".join(metrics), predicted, converted_file, data_source,
+              memory, job["nodes"], job["edges"]))
+    cursor.execute("""
+        UPDATE jobs SET state = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires = NULL,
+               converted_file = ?, data_source = ?
+        WHERE id = ? AND lease_owner = ?
+    """, (QUEUED, converted_file, data_source, job["id"], worker_id))
+
+    connection.commit()
+    connection.close()
+
+
+def renew_lease(database_path, job_id, worker_id, lease_seconds=LEASE_SECONDS):
+    """
+    Verlängert die Lease eines laufenden Jobs.
+
+    Rückgabe:
+      bool: False, wenn der Job diesem Worker nicht mehr gehört.
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute(
+        "UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+        (time.time() + lease_seconds, job_id, RUNNING, worker_id)
+    )
+    owned = cursor.rowcount == 1
+
+    connection.commit()
+    connection.close()
+    return owned
+
+
+def update_progress(database_path, job_id, done, failed):
+    """
+    Speichert den Fortschritt innerhalb eines Jobs (verarbeitete Mitglieder eines Archivs).
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("UPDATE jobs SET progress_done = ?, progress_failed = ? WHERE id = ?", (done, failed, job_id))
+
+    connection.commit()
+    connection.close()
+
+
+def finish_job(database_path, job_id, worker_id, event, peak_rss=None, peak_traced=None):
+    """
+    Schließt einen Job mit dem "finished"-Ereignis der Pipeline ab und speichert den
+    gemessenen Spitzenspeicher (Bytes) zur Kalibrierung der Speicherschätzung.
+    Vorübergehende Fehler werden mit exponentiell wachsender Wartezeit erneut eingereiht,
+    solange Versuche übrig sind.
+
+    Rückgabe:
+      str: neuer Zustand des Jobs.
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+    now = time.time()
+
+    cursor.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,))
+    attempts, max_attempts = cursor.fetchone()
+
+    if event["status"] == "ok":
+        state, not_before = DONE, now
+    elif event.get("retryable") and attempts < max_attempts:
+        state, not_before = QUEUED, now + BACKOFF_BASE * 2 ** (attempts - 1)
+        print(f"Job {job_id} wird in {not_before - now:.0f} s erneut versucht "
+              f"(Versuch {attempts + 1}/{max_attempts}).")
+    else:
+        state, not_before = FAILED, now
+
+    cursor.execute("""
+        UPDATE jobs SET state = ?, not_before = ?, lease_owner = NULL, lease_expires = NULL,
+               finished_at = ?, error = ?, convert_seconds = ?, analysis_seconds = ?,
+               peak_rss = ?, peak_traced = ?
+        WHERE id = ? AND lease_owner = ?
+    """, (state, not_before, None if state == QUEUED else now, event.get("error"),
+          event.get("convert_seconds"), event.get("analysis_seconds"), peak_rss, peak_traced,
+          job_id, worker_id))
+
+    connection.commit()
+    connection.close()
+    return state
+
+
+def queue_counts(database_path):
+    """
+    Anzahl der Jobs je Zustand, z. B. {"queued": 3, "running": 1, "done": 10, "failed": 0}.
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state")
+    counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+    counts.update(dict(cursor.fetchall()))
+
+    connection.close()
+    return counts
+
+
+def get_jobs(database_path, job_ids):
+    """
+    Aktueller Stand der angegebenen Jobs.
+
+    Rückgabe:
+      dict: Job-ID -> {"file_path", "state", "attempts", "max_attempts", "error", "convert_seconds",
+                       "analysis_seconds", "progress_done", "progress_failed", "converted_file"}
+    """
+    jobs = {}
+    if not job_ids:
+        return jobs
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    fields = ("file_path", "state", "attempts", "max_attempts", "error", "convert_seconds",
+              "analysis_seconds", "progress_done", "progress_failed", "converted_file")
+    job_ids = list(job_ids)
+    # SQLite begrenzt die Anzahl der Platzhalter pro Abfrage
+    for start in range(0, len(job_ids), 500):
+        chunk = job_ids[start:start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor.execute(f"SELECT id, {', '.join(fields)} FROM jobs WHERE id IN ({placeholders})", chunk)
+        for row in cursor.fetchall():
+            jobs[row[0]] = dict(zip(fields, row[1:]))
+
+    connection.close()
+    return jobs
+
+
+def _heartbeat(database_path, job_id, worker_id, stop_event):
+    while not stop_event.wait(HEARTBEAT_INTERVAL):
+        if not renew_lease(database_path, job_id, worker_id):
+            print(f"Lease für Job {job_id} verloren.")
+            return
+
+
+def finished_jobs_since(database_path, since):
+    """
+    IDs der Datei-Jobs, die seit dem Zeitpunkt since (Unix-Zeit) abgeschlossen wurden.
+    """
+    connection = _connect(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("SELECT id FROM jobs WHERE parent_id IS NULL AND finished_at >= ?", (since,))
+    job_ids = [row[0] for row in cursor.fetchall()]
+
+    connection.close()
+    return job_ids
+
+
+def _try_split(database_path, worker_id, job, parts):
+    """
+    Teilt einen Datei-Job mit langer vorhergesagter Laufzeit in Teil-Jobs je Metrikgruppe auf,
+    damit die Metriken eines großen Graphen auf mehreren Workern parallel laufen.
+
+    Rückgabe:
+      bool: True, wenn der Job aufgeteilt wurde.
+    """
+    from backend import scheduler, catalog
+    from backend.metrics import ingest_metrics
+    from backend.file_converter import convert_file
+
+    if parts < 2 or is_archive(job["file_path"]) or (job["predicted_seconds"] or 0.0) < scheduler.SPLIT_THRESHOLD:
+        return False
+    try:
+        converted_file, data_source = convert_file(job["file_path"])
+        entry = catalog.scan_file(database_path, converted_file)
+        nodes, edges = entry["nodes"], entry["edges"]
+    except Exception as e:
+        # Fehler meldet die normale Verarbeitung
+        print(f"Job {job['id']} wird nicht aufgeteilt: {e}")
+        return False
+
+    model = scheduler.CostModel.fit(database_path)
+    predictions = model.predict_metrics(ingest_metrics(data_source), nodes, edges)
+    if sum(predictions.values()) < scheduler.SPLIT_THRESHOLD:
+        return False
+    groups = scheduler.split_metrics(predictions, parts)
+    if len(groups) < 2:
+        return False
+    # Jeder Teil-Job lädt den Graphen selbst; der Speicher hängt von seinen Metriken ab
+    memory_model = scheduler.MemoryModel.fit(database_path)
+    groups = [(metrics, seconds, memory_model.estimate(nodes, edges, metrics)) for metrics, seconds in groups]
+    job["nodes"], job["edges"] = nodes, edges
+    split_job(database_path, job, worker_id, converted_file, data_source, groups)
+    print(f"Job {job['id']} in {len(groups)} Teil-Jobs aufgeteilt "
+          f"({nodes} Knoten, {edges} Kanten, vorhergesagt {sum(predictions.values()):.1f} s).")
+    return True
+
+
+def run_metric_job(database_path, job):
+    """
+    Berechnet eine Gruppe von Metriken eines aufgeteilten Datei-Jobs und legt die Werte
+    für diesen ab. Fehlschlagende Metriken berechnet (bzw. überspringt) der Analyzer selbst.
+    """
+    from backend.archives import read_graph
+    from backend.metrics import MetricTimer
+
+    start = time.perf_counter()
+    G = read_graph(job["converted_file"])
+    # Teil-Jobs berechnen genau ihre Gruppe, unabhängig vom Ingest-Profil
+    timer = MetricTimer(deferred=())
+    values = {}
+    errors = []
+    for name in job["metrics"].split(","):
+        try:
+            values[name] = timer.compute(name, G)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+    save_metric_results(database_path, job["parent_id"], values)
+    save_metric_timings(database_path, G.number_of_nodes(), G.number_of_edges(), timer.timings)
+    if errors:
+        print(f"Teil-Job {job['id']}: " + "; ".join(errors))
+    return {"status": "ok", "error": "; ".join(errors) or None,
+            "convert_seconds": 0.0, "analysis_seconds": time.perf_counter() - start}
+
+
+def current_rss():
+    """
+    Aktuell belegter Arbeitsspeicher (Resident Set Size) des Prozesses in Bytes.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Ohne /proc (macOS): Höchstwert seit Prozessstart, unter macOS in Bytes, sonst in KB
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class PeakMemory:
+    """
+    Misst den Spitzenspeicher eines Blocks: RSS-Zuwachs gegenüber dem Start (abgetastet in
+    einem Hintergrund-Thread) und optional den Höchstwert der Python-Allokationen (tracemalloc).
+    Kindprozesse (z. B. der Prozesspool eines Archivs) werden nicht erfasst.
+    """
+
+    def __init__(self, trace=False, interval=MEMORY_SAMPLE_INTERVAL):
+        self.trace = trace
+        self.interval = interval
+        self.peak_rss = None
+        self.peak_traced = None
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, current_rss())
+
+    def __enter__(self):
+        self._baseline = self._peak = current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        if self.trace:
+            import tracemalloc
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self._peak, current_rss()) - self._baseline
+        if self.trace:
+            import tracemalloc
+            self.peak_traced = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+        return False
+
+
+def run_job(database_path, worker_id, job, pool_size=1, trace_memory=False):
+    """
+    Verarbeitet einen übernommenen Job; die Lease wird währenddessen in einem
+    Hintergrund-Thread verlängert und der Spitzenspeicher gemessen.
+
+    Rückgabe:
+      str: neuer Zustand des Jobs ("split", falls in Teil-Jobs aufgeteilt).
+    """
+    from backend import pipeline
+
+    job_id = job["id"]
+    counts = {"ok": 0, "error": 0}
+
+    def on_event(event):
+        # Nur Archivmitglieder melden innerhalb eines Jobs Fortschritt
+        if event["event"] == "finished" and event.get("archive"):
+            counts["ok" if event["status"] == "ok" else "error"] += 1
+            update_progress(database_path, job_id, counts["ok"], counts["error"])
+
+    stop_heartbeat = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(database_path, job_id, worker_id, stop_heartbeat),
+                                 daemon=True)
+    heartbeat.start()
+    memory = PeakMemory(trace=trace_memory)
+    try:
+        if job["kind"] == FILE_JOB and job["converted_file"] is None \
+                and _try_split(database_path, worker_id, job, pool_size):
+            return "split"
+        with memory:
+            if job["kind"] == METRICS_JOB:
+                event = run_metric_job(database_path, job)
+            elif job["kind"] == LAZY_JOB:
+                from backend.lazy_metrics import run_lazy_job
+                event = run_lazy_job(database_path, job)
+            else:
+                converted = precomputed = None
+                if job["converted_file"] is not None:
+                    converted = (job["converted_file"], job["data_source"])
+                    precomputed = pop_metric_results(database_path, job_id)
+                event = pipeline.process_file(job["file_path"], progress_callback=on_event,
+                                              converted=converted, precomputed=precomputed,
+                                              database_path=database_path)
+    except Exception as e:
+        event = {"status": "error", "error": str(e), "retryable": True}
+    finally:
+        stop_heartbeat.set()
+        heartbeat.join()
+    return finish_job(database_path, job_id, worker_id, event, memory.peak_rss, memory.peak_traced)
+
+
+def worker_loop(database_path=database_path, worker_id=None, stop_event=None, exit_when_idle=False, pool_size=1,
+                memory_budget=None, trace_memory=False):
+    """
+    Arbeitet Jobs aus der Queue ab, bis stop_event gesetzt ist
+    (bzw. bis nichts mehr wartet, falls exit_when_idle). pool_size ist die Anzahl der
+    Worker insgesamt; auf so viele Teil-Jobs wird ein großer Datei-Job höchstens aufgeteilt.
+    memory_budget (Bytes) begrenzt den geschätzten Speicher aller laufenden Jobs zusammen.
+    """
+    # Pipeline und Analyzer vorab laden, damit der Import nicht in den Speicher des ersten Jobs eingeht
+    from backend import pipeline  # noqa: F401
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stop_event = stop_event or threading.Event()
+    print(f"Worker {worker_id} gestartet.")
+
+    while not stop_event.is_set():
+        requeue_expired(database_path)
+        job = claim_job(database_path, worker_id, memory_budget=memory_budget)
+        if job is None:
+            if exit_when_idle and not _has_pending(database_path):
+                break
+            stop_event.wait(IDLE_SLEEP)
+            continue
+        print(f"Worker {worker_id}: Job {job['id']} ({job['file_path']}), Versuch {job['attempts']}")
+        state = run_job(database_path, worker_id, job, pool_size, trace_memory)
+        print(f"Worker {worker_id}: Job {job['id']} -> {state}")
+
+    print(f"Worker {worker_id} beendet.")
+
+
+def _has_pending(database_path):
+    counts = queue_counts(database_path)
+    return counts[QUEUED] + counts[RUNNING] > 0
+
+
+class WorkerPool:
+    """
+    Startet Worker-Prozesse, die die Queue abarbeiten.
+
+    Die Prozesse sind keine Daemon-Prozesse, damit sie für Archive selbst einen
+    Prozesspool starten dürfen. Worker, die beim Beenden abgebrochen werden, geben
+    ihre Jobs über release_jobs bzw. den Ablauf der Lease zurück in die Queue.
+
+    memory_budget (Bytes, Standard: scheduler.memory_budget()) begrenzt den geschätzten
+    Spitzenspeicher aller gleichzeitig laufenden Jobs; trace_memory misst zusätzlich
+    mit tracemalloc (genauer, aber langsamer).
+    """
+
+    def __init__(self, database_path=database_path, workers=None, exit_when_idle=True, memory_budget=None,
+                 trace_memory=False):
+        from backend import scheduler
+
+        self.database_path = database_path
+        self.workers = workers or max((os.cpu_count() or 2) // 2, 1)
+        self.exit_when_idle = exit_when_idle
+        self.memory_budget = memory_budget or scheduler.memory_budget()
+        self.trace_memory = trace_memory
+        self.context = multiprocessing.get_context("spawn")
+        self.stop_event = self.context.Event()
+        self.processes = []
+
+    def worker_ids(self):
+        return [f"{socket.gethostname()}:{p.pid}" for p in self.processes if p.pid is not None]
+
+    def is_running(self):
+        self.processes = [p for p in self.processes if p.is_alive()]
+        return bool(self.processes)
+
+    def start(self):
+        """
+        Startet fehlende Worker (bereits laufende werden weiterverwendet).
+        """
+        self.is_running()
+        self.stop_event.clear()
+        while len(self.processes) < self.workers:
+            process = self.context.Process(
+                target=worker_loop,
+                args=(self.database_path, None, self.stop_event, self.exit_when_idle, self.workers,
+                      self.memory_budget, self.trace_memory)
+            )
+            process.start()
+            self.processes.append(process)
+
+    def join(self):
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+    def stop(self, timeout=2.0):
+        """
+        Beendet alle Worker. Laufende Jobs werden abgebrochen und sofort wieder eingereiht.
+        """
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for process in self.processes:
+            process.join(max(deadline - time.monotonic(), 0))
+        worker_ids = self.worker_ids()
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        release_jobs(self.database_path, worker_ids)
+        self.processes = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Persistente Analyse-Queue.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Dateien einreihen")
+    enqueue_parser.add_argument("files", nargs="+", help="Dateien (aus temp_uploads/) oder Archive")
+    enqueue_parser.add_argument("--priority", type=int, default=BATCH_PRIORITY, help="Priorität (höher = früher)")
+
+    work_parser = subparsers.add_parser("work", help="Worker starten")
+    work_parser.add_argument("--workers", type=int, default=None, help="Anzahl der Worker-Prozesse")
+    work_parser.add_argument("--until-empty", action="store_true", help="Beenden, sobald die Queue leer ist")
+    work_parser.add_argument("--memory-budget", type=float, default=None,
+                             help="Speicherbudget aller laufenden Jobs in MB (Standard: halber Arbeitsspeicher)")
+    work_parser.add_argument("--trace-memory", action="store_true",
+                             help="Spitzenspeicher zusätzlich mit tracemalloc messen")
+    work_parser.add_argument("--profile", choices=("full", "structural"), default=None,
+                             help="Ingest-Profil: alle Metriken sofort oder aufwendige erst bei Bedarf")
+
+    subparsers.add_parser("status", help="Zustand der Queue anzeigen")
+    args = parser.parse_args()
+
+    initialize_database(database_path)
+    if args.command == "enqueue":
+        job_ids = enqueue_files(database_path, args.files, priority=args.priority)
+        print(f"{len(job_ids)} Job(s) eingereiht.")
+    elif args.command == "work":
+        from backend import scheduler
+        from backend.metrics import INGEST_PROFILE_ENV
+
+        if args.profile:
+            # Die Worker-Prozesse erben die Umgebung
+            os.environ[INGEST_PROFILE_ENV] = args.profile
+        budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+        pool = WorkerPool(database_path, workers=args.workers, exit_when_idle=args.until_empty,
+                          memory_budget=budget, trace_memory=args.trace_memory)
+        print(f"Speicherbudget: {pool.memory_budget / 1024 ** 2:.0f} MB")
+        started = time.time()
+        pool.start()
+        try:
+            pool.join()
+        except KeyboardInterrupt:
+            pool.stop()
+            print("Worker beendet.")
+        report = scheduler.makespan_report(database_path, finished_jobs_since(database_path, started), pool.workers)
+        if report:
+            print(scheduler.format_makespan(report))
+    else:
+        counts = queue_counts(database_path)
+        print(", ".join(f"{state}: {count}" for state, count in counts.items()))
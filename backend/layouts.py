@@ -0,0 +1,210 @@
+import numpy as np
+import networkx as nx
+
+# Knotenattribute mit gespeicherten Koordinaten als (Längengrad, Breitengrad)-Paare:
+#   - TopologyZoo-GraphML: Longitude / Latitude
+#   - SNDlib-Konverter: x / y
+GEO_ATTRIBUTE_PAIRS = [("Longitude", "Latitude"), ("x", "y")]
+
+# Anteil der Knoten mit Koordinaten, ab dem der Modus "auto" das geografische Layout wählt
+GEO_MIN_COVERAGE = 0.5
+
+# Web-Mercator ist an den Polen nicht definiert
+MERCATOR_MAX_LATITUDE = 85.05112878
+
+
+def compute_layout(G, k=0.1, iterations=50):
+    """
+    Berechnet ein Force-Directed-Layout (Fruchterman-Reingold) für den Graphen.
+    """
+    try:
+        pos = nx.spring_layout(G, k=k, iterations=iterations)
+        return pos
+    except Exception as e:
+        print("Fehler bei der Layout-Berechnung:", e)
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def extract_geo_coordinates(G):
+    """
+    Liest die gespeicherten Koordinaten aller Knoten aus.
+
+    Rückgabe:
+      tuple: (Knotenliste, Array der Form (n, 2) mit [Längengrad, Breitengrad]);
+             Knoten ohne Koordinaten erhalten NaN.
+    """
+    nodes = list(G.nodes())
+    coords = np.full((len(nodes), 2), np.nan)
+    for lon_key, lat_key in GEO_ATTRIBUTE_PAIRS:
+        missing = np.isnan(coords).any(axis=1)
+        if not missing.any():
+            break
+        pair = np.array(
+            [(_to_float(G.nodes[n].get(lon_key)), _to_float(G.nodes[n].get(lat_key))) for n in nodes],
+            dtype=float,
+        ).reshape(-1, 2)
+        usable = missing & ~np.isnan(pair).any(axis=1)
+        coords[usable] = pair[usable]
+    return nodes, coords
+
+
+def geo_coverage(G):
+    """
+    Anteil der Knoten, für die Koordinaten gespeichert sind (0..1).
+    """
+    if G.number_of_nodes() == 0:
+        return 0.0
+    _, coords = extract_geo_coordinates(G)
+    return float((~np.isnan(coords).any(axis=1)).mean())
+
+
+def project_coordinates(lon, lat, projection="mercator"):
+    """
+    Projiziert Längen-/Breitengrade (Grad, NumPy-Arrays) vektorisiert in die Ebene.
+
+    Parameter:
+      projection (str): "mercator" (Web-Mercator), "equirectangular" (mit dem mittleren
+                        Breitengrad als Standardparallele) oder "planar" (Koordinaten
+                        werden unverändert übernommen, z. B. für nicht-geografische SNDlib-Daten).
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    if projection == "planar":
+        return lon.copy(), lat.copy()
+    if projection == "equirectangular":
+        standard_parallel = np.radians(np.nanmean(lat)) if lat.size else 0.0
+        return np.radians(lon) * np.cos(standard_parallel), np.radians(lat)
+    if projection == "mercator":
+        lat = np.clip(lat, -MERCATOR_MAX_LATITUDE, MERCATOR_MAX_LATITUDE)
+        return np.radians(lon), np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+    raise ValueError(f"Unbekannte Projektion: {projection}")
+
+
+def _normalize(xy):
+    """
+    Verschiebt und skaliert Punkte seitenverhältnistreu in das Quadrat [-1, 1]²,
+    damit Klick-Toleranzen und Kamera wie beim Force-Directed-Layout funktionieren.
+    """
+    lower = xy.min(axis=0)
+    upper = xy.max(axis=0)
+    center = (lower + upper) / 2
+    extent = (upper - lower).max() / 2
+    if extent <= 0:
+        extent = 1.0
+    return (xy - center) / extent
+
+
+def compute_geo_layout(G, projection="mercator", k=0.1, iterations=15, seed=None):
+    """
+    Geografisches Layout aus den gespeicherten Knotenkoordinaten.
+
+    Knoten mit Koordinaten werden direkt (vektorisiert) projiziert und bleiben fix.
+    Nur Knoten ohne Koordinaten werden mit einem kurzen lokalen Force-Directed-Durchlauf
+    auf dem Teilgraphen aus diesen Knoten und ihren Nachbarn platziert.
+
+    Rückgabe:
+      dict: Knoten -> np.array([x, y]) oder None, falls kein Knoten Koordinaten hat.
+    """
+    nodes, coords = extract_geo_coordinates(G)
+    has_coords = ~np.isnan(coords).any(axis=1)
+    if not has_coords.any():
+        return None
+
+    lon, lat = coords[has_coords, 0], coords[has_coords, 1]
+    # Werte außerhalb des Gradbereichs sind keine geografischen Koordinaten
+    if projection != "planar" and (np.abs(lon).max() > 180 or np.abs(lat).max() > 90):
+        projection = "planar"
+    x, y = project_coordinates(lon, lat, projection)
+    placed = _normalize(np.column_stack([x, y]))
+
+    pos = {}
+    for node, xy in zip([n for n, ok in zip(nodes, has_coords) if ok], placed):
+        pos[node] = xy
+
+    missing = [n for n, ok in zip(nodes, has_coords) if not ok]
+    if missing:
+        rng = np.random.default_rng(seed)
+        centroid = placed.mean(axis=0)
+        missing_set = set(missing)
+
+        # Startposition: Mittelwert der bereits platzierten Nachbarn, sonst der Schwerpunkt
+        initial = {}
+        for node in missing:
+            anchors = [pos[nb] for nb in G.neighbors(node) if nb in pos]
+            base = np.mean(anchors, axis=0) if anchors else centroid
+            initial[node] = base + rng.normal(scale=k / 4, size=2)
+
+        # Lokaler Teilgraph: fehlende Knoten plus deren platzierte Nachbarn (fix)
+        local_nodes = set(missing)
+        for node in missing:
+            local_nodes.update(G.neighbors(node))
+        H = G.subgraph(local_nodes)
+        fixed = [n for n in H if n not in missing_set]
+        start = {n: (pos[n] if n in pos else initial[n]) for n in H}
+        try:
+            if fixed:
+                local_pos = nx.spring_layout(H, pos=start, fixed=fixed, k=k,
+                                             iterations=iterations, seed=seed)
+            else:
+                local_pos = start
+        except Exception as e:
+            print("Fehler beim lokalen Layout-Durchlauf:", e)
+            local_pos = start
+        for node in missing:
+            pos[node] = np.asarray(local_pos[node], dtype=float)
+
+    return pos
+
+
+def compute_community_layout(G, communities, k=0.1, iterations=50, seed=None):
+    """
+    Zweistufiges Layout mit Communities als grober Ebene: Zuerst wird der Community-Graph
+    (ein Knoten je Community, Kantengewicht = Anzahl der Kanten zwischen den Communities)
+    per Force-Directed-Layout angeordnet, danach jede Community für sich um ihren Punkt
+    mit einem Radius proportional zur Wurzel ihres Knotenanteils. Große Graphen kommen so
+    mit kleinen Force-Directed-Läufen aus, und Communities bleiben räumlich getrennt.
+
+    Parameter:
+      communities (dict): Knoten -> Community (z. B. backend.communities.node_communities).
+
+    Rückgabe:
+      dict: Knoten -> np.array([x, y]) im Quadrat [-1, 1]², oder None bei einem Fehler.
+    """
+    nodes = list(G.nodes())
+    if not nodes:
+        return {}
+    try:
+        members = {}
+        for node in nodes:
+            members.setdefault(communities.get(node, -1), []).append(node)
+        coarse = nx.Graph()
+        coarse.add_nodes_from(members)
+        for u, v in G.edges():
+            cu, cv = communities.get(u, -1), communities.get(v, -1)
+            if cu != cv:
+                weight = coarse.get_edge_data(cu, cv, {"weight": 0})["weight"]
+                coarse.add_edge(cu, cv, weight=weight + 1)
+        centers = nx.spring_layout(coarse, k=k * 5, iterations=iterations, weight="weight", seed=seed)
+
+        pos = {}
+        for community, group in members.items():
+            radius = 0.5 * np.sqrt(len(group) / len(nodes))
+            if len(group) == 1:
+                pos[group[0]] = np.asarray(centers[community], dtype=float)
+                continue
+            inner = nx.spring_layout(G.subgraph(group), k=k, iterations=iterations, seed=seed,
+                                     center=centers[community], scale=radius)
+            for node in group:
+                pos[node] = np.asarray(inner[node], dtype=float)
+        placed = _normalize(np.array([pos[n] for n in nodes]))
+        return dict(zip(nodes, placed))
+    except Exception as e:
+        print("Fehler bei der Community-Layout-Berechnung:", e)
+        return None
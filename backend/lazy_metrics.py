@@ -0,0 +1,228 @@
+import sys
+import time
+import argparse
+
+from backend.database_handler import initialize_database, save_metric_timings
+from backend.metrics import METRIC_FUNCTIONS, LAZY_METRICS, EXTRA_COLUMNS, MetricTimer, encode_metric
+from backend import job_queue
+
+# Pfad zur SQLite-Datenbank
+database_path = "./network_analysis.db"
+
+# Zustände einer zurückgestellten Metrik (Tabelle lazy_metrics)
+DEFERRED = "deferred"   # beim Einlesen übersprungen, noch nicht angefordert
+PENDING = "pending"     # angefordert, Job wartet oder läuft
+DONE = "done"           # berechnet, Wert steht in analysis_results
+FAILED = "failed"       # Berechnung fehlgeschlagen (z. B. Graph nicht verbunden)
+
+
+def request_metrics(database_path, metrics, result_ids=None, priority=job_queue.INTERACTIVE_PRIORITY,
+                    retry_failed=False):
+    """
+    Reiht die Berechnung zurückgestellter Metriken ein: ein Job je Graph für alle
+    angeforderten Metriken (der Graph wird so nur einmal gelesen). Bereits berechnete oder
+    angeforderte Metriken werden nicht erneut eingereiht; jede Metrik wird also höchstens
+    einmal je Graph berechnet.
+
+    Parameter:
+      metrics (iterable): Namen der Metriken (Spalten in analysis_results).
+      result_ids (iterable): Optional, nur diese Ergebniszeilen (sonst alle).
+      retry_failed (bool): Auch fehlgeschlagene Metriken erneut versuchen.
+
+    Rückgabe:
+      list: IDs der neuen Jobs.
+    """
+    from backend import scheduler
+
+    metrics = [name for name in metrics if name in METRIC_FUNCTIONS]
+    if not metrics:
+        return []
+    model = scheduler.CostModel.fit(database_path)
+    memory_model = scheduler.MemoryModel.fit(database_path)
+    states = (DEFERRED, FAILED) if retry_failed else (DEFERRED,)
+
+    connection = job_queue._connect(database_path)
+    connection.isolation_level = None
+    cursor = connection.cursor()
+    now = time.time()
+    job_ids = []
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"""
+            SELECT lazy.result_id, lazy.metric, lazy.graph_file, results.number_of_nodes, results.number_of_edges
+            FROM lazy_metrics AS lazy JOIN analysis_results AS results ON results.id = lazy.result_id
+            WHERE lazy.metric IN ({", ".join("?" for _ in metrics)})
+              AND lazy.state IN ({", ".join("?" for _ in states)})
+            ORDER BY lazy.result_id
+        """, (*metrics, *states))
+        graphs = {}
+        wanted = None if result_ids is None else set(result_ids)
+        for result_id, metric, graph_file, nodes, edges in cursor.fetchall():
+            if wanted is None or result_id in wanted:
+                graphs.setdefault(result_id, (graph_file, nodes or 0, edges or 0, []))[3].append(metric)
+
+        for result_id, (graph_file, nodes, edges, names) in graphs.items():
+            seconds = sum(model.predict_metrics(names, nodes, edges).values())
+            cursor.execute("""
+                INSERT INTO jobs (file_path, priority, state, attempts, max_attempts, not_before, created_at,
+                                  kind, metrics, converted_file, result_id, predicted_seconds, predicted_memory,
+                                  nodes, edges)
+                VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (graph_file, priority, job_queue.QUEUED, job_queue.MAX_ATTEMPTS, now, now, job_queue.LAZY_JOB,
+                  ",".join(names), graph_file, result_id, seconds, memory_model.estimate(nodes, edges, names),
+                  nodes, edges))
+            job_ids.append(cursor.lastrowid)
+            cursor.executemany("""
+                UPDATE lazy_metrics SET state = ?, job_id = ?, error = NULL, updated_at = ?
+                WHERE result_id = ? AND metric = ?
+            """, [(PENDING, cursor.lastrowid, now, result_id, name) for name in names])
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+    return job_ids
+
+
+def get_metric_states(database_path, result_ids=None):
+    """
+    Zustand der zurückgestellten Metriken. Angeforderte Metriken, deren Job endgültig
+    fehlgeschlagen ist, gelten als fehlgeschlagen.
+
+    Rückgabe:
+      dict: (result_id, Metrik) -> (Zustand, Fehlermeldung oder None)
+    """
+    connection = job_queue._connect(database_path)
+    cursor = connection.cursor()
+
+    cursor.execute("""
+        SELECT lazy.result_id, lazy.metric,
+               CASE WHEN lazy.state = ? AND jobs.state = ? THEN ? ELSE lazy.state END,
+               COALESCE(lazy.error, jobs.error)
+        FROM lazy_metrics AS lazy LEFT JOIN jobs ON jobs.id = lazy.job_id
+    """, (PENDING, job_queue.FAILED, FAILED))
+    rows = cursor.fetchall()
+
+    connection.close()
+    wanted = None if result_ids is None else set(result_ids)
+    return {(result_id, metric): (state, error) for result_id, metric, state, error in rows
+            if wanted is None or result_id in wanted}
+
+
+def get_metric_values(database_path, keys):
+    """
+    Gespeicherte Werte für (result_id, Metrik)-Paare aus analysis_results. Für Metriken mit
+    Zusatzspalte (z. B. Rechenweg der Konnektivität) wird auch diese unter (result_id, Spalte) geliefert.
+
+    Rückgabe:
+      dict: (result_id, Spalte) -> Wert
+    """
+    connection = job_queue._connect(database_path)
+    cursor = connection.cursor()
+
+    values = {}
+    for result_id, metric in keys:
+        if metric not in METRIC_FUNCTIONS:
+            continue
+        columns = [metric] + ([EXTRA_COLUMNS[metric]] if metric in EXTRA_COLUMNS else [])
+        cursor.execute(f"SELECT {', '.join(columns)} FROM analysis_results WHERE id = ?", (result_id,))
+        row = cursor.fetchone()
+        if row:
+            values.update(((result_id, column), value) for column, value in zip(columns, row))
+
+    connection.close()
+    return values
+
+
+def _save_metric(database_path, job_id, result_id, metric, value=None, error=None, extra=None):
+    """
+    Schreibt eine nachträglich berechnete Metrik in ihre Ergebniszeile (bzw. den Fehler),
+    ggf. zusammen mit ihrer Zusatzspalte (z. B. Rechenweg der Konnektivität).
+    """
+    connection = job_queue._connect(database_path)
+    cursor = connection.cursor()
+
+    if error is None:
+        cursor.execute(f"UPDATE analysis_results SET {metric} = ? WHERE id = ?", (value, result_id))
+        if metric in EXTRA_COLUMNS:
+            cursor.execute(f"UPDATE analysis_results SET {EXTRA_COLUMNS[metric]} = ? WHERE id = ?",
+                           (extra, result_id))
+    cursor.execute("""
+        UPDATE lazy_metrics SET state = ?, error = ?, updated_at = ?
+        WHERE result_id = ? AND metric = ? AND job_id = ?
+    """, (DONE if error is None else FAILED, error, time.time(), result_id, metric, job_id))
+
+    connection.commit()
+    connection.close()
+
+
+def run_lazy_job(database_path, job):
+    """
+    Berechnet die angeforderten Metriken eines Graphen und speichert jede sofort, damit die
+    GUI die Zellen nacheinander füllen kann. Fehlschlagende Metriken werden als
+    fehlgeschlagen markiert und nicht wiederholt.
+    """
+    from backend.archives import read_graph
+
+    start = time.perf_counter()
+    names = [name for name in job["metrics"].split(",") if name in METRIC_FUNCTIONS]
+    try:
+        G = read_graph(job["converted_file"])
+    except Exception as e:
+        for name in names:
+            _save_metric(database_path, job["id"], job["result_id"], name, error=str(e))
+        return {"status": "error", "error": str(e), "retryable": False}
+
+    timer = MetricTimer(deferred=())
+    errors = []
+    for name in names:
+        try:
+            value = timer.compute(name, G)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            _save_metric(database_path, job["id"], job["result_id"], name, error=str(e))
+            continue
+        extra = value[1] if name in EXTRA_COLUMNS else None
+        _save_metric(database_path, job["id"], job["result_id"], name, encode_metric(value), extra=extra)
+    save_metric_timings(database_path, G.number_of_nodes(), G.number_of_edges(), timer.timings)
+    if errors:
+        print(f"Job {job['id']}: " + "; ".join(errors))
+    return {"status": "ok", "error": "; ".join(errors) or None,
+            "convert_seconds": 0.0, "analysis_seconds": time.perf_counter() - start}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zurückgestellte Metriken bei Bedarf berechnen.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    request_parser = subparsers.add_parser("request", help="Metriken anfordern")
+    request_parser.add_argument("metrics", nargs="+", choices=LAZY_METRICS, metavar="metric",
+                                help="Metriken, z. B. betweenness_centrality")
+    request_parser.add_argument("--ids", nargs="+", type=int, help="Nur diese Ergebniszeilen (id)")
+    request_parser.add_argument("--retry-failed", action="store_true", help="Fehlgeschlagene erneut versuchen")
+    request_parser.add_argument("--work", action="store_true", help="Jobs anschließend selbst abarbeiten")
+    request_parser.add_argument("--workers", type=int, default=None, help="Anzahl Worker-Prozesse")
+
+    subparsers.add_parser("status", help="Zustände der zurückgestellten Metriken anzeigen")
+
+    args = parser.parse_args()
+    initialize_database(database_path)
+
+    if args.command == "request":
+        job_ids = request_metrics(database_path, args.metrics, args.ids, priority=job_queue.BATCH_PRIORITY,
+                                  retry_failed=args.retry_failed)
+        print(f"{len(job_ids)} Job(s) eingereiht.")
+        if args.work and job_ids:
+            pool = job_queue.WorkerPool(database_path, workers=args.workers, exit_when_idle=True)
+            pool.start()
+            pool.join()
+    else:
+        counts = {}
+        for (_, metric), (state, _) in get_metric_states(database_path).items():
+            counts.setdefault(metric, {}).setdefault(state, 0)
+            counts[metric][state] += 1
+        if not counts:
+            print("Keine zurückgestellten Metriken.", file=sys.stderr)
+        for metric, by_state in sorted(counts.items()):
+            print(f"{metric}: " + ", ".join(f"{state} {count}" for state, count in sorted(by_state.items())))
@@ -0,0 +1,295 @@
+import os
+import json
+import time
+
+# Aufwendige, voneinander unabhängige Metriken der Analyzer: Name -> NetworkX-Funktion
+# (None: nur eigene Implementierung, siehe compute_metric).
+# Die Namen entsprechen den Schlüsseln im Ergebnis-Dictionary und in metric_timings.
+METRIC_FUNCTIONS = {
+    "node_connectivity": "node_connectivity",
+    "edge_connectivity": "edge_connectivity",
+    "global_efficiency": "global_efficiency",
+    "local_efficiency": "local_efficiency",
+    "average_clustering": "average_clustering",
+    "transitivity": "transitivity",
+    "graph_center": "center",
+    "betweenness_centrality": "betweenness_centrality",
+    "edge_betweenness": "edge_betweenness_centrality",
+    "closeness_centrality": "closeness_centrality",
+    "pagerank": "pagerank",
+    "diameter": "diameter",
+    "radius": "radius",
+    "periphery": "periphery",
+    "is_planar": "check_planarity",
+    "effective_diameter": None,
+    "average_distance": None,
+    "approx_global_efficiency": None,
+    "hop_plot": None,
+    "algebraic_connectivity": "algebraic_connectivity",
+    "spectral_radius": None,
+    "spectral_gap": None,
+    "natural_connectivity": None,
+    "eigenvector_centrality": "eigenvector_centrality",
+    "coreness": "core_number",
+    "degeneracy": None,
+    "rich_club": "rich_club_coefficient",
+    "degree_assortativity": "degree_assortativity_coefficient",
+    "communities": None,
+    "modularity": None,
+    "number_of_communities": None,
+}
+
+# Distanzverteilung aus einem gemeinsamen Lauf von backend/hyperanf.py
+SKETCH_METRICS = ("effective_diameter", "average_distance", "approx_global_efficiency", "hop_plot")
+
+# Knoten- und Kanten-Betweenness aus einem gemeinsamen Lauf von backend/betweenness.py
+BETWEENNESS_METRICS = ("betweenness_centrality", "edge_betweenness")
+
+# Spektrale Kennzahlen aus einem gemeinsamen Lauf von backend/spectral.py
+SPECTRAL_METRICS = ("algebraic_connectivity", "spectral_radius", "spectral_gap", "natural_connectivity",
+                    "eigenvector_centrality")
+
+# k-Core-Zerlegung, Rich-Club und Assortativität aus einem gemeinsamen Lauf von backend/structure.py
+STRUCTURE_METRICS = ("coreness", "degeneracy", "rich_club", "degree_assortativity")
+
+# Community-Erkennung (Partition und Modularität) aus einem gemeinsamen Lauf von backend/communities.py
+COMMUNITY_METRICS = ("communities", "modularity", "number_of_communities")
+
+# Metriken, die der Analyzer der jeweiligen Datenquelle berechnet (ohne bedingte Abkürzungen)
+SOURCE_METRICS = {
+    "TopologyZoo": tuple(METRIC_FUNCTIONS),
+    "SNDlib": tuple(METRIC_FUNCTIONS),
+    "Rocketfuel": ("node_connectivity", "edge_connectivity", "global_efficiency", "local_efficiency",
+                   "average_clustering", "transitivity", "graph_center", "diameter", "radius", "periphery", "is_planar", *SKETCH_METRICS,
+                   *SPECTRAL_METRICS, *STRUCTURE_METRICS, *COMMUNITY_METRICS),
+    "CAIDA_AS": ("node_connectivity", "edge_connectivity", "is_planar", "diameter", "radius", *SKETCH_METRICS,
+                 *SPECTRAL_METRICS, *STRUCTURE_METRICS, *COMMUNITY_METRICS),
+}
+
+# Aufwendige Metriken (alle Knotenpaare bzw. Flüsse), die das Ingest-Profil "structural" beim
+# Einlesen zurückstellt; sie werden erst berechnet, wenn sie in der GUI oder per
+# backend/lazy_metrics.py angefordert werden. Günstige Strukturmetriken laufen immer sofort.
+LAZY_METRICS = (
+    "node_connectivity", "edge_connectivity", "global_efficiency", "local_efficiency",
+    "graph_center", "betweenness_centrality", "edge_betweenness", "closeness_centrality",
+    "diameter", "radius", "periphery",
+)
+
+# Metriken, die ein Tupel (Wert, Zusatz) liefern: Planarität mit Einbettung,
+# Konnektivität mit dem Rechenweg aus backend/connectivity.py, Distanzverteilung mit Fehler
+TUPLE_METRICS = ("is_planar", "node_connectivity", "edge_connectivity", *SKETCH_METRICS)
+
+# Spalte in analysis_results, in der der Zusatz eines Tupels abgelegt wird
+EXTRA_COLUMNS = {
+    "node_connectivity": "node_connectivity_method",
+    "edge_connectivity": "edge_connectivity_method",
+    **{name: f"{name}_error" for name in SKETCH_METRICS},
+}
+
+# Metriken, die gemeinsam aus einem Lauf von backend/eccentricity.py hervorgehen
+ECCENTRICITY_METRICS = ("diameter", "radius", "graph_center", "periphery")
+
+# Distanzmetriken, die nur auf zusammenhängenden Graphen definiert sind und deshalb auf der
+# größten (stark) zusammenhängenden Komponente berechnet werden (siehe GraphViews.largest)
+COMPONENT_METRICS = ECCENTRICITY_METRICS
+
+# Gemeinsame Berechnung -> Metriken, die daraus hervorgehen
+METRIC_BUNDLES = {
+    "extrema": ECCENTRICITY_METRICS,
+    "distance_sketch": SKETCH_METRICS,
+    "brandes": BETWEENNESS_METRICS,
+    "spectral": SPECTRAL_METRICS,
+    "structure": STRUCTURE_METRICS,
+    "communities": COMMUNITY_METRICS,
+}
+BUNDLE_OF = {name: bundle for bundle, names in METRIC_BUNDLES.items() for name in names}
+
+# Ingest-Profil -> beim Einlesen zurückgestellte Metriken
+INGEST_PROFILES = {
+    "full": (),
+    "structural": LAZY_METRICS,
+}
+INGEST_PROFILE_ENV = "NETWORK_ANALYZER_INGEST_PROFILE"
+DEFAULT_INGEST_PROFILE = "structural"
+
+
+def deferred_metrics(profile=None):
+    """
+    Metriken, die das Ingest-Profil (Standard: Umgebungsvariable bzw. "structural")
+    beim Einlesen zurückstellt.
+    """
+    profile = profile or os.environ.get(INGEST_PROFILE_ENV) or DEFAULT_INGEST_PROFILE
+    if profile not in INGEST_PROFILES:
+        raise ValueError(f"Unbekanntes Ingest-Profil: {profile}")
+    return INGEST_PROFILES[profile]
+
+
+def ingest_metrics(data_source):
+    """
+    Aufwendige Metriken, die beim Einlesen einer Datenquelle tatsächlich berechnet werden.
+    """
+    deferred = deferred_metrics()
+    return tuple(name for name in SOURCE_METRICS.get(data_source, ()) if name not in deferred)
+
+
+def encode_metric(value):
+    """
+    Wert einer Metrik so, wie er in analysis_results abgelegt wird (Listen und
+    Dictionaries als JSON, Planarität als Wahrheitswert).
+    """
+    if isinstance(value, tuple):
+        value = value[0]
+    if isinstance(value, (list, dict, set)):
+        return json.dumps(sorted(value) if isinstance(value, set) else value)
+    return value
+
+
+def compute_metric(name, G, cache=None):
+    """
+    Berechnet eine Metrik aus METRIC_FUNCTIONS. Für die Planarität wird wie bei
+    nx.check_planarity ein Tupel geliefert, allerdings ohne Einbettung; die Konnektivität
+    liefert (Wert, Rechenweg) aus backend/connectivity.py, lokale Effizienz, Clustering und
+    Transitivität stammen aus dem Dreieckszählen in backend/triangles.py. Die Metriken eines Bündels
+    (METRIC_BUNDLES) stammen aus einem gemeinsamen Lauf, der in cache (dict) für die
+    übrigen Metriken des Bündels abgelegt wird: Durchmesser, Radius, Zentrum und Peripherie
+    aus backend/eccentricity.py (Zentrum und Peripherie werden erst bei Anfrage bestimmt),
+    die Distanzverteilung als (Wert, Fehler) aus backend/hyperanf.py,
+    Knoten- und Kanten-Betweenness (parallel über die Quellknoten) aus backend/betweenness.py,
+    die spektralen Kennzahlen aus backend/spectral.py, k-Core, Rich-Club und Assortativität
+    aus backend/structure.py, die Communities (je Graph zwischengespeichert) aus
+    backend/communities.py.
+    """
+    import networkx as nx
+
+    if name in BUNDLE_OF:
+        bundle = BUNDLE_OF[name]
+        if cache is None:
+            cache = {}
+        if bundle not in cache:
+            if bundle == "extrema":
+                from backend import eccentricity
+                cache[bundle] = eccentricity.EccentricityBounds(G)
+            elif bundle == "brandes":
+                from backend import betweenness
+                cache[bundle] = betweenness.betweenness(G)
+            elif bundle == "spectral":
+                from backend import spectral
+                cache[bundle] = spectral.spectral_metrics(G)
+            elif bundle == "structure":
+                from backend import structure
+                cache[bundle] = structure.structure_metrics(G)
+            elif bundle == "communities":
+                from backend import communities
+                cache[bundle] = communities.community_metrics(G)
+            else:
+                from backend import hyperanf
+                cache[bundle] = hyperanf.distance_statistics(G)
+        if bundle == "extrema":
+            # Zentrum und Peripherie werden erst bei ihrer Anfrage vollständig bestimmt
+            return cache[bundle].metric(name)
+        return cache[bundle]["center" if name == "graph_center" else name]
+
+    if name == "is_planar":
+        return nx.check_planarity(G)[0], None
+    if name in ("node_connectivity", "edge_connectivity"):
+        from backend import connectivity
+        return getattr(connectivity, name)(G)
+    if name in ("local_efficiency", "average_clustering", "transitivity"):
+        from backend import triangles
+        return getattr(triangles, name)(G)
+    return getattr(nx, METRIC_FUNCTIONS[name])(G)
+
+
+class MetricTimer:
+    """
+    Misst die Laufzeit der einzelnen Metriken einer Analyse (Grundlage des Kostenmodells
+    in backend/scheduler.py). Bereits in anderen Worker-Prozessen berechnete Werte
+    (precomputed) werden übernommen statt neu berechnet. Vom Ingest-Profil zurückgestellte
+    Metriken (deferred) liefern None und werden in pending vorgemerkt. Alle Metriken laufen
+    auf der zwischengespeicherten Sicht des Graphen (siehe view), Distanzmetriken
+    (COMPONENT_METRICS) auf deren größter Komponente.
+    """
+
+    def __init__(self, precomputed=None, deferred=None):
+        self.precomputed = precomputed or {}
+        self.deferred = set(deferred_metrics() if deferred is None else deferred)
+        self.timings = {}
+        self.pending = []
+        # Gemeinsame Zwischenergebnisse mehrerer Metriken (siehe compute_metric)
+        self.cache = {}
+        self.views = None
+
+    def view(self, G):
+        """
+        Graph, auf dem die Metriken berechnet werden (einfacher Graph bzw. interne Topologie
+        aus backend/graph_views.py). Die Sicht wird je eingelesenem Graphen einmal erzeugt.
+        """
+        from backend.graph_views import GraphViews
+
+        if self.views is None or not self.views.is_view(G):
+            self.views = GraphViews(G)
+        return self.views.metric_graph
+
+    def components(self, G):
+        """
+        Komponentengrößen der Metrik-Sicht (einmal je Graph extrahiert).
+
+        Rückgabe:
+          dict: number_of_components, largest_component_size, component_sizes und
+                strong_component_sizes (Verteilungen [[Größe, Anzahl], ...] als JSON,
+                stark zusammenhängende nur bei gerichteten Graphen)
+        """
+        from backend.graph_views import size_distribution
+
+        self.view(G)
+        components = self.views.components
+        return {
+            "number_of_components": len(components["weak"]),
+            "largest_component_size": len(components["largest"]),
+            "component_sizes": encode_metric(size_distribution(components["weak"])),
+            "strong_component_sizes": encode_metric(size_distribution(components["strong"])),
+        }
+
+    def time(self, name, func, *args, **kwargs):
+        """
+        Führt func aus und speichert die Laufzeit unter name.
+        """
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        # Nur erfolgreiche Berechnungen messen (Abbrüche wie "Graph nicht verbunden" verfälschen das Modell)
+        self.timings[name] = time.perf_counter() - start
+        return value
+
+    def compute(self, name, G):
+        """
+        Wert einer Metrik aus METRIC_FUNCTIONS (vorberechnet oder gemessen berechnet).
+        """
+        if name in self.precomputed:
+            return self.precomputed[name]
+        if name in self.deferred:
+            self.pending.append(name)
+            return (None, None) if name in TUPLE_METRICS else None
+        G = self.view(G)
+        if name in COMPONENT_METRICS:
+            G = self.views.largest
+        if name in BUNDLE_OF:
+            bundle = METRIC_BUNDLES[BUNDLE_OF[name]]
+            if BUNDLE_OF[name] in self.cache:
+                return compute_metric(name, G, self.cache)
+            # Die Laufzeit des gemeinsamen Laufs wird gleichmäßig auf die Metriken des Bündels verteilt
+            value = self.time(name, compute_metric, name, G, self.cache)
+            share = self.timings.pop(name) / len(bundle)
+            self.timings.update(dict.fromkeys(bundle, share))
+            return value
+        return self.time(name, compute_metric, name, G, self.cache)
+
+    def mark_pending(self, results):
+        """
+        Leert die zurückgestellten Metriken im Ergebnis-Dictionary (die Analyzer kodieren
+        Werte z. B. per json.dumps, aus None würde sonst "null").
+        """
+        for name in self.pending:
+            results[name] = None
+            if name in EXTRA_COLUMNS:
+                results[EXTRA_COLUMNS[name]] = None
+        return results
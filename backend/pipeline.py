@@ -1,47 +1,228 @@
+import io
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from backend.file_converter import convert_file
 from backend.data_processing import analyze_file  # angepasste Funktion, die eine einzelne Datei verarbeitet
 from backend.database_handler import initialize_database
+from backend.archives import (
+    is_archive, iter_member_data, member_ref, graphml_member_name, converted_member_path
+)
 
 # Pfad zur SQLite-Datenbank
 database_path = "./network_analysis.db"
 
-def process_files(file_paths):
+def _notify(progress_callback, event):
+    """
+    Ruft den Fortschritts-Callback auf; Fehler im Callback brechen die Verarbeitung nicht ab.
+    """
+    if progress_callback is None:
+        return
+    try:
+        progress_callback(event)
+    except Exception as e:
+        print("Fehler im Fortschritts-Callback:", e)
+
+
+def _process_member(archive_path, member, data, database_path):
+    """
+    Konvertiert und analysiert ein Archivmitglied direkt aus dem Speicher (Worker-Prozess).
+    In der DB wird es als "<archiv>!<mitglied>.graphml" geführt.
+
+    Rückgabe:
+      dict: Ergebnisfelder für das "finished"-Ereignis.
+    """
+    file_name = member_ref(os.path.basename(archive_path), graphml_member_name(member))
+    outcome = {"file_name": file_name, "status": "error", "converted_file": None, "data_source": None,
+               "convert_seconds": 0.0, "analysis_seconds": 0.0, "error": None, "results": None}
+
+    start = time.perf_counter()
+    try:
+        output_path = None
+        if not member.lower().endswith(".graphml"):
+            output_path = converted_member_path(archive_path, member)
+        converted, data_source = convert_file(member, stream=io.BytesIO(data), output_path=output_path)
+        outcome["converted_file"] = output_path
+        outcome["data_source"] = data_source
+    except Exception as e:
+        outcome["convert_seconds"] = time.perf_counter() - start
+        outcome["error"] = f"Konvertierung: {e}"
+        return outcome
+    outcome["convert_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        # Zurückgestellte Metriken lesen später aus der konvertierten Datei bzw. direkt aus dem Archiv
+        source_path = output_path or member_ref(archive_path, member)
+        analysis_results = analyze_file(converted, data_source, database_path, file_name=file_name,
+                                        source_path=source_path)
+        outcome["results"] = analysis_results
+        if isinstance(analysis_results, dict) and "error" in analysis_results:
+            outcome["error"] = analysis_results["error"]
+        else:
+            outcome["status"] = "ok"
+    except Exception as e:
+        outcome["error"] = f"Analyse: {e}"
+    outcome["analysis_seconds"] = time.perf_counter() - start
+    return outcome
+
+
+def process_archive(archive_path, workers=None, progress_callback=None, database_path=database_path):
+    """
+    Verarbeitet alle Mitglieder eines zip-/tar.gz-/tar.bz2-Archivs parallel, ohne es zu entpacken.
+    Das Archiv wird einmal gestreamt gelesen; die Mitglieder gehen als Bytes an Worker-Prozesse,
+    wobei nur eine begrenzte Anzahl gleichzeitig im Speicher gehalten wird.
+
+    Parameter:
+      workers (int): Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+      progress_callback (callable): Erhält pro Mitglied ein "finished"-Ereignis wie bei
+                                    process_files, mit file_path = Mitgliedsverweis und
+                                    archive = Archivpfad.
+      database_path (str): Datenbank, in die die Ergebnisse geschrieben werden.
+
+    Rückgabe:
+      list: Ergebnis-Dictionaries der erfolgreich verarbeiteten Mitglieder.
+    """
+    results = []
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    done_count = 0
+
+    def handle(future, member):
+        nonlocal done_count
+        outcome = future.result()
+        done_count += 1
+        if outcome["results"] is not None:
+            results.append(outcome["results"])
+        if outcome["error"]:
+            print(f"Fehler bei {outcome['file_name']}: {outcome['error']}")
+        event = dict(outcome, event="finished", archive=archive_path, index=done_count - 1, total=None,
+                     file_path=member_ref(archive_path, member))
+        event.pop("file_name")
+        _notify(progress_callback, event)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        for member, data in iter_member_data(archive_path):
+            pending[executor.submit(_process_member, archive_path, member, data, database_path)] = member
+            if len(pending) >= max_pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    handle(future, pending.pop(future))
+        for future in list(pending):
+            handle(future, pending.pop(future))
+
+    print(f"Archiv verarbeitet: {archive_path} ({done_count} Dateien)")
+    return results
+
+
+def process_files(file_paths, progress_callback=None, database_path=database_path):
     """
     Verarbeitet eine Liste von Dateien:
       1. Konvertiert die Datei ins GraphML-Format (falls erforderlich) und erhält die Datenquelle.
       2. Analysiert die konvertierte Datei, wobei der richtige Analyzer basierend auf der Datenquelle gewählt wird.
       3. Die Analyseergebnisse werden in der SQLite-Datenbank gespeichert.
       
+    Archive (.zip, .tar.gz, .tar.bz2) werden mit process_archive mitgliedsweise verarbeitet.
+
     Parameter:
       file_paths (list): Liste der Pfade zu den hochgeladenen Dateien (aus temp_uploads/).
+      progress_callback (callable): Optional, erhält pro Datei ein Ereignis-Dictionary:
+          - beim Start: {"event": "started", "file_path", "index", "total"}
+          - am Ende:    {"event": "finished", "file_path", "index", "total", "status" ("ok"/"error"),
+                         "converted_file", "data_source", "convert_seconds", "analysis_seconds",
+                         "error", "results"}
+      database_path (str): Datenbank, in die die Ergebnisse geschrieben werden.
       
     Rückgabe:
       list: Eine Liste mit den Ergebnis-Dictionaries aller verarbeiteten Dateien.
     """
     results = []
-    for file_path in file_paths:
-        try:
-            # Schritt 1: Konvertierung
-            converted_file, data_source = convert_file(file_path)
-            print(f"Datei konvertiert: {file_path} -> {converted_file} (Datenquelle: {data_source})")
-        except Exception as e:
-            print(f"Fehler bei der Konvertierung von {file_path}: {e}")
-            continue
+    total = len(file_paths)
+    for index, file_path in enumerate(file_paths):
+        _notify(progress_callback, {"event": "started", "file_path": file_path, "index": index, "total": total})
+        event = process_file(file_path, progress_callback=progress_callback, database_path=database_path)
+        event.update(index=index, total=total)
+        if event["status"] == "ok" and is_archive(file_path):
+            results.extend(event["results"])
+        elif event["results"] is not None:
+            results.append(event["results"])
+        _notify(progress_callback, event)
+
+    return results
+
 
+def process_file(file_path, progress_callback=None, converted=None, precomputed=None, database_path=database_path):
+    """
+    Konvertiert und analysiert eine einzelne Datei (oder ein Archiv) und liefert das
+    "finished"-Ereignis (siehe process_files). Wird auch von den Workern der Job-Queue genutzt.
+
+    converted ((Pfad, Datenquelle)) überspringt eine bereits erfolgte Konvertierung,
+    precomputed enthält von Teil-Jobs berechnete Metriken (siehe backend/scheduler.py),
+    database_path die Datenbank des Workers (Ergebnisse, zurückgestellte Metriken, Laufzeiten).
+
+    Das Feld "retryable" gibt an, ob ein Fehler vorübergehend sein kann (Ausnahme bei
+    Konvertierung/Analyse) oder ob der Analyzer die Datei inhaltlich abgelehnt hat.
+    """
+    event = {
+        "event": "finished", "file_path": file_path, "index": 0, "total": 1,
+        "status": "error", "converted_file": None, "data_source": None,
+        "convert_seconds": 0.0, "analysis_seconds": 0.0, "error": None, "results": None,
+        "retryable": False,
+    }
+
+    if is_archive(file_path):
+        start = time.perf_counter()
         try:
-            # Schritt 2: Analyse
-            analysis_results = analyze_file(converted_file, data_source, database_path)
-            results.append(analysis_results)
-            print(f"Analyse abgeschlossen für {converted_file}.")
+            event["results"] = process_archive(file_path, progress_callback=progress_callback,
+                                                database_path=database_path)
+            event["status"] = "ok"
         except Exception as e:
-            print(f"Fehler bei der Analyse von {converted_file}: {e}")
-            continue
+            print(f"Fehler beim Lesen des Archivs {file_path}: {e}")
+            event["error"] = f"Archiv: {e}"
+            event["retryable"] = True
+        event["analysis_seconds"] = time.perf_counter() - start
+        return event
 
-    return results
+    start = time.perf_counter()
+    try:
+        # Schritt 1: Konvertierung
+        converted_file, data_source = converted or convert_file(file_path)
+        event["convert_seconds"] = time.perf_counter() - start
+        event["converted_file"] = converted_file
+        event["data_source"] = data_source
+        print(f"Datei konvertiert: {file_path} -> {converted_file} (Datenquelle: {data_source})")
+    except Exception as e:
+        print(f"Fehler bei der Konvertierung von {file_path}: {e}")
+        event["convert_seconds"] = time.perf_counter() - start
+        event["error"] = f"Konvertierung: {e}"
+        event["retryable"] = not isinstance(e, ValueError)
+        return event
+
+    start = time.perf_counter()
+    try:
+        # Schritt 2: Analyse
+        analysis_results = analyze_file(converted_file, data_source, database_path, precomputed=precomputed)
+        event["analysis_seconds"] = time.perf_counter() - start
+        event["results"] = analysis_results
+        # Die Analyzer fangen Fehler selbst ab und liefern dann {"error": ...}
+        if isinstance(analysis_results, dict) and "error" in analysis_results:
+            event["error"] = analysis_results["error"]
+        else:
+            event["status"] = "ok"
+        print(f"Analyse abgeschlossen für {converted_file}.")
+    except Exception as e:
+        print(f"Fehler bei der Analyse von {converted_file}: {e}")
+        event["analysis_seconds"] = time.perf_counter() - start
+        event["error"] = f"Analyse: {e}"
+        event["retryable"] = True
+
+    return event
 
 if __name__ == "__main__":
-    # Testblock: Initialisiere die Datenbank und verarbeite alle Dateien in temp_uploads/
+    # Testblock: Initialisiere die Datenbank, reihe alle Dateien in temp_uploads/ in die
+    # Job-Queue ein und arbeite sie mit Worker-Prozessen ab
+    from backend import job_queue
+
     initialize_database(database_path)
     print("Datenbank initialisiert.")
 
@@ -49,8 +230,16 @@ if __name__ == "__main__":
     if os.path.exists(temp_dir):
         # Sammle alle Dateien im temp_uploads-Verzeichnis
         file_paths = [os.path.join(temp_dir, f) for f in os.listdir(temp_dir) if os.path.isfile(os.path.join(temp_dir, f))]
-        results = process_files(file_paths)
+        from backend import scheduler
+
+        job_ids = job_queue.enqueue_files(database_path, file_paths)
+        pool = job_queue.WorkerPool(database_path, exit_when_idle=True)
+        pool.start()
+        pool.join()
         print("Verarbeitung abgeschlossen.")
-        print("Ergebnisse:", results)
+        print("Queue:", job_queue.queue_counts(database_path))
+        report = scheduler.makespan_report(database_path, job_ids, pool.workers)
+        if report:
+            print(scheduler.format_makespan(report))
     else:
         print("Verzeichnis temp_uploads/ nicht gefunden.")
@@ -0,0 +1,328 @@
+import os
+import math
+import heapq
+
+from backend.database_handler import get_metric_timings, get_job_memory_samples, query_results
+from backend.archives import is_archive
+from backend.metrics import SOURCE_METRICS, BUNDLE_OF, ingest_metrics
+from backend import catalog
+
+# Startannahmen des Kostenmodells, solange für eine Metrik noch keine Messungen vorliegen:
+#   Sekunden ≈ Faktor * (Knoten + 1) ** Knoten-Exponent * (Kanten + 1) ** Kanten-Exponent
+# Die Exponenten entsprechen der Größenordnung der NetworkX-Algorithmen (z. B. eine
+# Breitensuche je Knoten für Betweenness und Closeness). Die Exzentrizitäten kommen mit
+# wenigen Breitensuchen aus (backend/eccentricity.py) und teilen sich deren Laufzeit; die
+# vektorisierte Betweenness (backend/betweenness.py) liefert Knoten- und Kantenwerte gemeinsam,
+# die spektralen Kennzahlen (backend/spectral.py) kommen aus wenigen Krylov-Lösern.
+DEFAULT_COMPLEXITY = {
+    "read_graph": (0.0, 1.0, 2e-5),
+    "node_connectivity": (1.0, 1.0, 2e-6),
+    "edge_connectivity": (1.0, 1.0, 1e-6),
+    "global_efficiency": (1.0, 1.0, 1e-6),
+    "local_efficiency": (0.0, 1.5, 3e-7),
+    "average_clustering": (0.0, 1.5, 2e-8),
+    "transitivity": (0.0, 1.5, 2e-8),
+    "graph_center": (0.0, 1.0, 1e-5),
+    "betweenness_centrality": (1.0, 1.0, 1e-7),
+    "edge_betweenness": (1.0, 1.0, 1e-7),
+    "closeness_centrality": (1.0, 1.0, 1e-6),
+    "pagerank": (0.0, 1.0, 2e-5),
+    "diameter": (0.0, 1.0, 1e-5),
+    "radius": (0.0, 1.0, 1e-5),
+    "periphery": (0.0, 1.0, 1e-5),
+    "is_planar": (0.0, 1.0, 3e-5),
+    "effective_diameter": (0.0, 1.0, 2e-5),
+    "average_distance": (0.0, 1.0, 2e-5),
+    "approx_global_efficiency": (0.0, 1.0, 2e-5),
+    "hop_plot": (0.0, 1.0, 2e-5),
+    "algebraic_connectivity": (0.0, 1.0, 2e-5),
+    "spectral_radius": (0.0, 1.0, 2e-5),
+    "spectral_gap": (0.0, 1.0, 2e-5),
+    "natural_connectivity": (0.0, 1.0, 2e-5),
+    "eigenvector_centrality": (0.0, 1.0, 2e-5),
+    "coreness": (0.0, 1.0, 1e-6),
+    "degeneracy": (0.0, 1.0, 1e-6),
+    "rich_club": (0.0, 1.0, 1e-6),
+    "degree_assortativity": (0.0, 1.0, 1e-6),
+    "communities": (0.0, 1.0, 1e-5),
+    "modularity": (0.0, 1.0, 1e-5),
+    "number_of_communities": (0.0, 1.0, 1e-5),
+}
+
+# Ab so vielen Messungen mit unterschiedlichen Graphgrößen werden auch die Exponenten angepasst
+MIN_FIT_SAMPLES = 8
+MAX_EXPONENT = 3.0
+
+# Datei-Jobs mit mehr vorhergesagter Laufzeit werden in Teil-Jobs je Metrikgruppe aufgeteilt
+SPLIT_THRESHOLD = 30.0
+
+# Speicherschätzung: Bytes eines NetworkX-Graphen je Knoten bzw. Kante (inkl. Attribut-Dictionaries)
+NODE_BYTES = 600
+EDGE_BYTES = 500
+# Zusätzlicher Spitzenbedarf einer Metrik als Vielfaches des Graphen (Hilfsgraphen für
+# Flussberechnungen, Planaritätstest, Sparse-Matrix für PageRank)
+METRIC_MEMORY_FACTORS = {
+    "node_connectivity": 2.5,
+    "edge_connectivity": 2.5,
+    "is_planar": 3.0,
+    "pagerank": 1.0,
+    "local_efficiency": 1.0,
+    # HyperLogLog-Register (256 Byte je Knoten) in mehreren Kopien
+    "hop_plot": 1.5,
+}
+DEFAULT_METRIC_MEMORY_FACTOR = 0.5
+# Ergebnis-Dictionaries (Zentralitäten, Exzentrizitäten) je Knoten und Metrik
+RESULT_BYTES_PER_NODE = 200
+# Kalibrierung aus den zuletzt gemessenen Spitzenwerten
+MEMORY_HISTORY = 100
+
+# Speicherbudget aller gleichzeitig laufenden Jobs (MB); ohne Angabe die Hälfte des Arbeitsspeichers
+MEMORY_BUDGET_ENV = "NETWORK_ANALYZER_MEMORY_BUDGET_MB"
+
+# Datenquelle je Dateiendung (wie in file_converter.convert_file)
+EXTENSION_SOURCES = {ext: source for ext, (_, source) in catalog.FORMATS.items()}
+
+
+class CostModel:
+    """
+    Sagt die Laufzeit einzelner Metriken aus Knoten- und Kantenzahl voraus.
+    Die Koeffizienten werden aus den gemessenen Laufzeiten früherer Analysen
+    (Tabelle metric_timings) per Regression im log-Raum geschätzt.
+    """
+
+    def __init__(self, coefficients=None):
+        # Metrik -> (log Faktor, Knoten-Exponent, Kanten-Exponent)
+        self.coefficients = dict(coefficients or {})
+
+    @classmethod
+    def fit(cls, database_path):
+        samples = {}
+        try:
+            rows = get_metric_timings(database_path)
+        except Exception as e:
+            print(f"Laufzeiten konnten nicht gelesen werden: {e}")
+            rows = []
+        for metric, nodes, edges, seconds in rows:
+            if nodes is not None and edges is not None and seconds is not None:
+                samples.setdefault(metric, []).append((nodes, edges, seconds))
+
+        coefficients = {}
+        for metric, points in samples.items():
+            coefficients[metric] = _fit_metric(metric, points)
+        return cls(coefficients)
+
+    def predict(self, metric, nodes, edges):
+        if metric in self.coefficients:
+            log_factor, node_exp, edge_exp = self.coefficients[metric]
+        else:
+            node_exp, edge_exp, factor = DEFAULT_COMPLEXITY.get(metric, (1.0, 1.0, 1e-6))
+            log_factor = math.log(factor)
+        return math.exp(log_factor + node_exp * math.log(nodes + 1) + edge_exp * math.log(edges + 1))
+
+    def predict_metrics(self, metrics, nodes, edges):
+        """
+        Vorhersage je Metrik als Dictionary.
+        """
+        return {metric: self.predict(metric, nodes, edges) for metric in metrics}
+
+    def predict_graph(self, data_source, nodes, edges):
+        """
+        Vorhergesagte Gesamtlaufzeit der Analyse eines Graphen (Einlesen plus alle Metriken).
+        """
+        metrics = ingest_metrics(data_source) if data_source in SOURCE_METRICS else tuple(DEFAULT_COMPLEXITY)
+        return self.predict("read_graph", nodes, edges) + sum(self.predict_metrics(metrics, nodes, edges).values())
+
+
+def raw_memory_estimate(nodes, edges, metrics):
+    """
+    Unkalibrierter Spitzenspeicher (Bytes) einer Analyse: Graph, Hilfsstrukturen der
+    speicherintensivsten Metrik und Ergebnis-Dictionaries.
+    """
+    graph = NODE_BYTES * nodes + EDGE_BYTES * edges
+    factor = max((METRIC_MEMORY_FACTORS.get(metric, DEFAULT_METRIC_MEMORY_FACTOR) for metric in metrics), default=0.0)
+    return graph * (1 + factor) + RESULT_BYTES_PER_NODE * nodes * len(metrics)
+
+
+class MemoryModel:
+    """
+    Schätzt den Spitzenspeicher eines Jobs aus Graphgröße und Metriken. Die Schätzung wird
+    mit dem Median des Verhältnisses gemessener zu geschätzter Spitzenwerte früherer Jobs
+    kalibriert (Spalten peak_rss / peak_traced der Tabelle jobs).
+    """
+
+    def __init__(self, calibration=1.0):
+        self.calibration = calibration
+
+    @classmethod
+    def fit(cls, database_path):
+        ratios = []
+        try:
+            rows = get_job_memory_samples(database_path, MEMORY_HISTORY)
+        except Exception as e:
+            print(f"Speichermessungen konnten nicht gelesen werden: {e}")
+            rows = []
+        for file_path, metrics, nodes, edges, peak_rss, peak_traced in rows:
+            if metrics:
+                metrics = metrics.split(",")
+            else:
+                metrics = ingest_metrics(EXTENSION_SOURCES.get(os.path.splitext(file_path)[1].lower()))
+            estimate = raw_memory_estimate(nodes, edges, metrics)
+            actual = max(peak_rss or 0, peak_traced or 0)
+            if estimate > 0 and actual > 0:
+                ratios.append(actual / estimate)
+        if not ratios:
+            return cls()
+        ratios.sort()
+        return cls(ratios[len(ratios) // 2])
+
+    def estimate(self, nodes, edges, metrics):
+        return raw_memory_estimate(nodes, edges, metrics) * self.calibration
+
+    def estimate_graph(self, data_source, nodes, edges):
+        metrics = ingest_metrics(data_source) if data_source in SOURCE_METRICS else tuple(DEFAULT_COMPLEXITY)
+        return self.estimate(nodes, edges, metrics)
+
+
+def memory_budget():
+    """
+    Speicherbudget (Bytes) für alle gleichzeitig laufenden Jobs.
+    """
+    configured = os.environ.get(MEMORY_BUDGET_ENV)
+    if configured:
+        return float(configured) * 1024 * 1024
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2
+    except (AttributeError, ValueError, OSError):
+        return 4 * 1024 ** 3
+
+
+def _fit_metric(metric, points):
+    """
+    Koeffizienten einer Metrik: bei genügend unterschiedlichen Graphgrößen vollständige
+    Regression log(t) = c + a*log(n+1) + b*log(m+1), sonst nur der Faktor c bei den
+    Standard-Exponenten.
+    """
+    import numpy as np
+
+    node_exp, edge_exp, _ = DEFAULT_COMPLEXITY.get(metric, (1.0, 1.0, 1e-6))
+    log_n = np.log(np.array([p[0] for p in points], dtype=float) + 1)
+    log_m = np.log(np.array([p[1] for p in points], dtype=float) + 1)
+    log_t = np.log(np.maximum(np.array([p[2] for p in points], dtype=float), 1e-6))
+
+    if len(points) >= MIN_FIT_SAMPLES and np.ptp(log_n) > 1.0 and np.ptp(log_m) > 1.0:
+        design = np.column_stack([np.ones_like(log_n), log_n, log_m])
+        solution, *_ = np.linalg.lstsq(design, log_t, rcond=None)
+        node_exp = float(np.clip(solution[1], 0.0, MAX_EXPONENT))
+        edge_exp = float(np.clip(solution[2], 0.0, MAX_EXPONENT))
+
+    # Median statt Mittelwert: einzelne Ausreißer (z. B. ausgelasteter Rechner) verschieben das Modell kaum
+    log_factor = float(np.median(log_t - node_exp * log_n - edge_exp * log_m))
+    return log_factor, node_exp, edge_exp
+
+
+def plan_file(database_path, model, path, memory_model=None):
+    """
+    Vorhersage für einen Datei-Job: Laufzeit, Spitzenspeicher und Graphgröße laut Katalog
+    (backend/catalog.py). Für Archive wird die Laufzeit über alle Mitglieder summiert; beim
+    Speicher zählen die größten Mitglieder, die im Prozesspool des Archivs gleichzeitig laufen können.
+
+    Rückgabe:
+      dict: {"seconds", "memory", "nodes", "edges"} (nodes/edges None für Archive)
+    """
+    memory_model = memory_model or MemoryModel()
+    if is_archive(path):
+        seconds = 0.0
+        members = []
+        for entry in catalog.archive_members(database_path, path):
+            seconds += model.predict_graph(entry["data_source"], entry["nodes"], entry["edges"])
+            members.append(memory_model.estimate_graph(entry["data_source"], entry["nodes"], entry["edges"]))
+        parallel = os.cpu_count() or 1
+        memory = sum(sorted(members, reverse=True)[:parallel])
+        return {"seconds": seconds, "memory": memory, "nodes": None, "edges": None}
+    entry = catalog.scan_file(database_path, path)
+    return {
+        "seconds": model.predict_graph(entry["data_source"], entry["nodes"], entry["edges"]),
+        "memory": memory_model.estimate_graph(entry["data_source"], entry["nodes"], entry["edges"]),
+        "nodes": entry["nodes"],
+        "edges": entry["edges"],
+    }
+
+
+def split_metrics(predictions, parts):
+    """
+    Verteilt Metriken nach "längste zuerst" (LPT) auf höchstens parts Gruppen mit
+    möglichst gleicher vorhergesagter Laufzeit. Metriken eines Bündels (z. B. die
+    Exzentrizitäten) entstehen in einem gemeinsamen Lauf und bleiben daher in derselben Gruppe.
+
+    Rückgabe:
+      list: [(Liste der Metriken, vorhergesagte Sekunden), ...] absteigend nach Laufzeit.
+    """
+    units = {}
+    for metric, seconds in predictions.items():
+        key = BUNDLE_OF.get(metric, metric)
+        names, total = units.get(key, ([], 0.0))
+        units[key] = (names + [metric], total + seconds)
+
+    groups = [(0.0, index, []) for index in range(max(min(parts, len(units)), 1))]
+    heapq.heapify(groups)
+    for names, seconds in sorted(units.values(), key=lambda unit: unit[1], reverse=True):
+        total, index, members = heapq.heappop(groups)
+        members.extend(names)
+        heapq.heappush(groups, (total + seconds, index, members))
+    groups = [(members, total) for total, _, members in groups if members]
+    return sorted(groups, key=lambda group: group[1], reverse=True)
+
+
+def lpt_makespan(costs, workers):
+    """
+    Gesamtlaufzeit, wenn die Kosten nach "längste zuerst" auf workers Worker verteilt werden.
+    """
+    loads = [0.0] * max(workers, 1)
+    heapq.heapify(loads)
+    for cost in sorted(costs, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + cost)
+    return max(loads)
+
+
+def makespan_report(database_path, job_ids, workers):
+    """
+    Vergleicht die vorhergesagte mit der tatsächlichen Gesamtlaufzeit eines Stapels.
+    Aufgeteilte Datei-Jobs gehen mit ihren Teil-Jobs und dem Rest (Einlesen, übrige Metriken) ein.
+
+    Rückgabe:
+      dict: {"jobs", "predicted", "actual"} oder None, wenn kein Job abgeschlossen ist.
+    """
+    if not job_ids:
+        return None
+    id_list = ", ".join(str(int(job_id)) for job_id in job_ids)
+    rows = query_results(database_path, f"""
+        SELECT id, parent_id, predicted_seconds, started_at, finished_at FROM jobs
+        WHERE id IN ({id_list}) OR parent_id IN ({id_list})
+    """)
+    children = {}
+    for _, parent_id, predicted, _, _ in rows:
+        if parent_id is not None:
+            children.setdefault(parent_id, []).append(predicted or 0.0)
+
+    costs = []
+    for job_id, parent_id, predicted, _, _ in rows:
+        if parent_id is not None:
+            continue
+        parts = children.get(job_id, [])
+        costs.extend(parts)
+        costs.append(max((predicted or 0.0) - sum(parts), 0.0))
+
+    started = [row[3] for row in rows if row[3] is not None]
+    finished = [row[4] for row in rows if row[4] is not None]
+    if not started or not finished:
+        return None
+    return {
+        "jobs": len(job_ids),
+        "predicted": lpt_makespan(costs, workers),
+        "actual": max(finished) - min(started),
+    }
+
+
+def format_makespan(report):
+    return (f"Makespan: vorhergesagt {report['predicted']:.1f} s, "
+            f"tatsächlich {report['actual']:.1f} s ({report['jobs']} Jobs)")
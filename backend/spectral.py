@@ -0,0 +1,216 @@
+import os
+
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+from backend.utils import cache_path
+
+# Bis zu dieser Knotenzahl werden alle Eigenwerte dicht (numpy.linalg.eigh) und damit exakt bestimmt
+DENSE_NODE_LIMIT = 1000
+# Größte Eigenpaare der Adjazenzmatrix, die exakt berechnet und aus der Spur-Schätzung herausgenommen werden
+DEFLATED_EIGENPAIRS = 8
+# Stochastische Lanczos-Quadratur: Zufallsvektoren und Lanczos-Schritte je Vektor
+PROBE_VECTORS = 16
+LANCZOS_STEPS = 40
+# Abbruchkriterien der iterativen Löser
+EIGSH_TOLERANCE = 1e-10
+LOBPCG_TOLERANCE = 1e-9
+LOBPCG_MAXITER = 5000
+
+
+def _load_vectors(key):
+    """
+    Zwischengespeicherte Eigenvektoren eines Graphen (Startwerte für die Löser) oder {}.
+    """
+    cache_file = cache_path("spectral", key, ".npz")
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with np.load(cache_file, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except Exception as e:
+        print("Spektral-Cache konnte nicht gelesen werden:", e)
+        return {}
+
+
+def _save_vectors(key, vectors):
+    try:
+        np.savez(cache_path("spectral", key, ".npz"), **vectors)
+    except OSError as e:
+        print("Spektral-Cache konnte nicht gespeichert werden:", e)
+
+
+def _laplacian(A):
+    from scipy.sparse import diags
+    return (diags(np.asarray(A.sum(axis=1)).ravel()) - A).tocsr()
+
+
+def _log_mean_exp(values, weights=None):
+    """
+    ln(Σ w_i exp(v_i) / Σ w_i) ohne Überlauf.
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    shift = values.max()
+    return float(shift + np.log(np.dot(weights, np.exp(values - shift)) / weights.sum()))
+
+
+def _lanczos(A, start, steps, basis):
+    """
+    Lanczos-Tridiagonalisierung von A ab start, orthogonal zu den Spalten von basis.
+
+    Rückgabe:
+      tuple: (Diagonale, Nebendiagonale) der Tridiagonalmatrix
+    """
+    alpha, beta = [], []
+    q_prev = np.zeros_like(start)
+    q = start / np.linalg.norm(start)
+    b = 0.0
+    for _ in range(steps):
+        w = A @ q - b * q_prev
+        if basis is not None:
+            w -= basis @ (basis.T @ w)
+        a = float(q @ w)
+        w -= a * q
+        alpha.append(a)
+        b = float(np.linalg.norm(w))
+        if b < 1e-10:
+            break
+        beta.append(b)
+        q_prev, q = q, w / b
+    return np.array(alpha), np.array(beta[:len(alpha) - 1])
+
+
+def natural_connectivity_estimate(A, eigenvalues, eigenvectors, probes=PROBE_VECTORS, steps=LANCZOS_STEPS, seed=0):
+    """
+    Natürliche Konnektivität ln(Spur(exp(A)) / n) per stochastischer Lanczos-Quadratur. Die
+    größten Eigenpaare (eigenvalues, eigenvectors) gehen exakt ein; geschätzt wird nur die
+    Spur auf ihrem orthogonalen Komplement, wo die Eigenwerte dicht liegen und die Varianz
+    der Zufallsvektoren klein ist.
+
+    Rückgabe:
+      float: natürliche Konnektivität
+    """
+    from scipy.linalg import eigh_tridiagonal
+
+    n = A.shape[0]
+    rng = np.random.default_rng(seed)
+    remaining = n - len(eigenvalues)
+    terms = list(eigenvalues)
+    weights = [1.0] * len(eigenvalues)
+    if remaining > 0:
+        nodes, node_weights = [], []
+        for _ in range(probes):
+            z = rng.choice([-1.0, 1.0], size=n)
+            z -= eigenvectors @ (eigenvectors.T @ z)
+            alpha, beta = _lanczos(A, z, min(steps, remaining), eigenvectors)
+            theta, vectors = eigh_tridiagonal(alpha, beta)
+            nodes.extend(theta)
+            # Jeder Zufallsvektor schätzt die Spur des Komplements: (n - k) * Σ τ_j² f(θ_j)
+            node_weights.extend(vectors[0] ** 2 * remaining / probes)
+        terms.extend(nodes)
+        weights.extend(node_weights)
+    return _log_mean_exp(terms, weights) + np.log(sum(weights) / n)
+
+
+def _dense(A):
+    """
+    Alle Kennzahlen exakt aus den vollständigen Spektren (kleine Graphen).
+    """
+    adjacency = A.toarray()
+    values, vectors = np.linalg.eigh(adjacency)
+    laplacian_values = np.linalg.eigvalsh(np.diag(adjacency.sum(axis=1)) - adjacency)
+    return {
+        "values": values[::-1][:2],
+        "leading": vectors[:, -1],
+        "algebraic_connectivity": float(laplacian_values[1]) if len(laplacian_values) > 1 else 0.0,
+        "natural_connectivity": _log_mean_exp(values),
+    }
+
+
+def _sparse(A, connected, warm):
+    """
+    Kennzahlen mit eigsh (größte Eigenpaare der Adjazenzmatrix), lobpcg (Fiedler-Wert der
+    Laplace-Matrix mit Jacobi-Vorkonditionierer) und Lanczos-Quadratur. Vorhandene
+    Eigenvektoren aus warm dienen als Startwerte.
+    """
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import eigsh, lobpcg
+
+    n = A.shape[0]
+    k = min(DEFLATED_EIGENPAIRS, n - 2)
+    start = warm.get("leading")
+    values, vectors = eigsh(A, k=k, which="LA", tol=EIGSH_TOLERANCE,
+                            v0=start if start is not None and len(start) == n else None)
+    order = np.argsort(values)[::-1]
+    values, vectors = values[order], vectors[:, order]
+
+    fiedler = None
+    algebraic_connectivity = 0.0
+    if connected:
+        L = _laplacian(A)
+        degree = L.diagonal()
+        fiedler = warm.get("fiedler")
+        if fiedler is None or len(fiedler) != n:
+            fiedler = np.random.default_rng(0).standard_normal(n)
+        constant = np.ones((n, 1)) / np.sqrt(n)
+        result, X = lobpcg(L, fiedler.reshape(n, 1), M=diags(1.0 / np.maximum(degree, 1.0)), Y=constant,
+                           largest=False, tol=LOBPCG_TOLERANCE, maxiter=LOBPCG_MAXITER)
+        algebraic_connectivity = float(result[0])
+        fiedler = X[:, 0]
+
+    return {
+        "values": values[:2],
+        "leading": vectors[:, 0],
+        "fiedler": fiedler,
+        "algebraic_connectivity": algebraic_connectivity,
+        "natural_connectivity": natural_connectivity_estimate(A, values, vectors),
+    }
+
+
+def spectral_metrics(G):
+    """
+    Spektrale Robustheitskennzahlen des (ungerichteten, einfachen) Graphen:
+      algebraic_connectivity - zweitkleinster Eigenwert der Laplace-Matrix (0 bei Zerfall)
+      spectral_radius        - größter Eigenwert der Adjazenzmatrix
+      spectral_gap           - Abstand der beiden größten Adjazenz-Eigenwerte
+      natural_connectivity   - ln(Spur(exp(A)) / n), gewichtete Anzahl geschlossener Wege
+      eigenvector_centrality - Knoten -> Eintrag des führenden Eigenvektors (euklidisch normiert)
+    Bis DENSE_NODE_LIMIT Knoten exakt, darüber mit scipy.sparse.linalg; die Eigenvektoren
+    werden je Strukturhash zwischengespeichert und bei erneuter Berechnung als Startwerte
+    genutzt. Richtungen, Mehrfachkanten und Gewichte werden ignoriert.
+
+    Rückgabe:
+      dict: Name (siehe metrics.SPECTRAL_METRICS) -> Wert
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    index = AdjacencyIndex.from_graph(G)
+    n = index.number_of_nodes
+    if n < 2:
+        return {
+            "algebraic_connectivity": 0.0, "spectral_radius": 0.0, "spectral_gap": 0.0,
+            "natural_connectivity": 0.0 if n else None, "eigenvector_centrality": dict.fromkeys(index.nodes, 1.0),
+        }
+    A = index.to_scipy()
+    connected = connected_components(A, directed=False)[0] == 1
+
+    if n <= DENSE_NODE_LIMIT:
+        result = _dense(A)
+        if not connected:
+            result["algebraic_connectivity"] = 0.0
+    else:
+        key = index.structure_hash()
+        result = _sparse(A, connected, _load_vectors(key))
+        _save_vectors(key, {name: result[name] for name in ("leading", "fiedler") if result[name] is not None})
+
+    leading = np.abs(result["leading"])
+    leading /= np.linalg.norm(leading)
+    first, second = (list(result["values"]) + [0.0])[:2]
+    return {
+        "algebraic_connectivity": max(float(result["algebraic_connectivity"]), 0.0),
+        "spectral_radius": float(first),
+        "spectral_gap": float(first - second),
+        "natural_connectivity": float(result["natural_connectivity"]),
+        "eigenvector_centrality": dict(zip(index.nodes, leading.tolist())),
+    }
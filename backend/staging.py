@@ -0,0 +1,198 @@
+import os
+import shutil
+import hashlib
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from backend.database_handler import save_staged_file, get_staged_file
+from backend.utils import hash_file
+from backend.archives import split_member_ref, ARCHIVE_EXTENSIONS
+
+# Zielverzeichnis der bereitgestellten Uploads (Konverter und Analyzer arbeiten darauf)
+UPLOAD_DIR = "temp_uploads"
+
+# Inhaltsadressierter Speicher: jede Datei liegt genau einmal unter ihrem SHA-256-Hash,
+# immer als eigene Kopie (Reflink oder Kopie), nie als Hardlink auf das Original des
+# Benutzers. Die Einträge in temp_uploads/ sind Hardlinks darauf (wird von cleanup.sh mit entfernt).
+OBJECT_DIR = os.path.join(UPLOAD_DIR, ".objects")
+
+CHUNK_SIZE = 1 << 20
+
+# ioctl FICLONE aus <linux/fs.h>: Copy-on-Write-Kopie (Btrfs, XFS, …)
+FICLONE = 0x40049409
+
+
+def _same_device(path_a, path_b):
+    try:
+        return os.stat(path_a).st_dev == os.stat(path_b).st_dev
+    except OSError:
+        return False
+
+
+def _copy_and_hash(src, directory, chunk_size=CHUNK_SIZE):
+    """
+    Kopiert eine Datei blockweise in eine temporäre Datei und berechnet dabei den SHA-256-Hash
+    (ein einziger Lesedurchlauf, auch für mehrere GB große Dateien).
+
+    Rückgabe:
+      tuple: (Pfad der temporären Datei, Hash)
+    """
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".staging-")
+    try:
+        with open(src, "rb") as source, os.fdopen(fd, "wb") as target:
+            for chunk in iter(lambda: source.read(chunk_size), b""):
+                digest.update(chunk)
+                target.write(chunk)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
+
+def _reflink(src, directory):
+    """
+    Legt eine Copy-on-Write-Kopie (Reflink) von src als temporäre Datei in directory an.
+    Spätere Änderungen am Original wirken sich darauf nicht aus.
+
+    Rückgabe:
+      str: Pfad der temporären Datei oder None, wenn das Dateisystem keine Reflinks kann
+    """
+    if fcntl is None:
+        return None
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".staging-")
+    try:
+        with open(src, "rb") as source:
+            fcntl.ioctl(fd, FICLONE, source.fileno())
+    except OSError:
+        os.close(fd)
+        os.remove(tmp_path)
+        return None
+    os.close(fd)
+    return tmp_path
+
+
+def _link_or_copy(src, dst):
+    """
+    Legt dst als Hardlink auf src an; ist das nicht möglich (z. B. FAT-Dateisystem), wird kopiert.
+
+    Rückgabe:
+      str: "hardlink" oder "copy"
+    """
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        shutil.copyfile(src, dst)
+        return "copy"
+
+
+def _store_object(src):
+    """
+    Legt den Inhalt von src im Objektspeicher ab (sofern noch nicht vorhanden).
+
+    Das Objekt ist immer eine eigene Kopie, damit spätere Änderungen am Original den unter
+    dem alten Hash gespeicherten Inhalt nicht verändern: Auf demselben Dateisystem wird
+    nach Möglichkeit ein Reflink angelegt (ohne Datenkopie) und dieser gehasht, sonst wird
+    beim Kopieren gehasht.
+
+    Rückgabe:
+      tuple: (Objektpfad, Hash, Methode) mit Methode "reflink", "copy" oder "existing"
+    """
+    os.makedirs(OBJECT_DIR, exist_ok=True)
+
+    tmp_path = _reflink(src, OBJECT_DIR) if _same_device(src, OBJECT_DIR) else None
+    if tmp_path is not None:
+        content_hash, method = hash_file(tmp_path, CHUNK_SIZE), "reflink"
+    else:
+        (tmp_path, content_hash), method = _copy_and_hash(src, OBJECT_DIR), "copy"
+    object_path = os.path.join(OBJECT_DIR, content_hash)
+    if os.path.exists(object_path):
+        os.remove(tmp_path)
+        return object_path, content_hash, "existing"
+    os.replace(tmp_path, object_path)
+    return object_path, content_hash, method
+
+
+def _is_same_content(path, object_path, content_hash, database_path):
+    if os.path.samefile(path, object_path):
+        return True
+    return get_content_hash(database_path, path) == content_hash
+
+
+def stage_file(src, database_path, upload_dir=UPLOAD_DIR):
+    """
+    Stellt eine Datei für die Analyse in upload_dir bereit, ohne sie unnötig zu kopieren.
+    Die Namen in upload_dir sind Hardlinks auf das eigene Objekt, nie auf das Original.
+
+    - Identische Inhalte werden nur einmal gespeichert (inhaltsadressiert per SHA-256).
+    - Eine gleichnamige Datei mit anderem Inhalt wird nicht überschrieben; die neue Datei
+      erhält stattdessen den Namen <name>_<hash[:8]><endung>.
+    - Der Hash wird in der Tabelle staged_files abgelegt und von get_content_hash wiederverwendet.
+
+    Rückgabe:
+      dict: {"path": bereitgestellter Pfad, "hash": SHA-256, "deduplicated": bool,
+             "method": "reflink" / "copy" / "existing" bzw. "hardlink", falls nur der
+             Name in upload_dir neu angelegt wurde}
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    object_path, content_hash, method = _store_object(src)
+
+    base_name = os.path.basename(src)
+    stem, ext = os.path.splitext(base_name)
+    # Doppelte Archivendungen (.tar.gz) beim Umbenennen erhalten
+    for archive_ext in ARCHIVE_EXTENSIONS:
+        if base_name.lower().endswith(archive_ext):
+            stem, ext = base_name[:-len(archive_ext)], base_name[-len(archive_ext):]
+            break
+    candidates = [base_name, f"{stem}_{content_hash[:8]}{ext}"]
+
+    staged_path = None
+    deduplicated = False
+    for name in candidates:
+        path = os.path.normpath(os.path.join(upload_dir, name))
+        if not os.path.exists(path):
+            staged_path = path
+            break
+        if _is_same_content(path, object_path, content_hash, database_path):
+            staged_path = path
+            deduplicated = True
+            break
+    if staged_path is None:
+        raise FileExistsError(f"Kein freier Dateiname für {base_name} in {upload_dir}")
+
+    if not deduplicated:
+        link_method = _link_or_copy(object_path, staged_path)
+        if method == "existing":
+            method = link_method
+
+    stat = os.stat(staged_path)
+    save_staged_file(database_path, staged_path, content_hash, os.path.abspath(src),
+                     stat.st_size, stat.st_mtime_ns)
+    return {"path": staged_path, "hash": content_hash, "deduplicated": deduplicated, "method": method}
+
+
+def get_content_hash(database_path, path):
+    """
+    SHA-256 einer Datei; der beim Staging gespeicherte Hash wird wiederverwendet,
+    solange Größe und Änderungszeit unverändert sind. Für Archivmitglieder wird der
+    Hash aus dem Archiv-Hash und dem Mitgliedsnamen abgeleitet.
+    """
+    archive_path, member = split_member_ref(path)
+    if archive_path is not None:
+        archive_hash = get_content_hash(database_path, archive_path)
+        return hashlib.sha256(f"{archive_hash}!{member}".encode("utf-8")).hexdigest()
+
+    path = os.path.normpath(path)
+    stat = os.stat(path)
+    try:
+        known = get_staged_file(database_path, path)
+    except Exception:
+        known = None
+    if known and known[1] == stat.st_size and known[2] == stat.st_mtime_ns:
+        return known[0]
+    return hash_file(path, CHUNK_SIZE)
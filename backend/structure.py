@@ -0,0 +1,147 @@
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+# Bis zu dieser Größe wird eine Schälrunde Knoten für Knoten statt vektorisiert abgearbeitet
+SMALL_FRONTIER = 16
+
+
+def _neighbors(index, nodes):
+    """
+    Alle Nachbarn der gegebenen Knotenpositionen hintereinander (mit Wiederholungen).
+    """
+    starts = index.indptr[nodes]
+    counts = index.indptr[nodes + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    return index.indices[np.repeat(starts - offsets, counts) + np.arange(int(counts.sum()))]
+
+
+def _peel_chain(index, stack, k, residual, core, alive):
+    """
+    Schält wenige Knoten einzeln weiter (lange Ketten wie Pfade oder Baumäste würden
+    sonst je Knoten eine vektorisierte Runde kosten).
+    """
+    indptr, indices = index.indptr, index.indices
+    for v in stack:
+        alive[v] = False
+    while stack:
+        v = stack.pop()
+        core[v] = k
+        for u in indices[indptr[v]:indptr[v + 1]].tolist():
+            if alive[u]:
+                residual[u] -= 1
+                if residual[u] <= k:
+                    alive[u] = False
+                    stack.append(u)
+
+
+def core_numbers(index):
+    """
+    Kernzahl (Coreness) je Knoten eines ungerichteten Index durch schichtweises Schälen:
+    Für die Schwelle k = kleinster Restgrad werden alle Knoten mit Restgrad <= k auf
+    einmal entfernt und erhalten die Kernzahl k; die Restgrade ihrer Nachbarn sinken per
+    np.unique/Zählung, und Nachbarn, die dadurch auf <= k fallen, bilden die nächste Runde.
+    Jede Kante wird nur beim Entfernen ihrer Endpunkte angefasst, die Liste der übrigen
+    Knoten nur einmal je Schwelle. Runden mit höchstens SMALL_FRONTIER Knoten werden
+    einzeln abgearbeitet (siehe _peel_chain).
+
+    Rückgabe:
+      np.ndarray: Kernzahl je Knotenposition
+    """
+    n = index.number_of_nodes
+    residual = index.degree.astype(np.int64)
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    remaining = np.arange(n)
+    k = 0
+    while len(remaining):
+        k = max(k, int(residual[remaining].min()))
+        frontier = remaining[residual[remaining] <= k]
+        while len(frontier) > SMALL_FRONTIER:
+            core[frontier] = k
+            alive[frontier] = False
+            neighbors = _neighbors(index, frontier)
+            neighbors, counts = np.unique(neighbors[alive[neighbors]], return_counts=True)
+            residual[neighbors] -= counts
+            frontier = neighbors[residual[neighbors] <= k]
+        if len(frontier):
+            _peel_chain(index, frontier.tolist(), k, residual, core, alive)
+        remaining = remaining[alive[remaining]]
+    return core
+
+
+def rich_club(index):
+    """
+    Rich-Club-Koeffizient φ(k) = 2 E_k / (N_k (N_k - 1)) für alle Gradschwellen k auf
+    einmal (wie nx.rich_club_coefficient mit normalized=False): N_k ist die Anzahl der
+    Knoten mit Grad > k, E_k die Anzahl der Kanten, deren Endpunkte beide Grad > k haben,
+    also deren kleinerer Endpunktgrad > k ist. Beides ergibt sich aus Suffixsummen der
+    Gradverteilung bzw. der Verteilung der kleineren Endpunktgrade.
+
+    Rückgabe:
+      list: φ(k) für k = 0, 1, 2, … solange N_k > 1
+    """
+    degree = index.degree.astype(np.int64)
+    if len(degree) == 0:
+        return []
+    tails = np.repeat(np.arange(len(degree)), degree)
+    keep = tails < index.indices
+    smaller = np.minimum(degree[tails[keep]], degree[index.indices[keep]])
+    size = int(degree.max()) + 1
+    # Knoten bzw. Kanten mit Grad > k: Gesamtzahl minus kumulierte Anzahl bis einschließlich k
+    nodes_above = len(degree) - np.cumsum(np.bincount(degree, minlength=size))
+    edges_above = len(smaller) - np.cumsum(np.bincount(smaller, minlength=size))
+    thresholds = int(np.count_nonzero(nodes_above > 1))
+    nodes_above, edges_above = nodes_above[:thresholds].astype(float), edges_above[:thresholds]
+    return (2.0 * edges_above / (nodes_above * (nodes_above - 1))).tolist()
+
+
+def degree_assortativity(G, index=None):
+    """
+    Grad-Assortativität als Pearson-Korrelation der Endpunktgrade über alle Kanten (wie
+    nx.degree_assortativity_coefficient): ungerichtet mit beiden Richtungen jeder Kante,
+    gerichtet Ausgangsgrad des Start- gegen Eingangsgrad des Zielknotens. Mehrfachkanten
+    und Schleifen werden ignoriert. Ein vorhandener Index passender Richtung kann über
+    index übergeben werden.
+
+    Rückgabe:
+      float: Assortativität oder None, wenn alle Endpunktgrade gleich sind
+    """
+    directed = G.is_directed()
+    if index is None:
+        index = AdjacencyIndex.from_graph(G, directed=directed)
+    tails = np.repeat(np.arange(index.number_of_nodes), index.degree)
+    if len(tails) == 0:
+        return None
+    out_degree = index.degree
+    in_degree = np.bincount(index.indices, minlength=index.number_of_nodes) if directed else out_degree
+    x = out_degree[tails].astype(float)
+    y = in_degree[index.indices].astype(float)
+    x -= x.mean()
+    y -= y.mean()
+    spread = np.sqrt((x @ x) * (y @ y))
+    if spread == 0:
+        return None
+    return float((x @ y) / spread)
+
+
+def structure_metrics(G):
+    """
+    Strukturkennzahlen für große (AS-)Graphen aus einem gemeinsamen Adjazenzindex:
+      coreness             - Knoten -> Kernzahl (k-Core-Zerlegung)
+      degeneracy           - größte Kernzahl
+      rich_club            - φ(k) für alle Gradschwellen k (nicht normiert)
+      degree_assortativity - Grad-Assortativität (siehe degree_assortativity)
+    k-Core und Rich-Club beziehen sich auf den ungerichteten einfachen Graphen.
+
+    Rückgabe:
+      dict: Name (siehe metrics.STRUCTURE_METRICS) -> Wert
+    """
+    index = AdjacencyIndex.from_graph(G)
+    cores = core_numbers(index)
+    return {
+        "coreness": dict(zip(index.nodes, cores.tolist())),
+        "degeneracy": int(cores.max()) if len(cores) else 0,
+        "rich_club": rich_club(index),
+        "degree_assortativity": degree_assortativity(G, None if G.is_directed() else index),
+    }
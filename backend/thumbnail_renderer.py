@@ -0,0 +1,172 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backend.database_handler import initialize_database, query_results, save_thumbnail, get_thumbnails
+from backend.utils import cache_path
+from backend.staging import get_content_hash
+from backend.archives import read_graph, source_exists
+from backend.layouts import compute_layout, compute_geo_layout, geo_coverage, GEO_MIN_COVERAGE
+from backend.adjacency_index import AdjacencyIndex
+from backend.graph_sampling import top_k_nodes, induced_subgraph, FOCUS_NODE_THRESHOLD, FOCUS_MAX_NODES
+
+# Pfad zur SQLite-Datenbank
+database_path = "./network_analysis.db"
+
+# Ablage der Vorschaubilder (wird von cleanup.sh zusammen mit temp_uploads/ entfernt)
+THUMBNAIL_DIR = os.path.join("temp_uploads", "thumbnails")
+# Kantenlänge der Vorschaubilder in Pixeln
+THUMBNAIL_SIZE = 256
+
+# Farben wie in der interaktiven Visualisierung
+NODE_COLOR = (0.56, 0.27, 0.68, 1.0)
+EDGE_COLOR = (0.5, 0.5, 0.5, 0.6)
+
+
+def _load_cached_layout(graph_hash):
+    layout_file = cache_path("layouts", graph_hash, ".npz")
+    if not os.path.exists(layout_file):
+        return None
+    with np.load(layout_file, allow_pickle=False) as data:
+        return dict(zip(data["nodes"].tolist(), data["positions"]))
+
+
+def _save_cached_layout(graph_hash, pos):
+    nodes = list(pos)
+    np.savez(cache_path("layouts", graph_hash, ".npz"),
+             nodes=np.array([str(n) for n in nodes]),
+             positions=np.array([pos[n] for n in nodes], dtype=float).reshape(-1, 2))
+
+
+def _thumbnail_graph(G):
+    """
+    Begrenzt große Graphen wie die Fokusansicht auf die Top-k-Knoten nach Grad.
+    """
+    if G.number_of_nodes() <= FOCUS_NODE_THRESHOLD:
+        return G
+    index = AdjacencyIndex.from_graph(G)
+    return induced_subgraph(index, top_k_nodes(index, FOCUS_MAX_NODES))
+
+
+def render_thumbnail(graph_path, output_path, graph_hash, size=THUMBNAIL_SIZE):
+    """
+    Rendert eine GraphML-Datei headless (Matplotlib Agg, ohne GUI) als PNG-Vorschaubild.
+    Das Layout wird pro Graph-Hash zwischengespeichert und bei erneutem Rendern wiederverwendet.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+
+    G = read_graph(graph_path)
+    H = _thumbnail_graph(G)
+
+    pos = _load_cached_layout(graph_hash)
+    if pos is None or any(str(n) not in pos for n in H):
+        pos = None
+        if geo_coverage(H) >= GEO_MIN_COVERAGE:
+            pos = compute_geo_layout(H)
+        if pos is None:
+            pos = compute_layout(H, k=0.1, iterations=50)
+        pos = {str(n): p for n, p in pos.items()}
+        _save_cached_layout(graph_hash, pos)
+
+    dpi = 100
+    fig = Figure(figsize=(size / dpi, size / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_aspect("equal")
+
+    segments = [(pos[str(u)], pos[str(v)]) for u, v in H.edges()]
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=[EDGE_COLOR], linewidths=0.5))
+    coords = np.array([pos[str(n)] for n in H], dtype=float).reshape(-1, 2)
+    node_size = 12 if len(coords) < 200 else 3
+    ax.scatter(coords[:, 0], coords[:, 1], s=node_size, c=[NODE_COLOR], linewidths=0)
+    ax.autoscale_view()
+
+    fig.savefig(output_path, dpi=dpi, format="png", facecolor="white")
+    return output_path
+
+
+def _render_job(graph_path, output_path, graph_hash):
+    """
+    Einstiegspunkt für die Worker-Prozesse; Fehler werden zurückgegeben statt geworfen.
+    """
+    try:
+        render_thumbnail(graph_path, output_path, graph_hash)
+        return graph_path, graph_hash, output_path, None
+    except Exception as e:
+        return graph_path, graph_hash, None, str(e)
+
+
+def collect_graph_files(database_path, upload_dir="temp_uploads"):
+    """
+    Alle analysierten GraphML-Dateien aus dem Ergebnisspeicher, die noch auf der Platte liegen.
+    """
+    rows = query_results(database_path, "SELECT DISTINCT File_name FROM analysis_results")
+    paths = []
+    for (file_name,) in rows:
+        if not file_name or not file_name.lower().endswith(".graphml"):
+            continue
+        path = os.path.normpath(os.path.join(upload_dir, file_name))
+        if source_exists(path):
+            paths.append(path)
+    return paths
+
+
+def render_all_thumbnails(database_path, workers=None, force=False, progress_callback=None):
+    """
+    Rendert Vorschaubilder für alle analysierten Graphen parallel in Worker-Prozessen.
+    Graphen, deren Hash sich seit dem letzten Rendern nicht geändert hat, werden übersprungen.
+    Die Bildpfade werden in der Tabelle "thumbnails" gespeichert.
+
+    Parameter:
+      workers (int): Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne).
+      force (bool): Alle Bilder neu rendern.
+      progress_callback (callable): Optional, wird je fertigem Graphen mit
+                                    (erledigt, gesamt, graph_path, fehler) aufgerufen.
+
+    Rückgabe:
+      dict: Anzahl gerenderter, übersprungener und fehlgeschlagener Graphen.
+    """
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    existing = get_thumbnails(database_path)
+    summary = {"rendered": 0, "skipped": 0, "failed": 0}
+
+    jobs = []
+    for graph_path in collect_graph_files(database_path):
+        # Beim Upload-Staging berechnete Hashes werden wiederverwendet
+        graph_hash = get_content_hash(database_path, graph_path)
+        known = existing.get(graph_path)
+        if not force and known and known[0] == graph_hash and known[1] and os.path.exists(known[1]):
+            summary["skipped"] += 1
+            continue
+        output_path = os.path.join(THUMBNAIL_DIR, f"{graph_hash[:16]}.png")
+        jobs.append((graph_path, output_path, graph_hash))
+
+    if not jobs:
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_render_job, *job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            graph_path, graph_hash, thumbnail_path, error = future.result()
+            if error is None:
+                # Nur der Hauptprozess schreibt in die Datenbank
+                save_thumbnail(database_path, graph_path, graph_hash, thumbnail_path)
+                summary["rendered"] += 1
+            else:
+                print(f"Fehler beim Rendern von {graph_path}: {error}")
+                summary["failed"] += 1
+            if progress_callback:
+                progress_callback(done, len(jobs), graph_path, error)
+
+    return summary
+
+
+if __name__ == "__main__":
+    # Rendert Vorschaubilder für alle Graphen im Ergebnisspeicher
+    initialize_database(database_path)
+    summary = render_all_thumbnails(database_path)
+    print("Vorschaubilder:", summary)
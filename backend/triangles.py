@@ -0,0 +1,216 @@
+import numpy as np
+
+from backend.adjacency_index import AdjacencyIndex
+
+# Obergrenze für die Keil-Kandidaten (u -> w -> x) je Block beim Dreieckszählen
+WEDGE_CHUNK = 4_000_000
+# Obergrenze für die Knotenpaare (Σ Grad²) der Nachbarschaften, die gleichzeitig durchsucht werden
+PAIR_CHUNK = 8_000_000
+
+
+def _arc_keys(index):
+    """
+    Sortierte Schlüssel u * n + v aller Kanten des Index (Position = Position in indices).
+    """
+    n = index.number_of_nodes
+    return np.repeat(np.arange(n), index.degree) * n + index.indices
+
+
+def triangle_list(index):
+    """
+    Alle Dreiecke eines ungerichteten Index. Die Kanten werden nach (Grad, Position)
+    orientiert, so dass jeder Knoten höchstens O(sqrt(m)) ausgehende Kanten hat; für jede
+    orientierte Kante u -> w werden die Nachfolger x von w gegen die Nachfolger von u
+    geschnitten (Suche im sortierten Schlüsselarray). Jedes Dreieck wird genau einmal gefunden.
+
+    Rückgabe:
+      tuple: drei Arrays (a, b, c) mit den Knotenpositionen der Dreiecke
+    """
+    n = index.number_of_nodes
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), index.degree))] = np.arange(n)
+    tails = np.repeat(np.arange(n), index.degree)
+    heads = index.indices
+    keep = rank[tails] < rank[heads]
+    # Orientierter Index: Schlüssel bleiben sortiert, da die Zeilen sortiert sind
+    oriented = AdjacencyIndex.from_edge_array(index.nodes, np.column_stack([tails[keep], heads[keep]]), directed=True)
+    keys = _arc_keys(oriented)
+    out_degree = oriented.degree
+    src = np.repeat(np.arange(n), out_degree)
+    dst = oriented.indices
+
+    found = [], [], []
+    # Blöcke von orientierten Kanten, deren Keile zusammen höchstens WEDGE_CHUNK ergeben
+    wedges = np.cumsum(out_degree[dst])
+    start = 0
+    while start < len(dst):
+        stop = max(int(np.searchsorted(wedges, (wedges[start - 1] if start else 0) + WEDGE_CHUNK, side="right")), start + 1)
+        u, w = src[start:stop], dst[start:stop]
+        starts = oriented.indptr[w]
+        lengths = out_degree[w]
+        owner = np.repeat(np.arange(len(w)), lengths)
+        x = oriented.indices[starts[owner] + np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)]
+        u, w = u[owner], w[owner]
+        candidate = u * n + x
+        position = np.minimum(np.searchsorted(keys, candidate), max(len(keys) - 1, 0))
+        closed = keys[position] == candidate if len(keys) else np.zeros(len(candidate), dtype=bool)
+        for target, values in zip(found, (u, w, x)):
+            target.append(values[closed])
+        start = stop
+    return tuple(np.concatenate(part) if part else np.zeros(0, dtype=np.int64) for part in found)
+
+
+def triangle_counts(index):
+    """
+    Anzahl der Dreiecke je Knoten (wie nx.triangles).
+    """
+    a, b, c = triangle_list(index)
+    n = index.number_of_nodes
+    return np.bincount(a, minlength=n) + np.bincount(b, minlength=n) + np.bincount(c, minlength=n)
+
+
+def _undirected_index(G, name):
+    import networkx as nx
+
+    if G.is_directed():
+        raise nx.NetworkXNotImplemented(f"{name} ist für gerichtete Graphen nicht implementiert")
+    return AdjacencyIndex.from_graph(G)
+
+
+def clustering(G):
+    """
+    Lokaler Clustering-Koeffizient je Knoten, 2 T(v) / (d(v) (d(v) - 1)) wie nx.clustering
+    (ungerichtet, ungewichtet). Mehrfachkanten und Schleifen werden ignoriert.
+
+    Rückgabe:
+      dict: Knoten -> Clustering-Koeffizient
+    """
+    index = _undirected_index(G, "clustering")
+    degree = index.degree.astype(float)
+    counts = triangle_counts(index)
+    possible = degree * (degree - 1)
+    values = np.divide(2.0 * counts, possible, out=np.zeros(len(degree)), where=counts > 0)
+    return dict(zip(index.nodes, values.tolist()))
+
+
+def average_clustering(G):
+    """
+    Mittlerer Clustering-Koeffizient über alle Knoten (wie nx.average_clustering).
+    """
+    values = list(clustering(G).values())
+    if not values:
+        raise ZeroDivisionError("Mittelwert über einen leeren Graphen")
+    return sum(values) / len(values)
+
+
+def transitivity(G):
+    """
+    Anteil geschlossener Dreierketten, 3 * Dreiecke / verbundene Tripel (wie nx.transitivity).
+    """
+    index = _undirected_index(G, "transitivity")
+    degree = index.degree
+    counts = triangle_counts(index)
+    if counts.sum() == 0:
+        return 0
+    return 2.0 * float(counts.sum()) / float((degree * (degree - 1)).sum())
+
+
+def local_efficiency(G):
+    """
+    Lokale Effizienz wie nx.local_efficiency: Mittelwert der globalen Effizienz des von
+    den Nachbarn jedes Knotens induzierten Teilgraphen. Statt eines Teilgraphen je Knoten
+    werden die Kanten aller Nachbarschaften aus der Dreiecksliste abgeleitet (Dreieck
+    (a, b, c) liefert die Kante (b, c) in der Nachbarschaft von a usw.). Die Nachbarschaften
+    bilden zusammen einen Graphen über den Kanten (v, x) des Index, in dem alle
+    Breitensuchen gleichzeitig ebenenweise laufen. Nachbarschaften ohne Kante (Effizienz 0)
+    und vollständige Nachbarschaften (Effizienz 1) werden nicht durchsucht.
+
+    Wie bei NetworkX gehört ein Knoten mit Schleife selbst zu seiner Nachbarschaft und ist
+    dort mit allen Nachbarn verbunden; gerichtete Graphen werden abgelehnt.
+
+    Rückgabe:
+      float: lokale Effizienz
+    """
+    import networkx as nx
+
+    index = _undirected_index(G, "local_efficiency")
+    n = index.number_of_nodes
+    if n == 0:
+        raise ZeroDivisionError("Mittelwert über einen leeren Graphen")
+    degree = index.degree
+    a, b, c = triangle_list(index)
+    edges_within = (np.bincount(a, minlength=n) + np.bincount(b, minlength=n) + np.bincount(c, minlength=n))
+    pairs = degree * (degree - 1) // 2
+    efficiency = np.zeros(n)
+    efficiency[(degree >= 2) & (edges_within == pairs)] = 1.0
+
+    # Nachbarschaft mit dem Knoten selbst: Abstand 1 zu allen Nachbarn, Nichtnachbarn über ihn mit Abstand 2
+    position = {node: i for i, node in enumerate(index.nodes)}
+    loops = np.array(sorted({position[v] for v, _ in nx.selfloop_edges(G)}), dtype=np.int64)
+    if len(loops):
+        k, e = degree[loops].astype(float), edges_within[loops].astype(float)
+        total = 2 * k + 2 * e + (k * (k - 1) - 2 * e) / 2
+        efficiency[loops] = np.divide(total, (k + 1) * k, out=np.zeros(len(loops)), where=k > 0)
+
+    searched = (edges_within > 0) & (edges_within < pairs)
+    searched[loops] = False
+    if searched.any():
+        efficiency[searched] = _neighborhood_efficiency(index, (a, b, c), searched)[searched]
+    # Summe in Knotenreihenfolge wie bei NetworkX
+    return sum(efficiency.tolist()) / n
+
+
+def _neighborhood_efficiency(index, triangles, searched):
+    """
+    Globale Effizienz der Nachbarschaftsgraphen der Knoten in searched. Jeder Nachbar x
+    von v ist ein Knoten (Kante v -> x des Index) im Nachbarschaftsgraphen von v; alle
+    Nachbarschaftsgraphen zusammen bilden eine Blockdiagonalmatrix B. Die Breitensuchen
+    aller Nachbarn eines Knotenbereichs laufen gemeinsam als dünnbesetzte Produkte
+    Front @ B, von denen die bereits erreichten Paare abgezogen werden.
+
+    Rückgabe:
+      np.ndarray: Effizienz je Knoten (nur für searched gültig)
+    """
+    from scipy.sparse import csr_array
+
+    n = index.number_of_nodes
+    degree = index.degree
+    keys = _arc_keys(index)
+    owner_of = np.repeat(np.arange(n), degree)
+
+    # Kanten der Nachbarschaftsgraphen zwischen Kantenpositionen des Index
+    a, b, c = triangles
+    center = np.concatenate([a, b, c])
+    first = np.concatenate([b, a, a])
+    second = np.concatenate([c, c, b])
+    keep = searched[center]
+    left = np.searchsorted(keys, center[keep] * n + first[keep])
+    right = np.searchsorted(keys, center[keep] * n + second[keep])
+    B = AdjacencyIndex.from_edge_array(range(len(keys)), np.column_stack([left, right])).to_scipy()
+
+    totals = np.zeros(n)
+    size = np.where(searched, degree.astype(np.int64) ** 2, 0)
+    lo = 0
+    while lo < n:
+        # Zusammenhängender Knotenbereich mit höchstens PAIR_CHUNK Paaren (mindestens ein Knoten)
+        cumulative = np.cumsum(size[lo:])
+        hi = lo + max(int(np.searchsorted(cumulative, PAIR_CHUNK, side="right")), 1)
+        rows = np.arange(index.indptr[lo], index.indptr[hi])
+        rows = rows[searched[owner_of[rows]]]
+        owner = owner_of[rows]
+        # Startpaare (s, s): eine Zeile je Nachbar der durchsuchten Knoten
+        frontier = csr_array((np.ones(len(rows)), (np.arange(len(rows)), rows)), shape=(len(rows), len(keys)))
+        reached = frontier
+        depth = 0
+        while frontier.nnz:
+            depth += 1
+            step = frontier @ B
+            step.data[:] = 1.0
+            frontier = step - step.multiply(reached)
+            frontier.eliminate_zeros()
+            totals += np.bincount(owner, weights=np.diff(frontier.indptr), minlength=n) / depth
+            reached = reached + frontier
+        lo = hi
+
+    possible = (degree * (degree - 1)).astype(float)
+    return np.divide(totals, possible, out=np.zeros(n), where=possible > 0)
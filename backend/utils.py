@@ -0,0 +1,48 @@
+import os
+import io
+import hashlib
+
+# Verzeichnis für abgeleitete Zwischenergebnisse (Adjazenzindizes, Layouts, ...).
+# Liegt unter temp_uploads/ und wird daher von cleanup.sh mit entfernt.
+CACHE_DIR = os.path.join("temp_uploads", ".cache")
+
+
+def cache_path(namespace, key, extension):
+    """
+    Liefert den Pfad einer Cache-Datei (CACHE_DIR/<namespace>/<key><extension>)
+    und legt das Verzeichnis bei Bedarf an.
+    """
+    directory = os.path.join(CACHE_DIR, namespace)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{key}{extension}")
+
+
+def file_signature(path):
+    """
+    Schneller Cache-Schlüssel aus absolutem Pfad, Größe und Änderungszeit einer Datei,
+    ohne deren Inhalt zu lesen.
+    """
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """
+    SHA-256 des Dateiinhalts; die Datei wird blockweise gelesen (auch für mehrere GB geeignet).
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_text(source):
+    """
+    Öffnet eine Eingabe zum zeilenweisen Lesen: entweder einen Dateipfad
+    oder einen Binärstrom (z. B. ein Mitglied aus einem Archiv).
+    """
+    if isinstance(source, str):
+        return open(source, "r")
+    return io.TextIOWrapper(source, encoding="utf-8", errors="replace")
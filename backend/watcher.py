@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import argparse
+import threading
+import ctypes
+import ctypes.util
+
+from backend.database_handler import initialize_database, save_watched_file, get_watched_file
+from backend.archives import ARCHIVE_EXTENSIONS
+from backend.staging import stage_file
+
+# Pfad zur SQLite-Datenbank
+database_path = "./network_analysis.db"
+
+# Dateien, die aus überwachten Ordnern übernommen werden (wie beim Upload)
+WATCH_EXTENSIONS = (".graphml", ".xml", ".cch", ".txt") + ARCHIVE_EXTENSIONS
+
+# Sekunden, die Größe und Änderungszeit einer Datei unverändert sein müssen,
+# bevor sie verarbeitet wird (Schutz vor halb geschriebenen Dateien)
+SETTLE_DELAY = 5.0
+
+# Abfrageintervall in Sekunden (Polling bzw. maximale Wartezeit auf inotify-Ereignisse)
+POLL_INTERVAL = 2.0
+
+# inotify-Konstanten aus <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def is_watched_file(name):
+    base = os.path.basename(name)
+    return not base.startswith(".") and base.lower().endswith(WATCH_EXTENSIONS)
+
+
+def list_directory(directory):
+    """
+    Alle übernehmbaren Dateien direkt in einem Ordner (nicht rekursiv).
+    """
+    try:
+        entries = os.listdir(directory)
+    except OSError as e:
+        print(f"Ordner {directory} kann nicht gelesen werden: {e}")
+        return []
+    paths = []
+    for name in entries:
+        path = os.path.join(directory, name)
+        if is_watched_file(name) and os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+class PollingSource:
+    """
+    Fallback ohne Betriebssystem-Benachrichtigungen: listet die Ordner in jedem Intervall neu auf.
+    """
+
+    def __init__(self, directories):
+        self.directories = list(directories)
+
+    def read(self, timeout):
+        time.sleep(timeout)
+        paths = []
+        for directory in self.directories:
+            paths.extend(list_directory(directory))
+        return paths
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """
+    Änderungsbenachrichtigungen über inotify (Linux, per ctypes ohne Zusatzpaket).
+    Liefert nur die tatsächlich geänderten Dateien statt die Ordner neu aufzulisten.
+    """
+
+    def __init__(self, directories):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or libc_name is None:
+            raise OSError(errno.ENOSYS, "inotify nicht verfügbar")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.watches = {}
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for directory in directories:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch fehlgeschlagen: {directory}")
+            self.watches[wd] = directory
+
+    def read(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        paths = []
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(buffer):
+            wd, _mask, _cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + INOTIFY_EVENT.size: offset + INOTIFY_EVENT.size + length].rstrip(b"\0")
+            offset += INOTIFY_EVENT.size + length
+            if wd in self.watches and name:
+                name = os.fsdecode(name)
+                if is_watched_file(name):
+                    paths.append(os.path.join(self.watches[wd], name))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    Überwacht Ordner und reiht neue oder geänderte Dateien gebündelt in die persistente
+    Job-Queue (backend/job_queue.py) ein; eigene Worker arbeiten sie ab.
+
+    Ablauf:
+      1. Geänderte Dateien werden gemerkt, bis Größe und Änderungszeit SETTLE_DELAY Sekunden
+         stabil sind.
+      2. Dateien, deren Größe/Änderungszeit dem zuletzt verarbeiteten Stand entspricht,
+         werden übersprungen; sonst wird die Datei bereitgestellt (Staging, liefert den Hash).
+         Bei unverändertem Hash wird nur der gespeicherte Stand aktualisiert.
+      3. Die übrigen Dateien werden als ein Stapel mit Stapelpriorität eingereiht
+         (Vorhersage, Speicherbudget und erneute Versuche wie bei allen Jobs).
+      4. Der verarbeitete Stand wird erst gespeichert, wenn der Job erfolgreich
+         abgeschlossen ist; Jobs eines abgebrochenen Laufs bleiben in der Queue.
+    """
+
+    def __init__(self, directories, database_path=database_path, settle_delay=SETTLE_DELAY,
+                 poll_interval=POLL_INTERVAL, use_inotify=True, progress_callback=None,
+                 queue_callback=None, workers=None):
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.database_path = database_path
+        self.settle_delay = settle_delay
+        self.poll_interval = poll_interval
+        self.progress_callback = progress_callback
+        self.queue_callback = queue_callback
+        self.pending = {}        # Pfad -> (Größe, mtime_ns, stabil seit)
+        self.jobs = {}           # Job-ID -> (Pfad, Größe, mtime_ns, Hash, bereitgestellter Pfad)
+        self.known = {}          # Pfad -> (Größe, mtime_ns) des verarbeiteten Stands (spart DB-Abfragen beim Polling)
+        self._last_depth = None
+        self._stop = threading.Event()
+        self.workers = workers
+        self.worker_pool = None
+
+        self.source = None
+        if use_inotify:
+            try:
+                self.source = InotifySource(self.directories)
+                print("Ordnerüberwachung mit inotify.")
+            except OSError as e:
+                print(f"inotify nicht nutzbar ({e}), verwende Polling.")
+        if self.source is None:
+            self.source = PollingSource(self.directories)
+
+    def queue_depth(self):
+        return len(self.pending) + len(self.jobs)
+
+    def _report_queue(self):
+        depth = self.queue_depth()
+        if depth != self._last_depth and self.queue_callback:
+            self._last_depth = depth
+            self.queue_callback(depth)
+
+    def observe(self, path, now):
+        """
+        Merkt eine (möglicherweise noch geschriebene) Datei vor oder setzt ihre Wartezeit zurück.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.pending.pop(path, None)
+            return
+        signature = (stat.st_size, stat.st_mtime_ns)
+        known = self.pending.get(path)
+        if known is None or known[:2] != signature:
+            if known is None and (self.is_unchanged(path, *signature) or self.is_queued(path, signature)):
+                return
+            self.pending[path] = (*signature, now)
+
+    def is_unchanged(self, path, size, mtime_ns):
+        if path not in self.known:
+            record = get_watched_file(self.database_path, path)
+            self.known[path] = record[:2] if record else None
+        return self.known[path] == (size, mtime_ns)
+
+    def is_queued(self, path, signature):
+        return any(entry[0] == path and entry[1:3] == signature for entry in self.jobs.values())
+
+    def take_settled(self, now):
+        settled = [p for p, (_, _, since) in self.pending.items() if now - since >= self.settle_delay]
+        for path in settled:
+            del self.pending[path]
+        return settled
+
+    def process_batch(self, paths):
+        """
+        Stellt die Dateien bereit, überspringt inhaltlich unveränderte und reiht den Rest
+        in die Job-Queue ein.
+
+        Rückgabe:
+          int: Anzahl der eingereihten Dateien.
+        """
+        from backend import job_queue
+
+        batch = []
+        entries = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                record = get_watched_file(self.database_path, path)
+                staged = stage_file(path, self.database_path)
+            except Exception as e:
+                print(f"Fehler beim Bereitstellen von {path}: {e}")
+                continue
+            if record is not None and record[2] == staged["hash"]:
+                save_watched_file(self.database_path, path, stat.st_size, stat.st_mtime_ns, staged["hash"])
+                self.known[path] = (stat.st_size, stat.st_mtime_ns)
+                print(f"Unverändert, übersprungen: {path}")
+                continue
+            batch.append(staged["path"])
+            entries.append((path, stat.st_size, stat.st_mtime_ns, staged["hash"], staged["path"]))
+
+        if batch:
+            print(f"Reihe {len(batch)} neue/geänderte Datei(en) ein.")
+            job_ids = job_queue.enqueue_files(self.database_path, batch)
+            self.jobs.update(zip(job_ids, entries))
+            self._start_workers()
+        self._report_queue()
+        return len(batch)
+
+    def _start_workers(self):
+        from backend import job_queue
+
+        if self.worker_pool is None:
+            self.worker_pool = job_queue.WorkerPool(self.database_path, workers=self.workers)
+        if not self.worker_pool.is_running():
+            self.worker_pool.start()
+
+    def poll_jobs(self):
+        """
+        Übernimmt die abgeschlossenen Jobs: Bei Erfolg wird der Stand (Größe, Änderungszeit,
+        Hash) gespeichert. Endgültig fehlgeschlagene Dateien werden nur im Speicher gemerkt
+        und erst nach einer Änderung bzw. einem Neustart erneut eingereiht. Erneute Versuche
+        übernimmt die Queue.
+        """
+        from backend import job_queue
+
+        if not self.jobs:
+            return
+        for job_id, job in job_queue.get_jobs(self.database_path, self.jobs).items():
+            if job["state"] not in (job_queue.DONE, job_queue.FAILED):
+                continue
+            path, size, mtime_ns, content_hash, staged_path = self.jobs.pop(job_id)
+            status = "ok" if job["state"] == job_queue.DONE else "error"
+            if status == "ok":
+                save_watched_file(self.database_path, path, size, mtime_ns, content_hash)
+            self.known[path] = (size, mtime_ns)
+            if self.progress_callback:
+                self.progress_callback({
+                    "event": "finished", "file_path": staged_path, "status": status, "error": job["error"],
+                    "convert_seconds": job["convert_seconds"] or 0.0,
+                    "analysis_seconds": job["analysis_seconds"] or 0.0,
+                })
+        if self.jobs:
+            # Worker beendet, obwohl Jobs offen sind (z. B. Wartezeit vor erneutem Versuch)
+            self._start_workers()
+
+    def run(self):
+        """
+        Überwachungsschleife bis stop() aufgerufen wird.
+        """
+        now = time.monotonic()
+        for directory in self.directories:
+            for path in list_directory(directory):
+                self.observe(path, now)
+        self._report_queue()
+
+        try:
+            while not self._stop.is_set():
+                changed = self.source.read(self.poll_interval)
+                now = time.monotonic()
+                for path in changed:
+                    self.observe(path, now)
+                # Vorgemerkte Dateien erneut prüfen (Größe kann sich noch ändern)
+                for path in list(self.pending):
+                    self.observe(path, now)
+                settled = self.take_settled(now)
+                if settled and not self._stop.is_set():
+                    self.process_batch(settled)
+                self.poll_jobs()
+                self._report_queue()
+        finally:
+            self.source.close()
+            # Laufende Jobs gehen zurück in die Queue und werden beim nächsten Start fortgesetzt
+            if self.worker_pool is not None:
+                self.worker_pool.stop()
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Überwacht Ordner und analysiert neue oder geänderte Topologien.")
+    parser.add_argument("directories", nargs="+", help="Zu überwachende Ordner")
+    parser.add_argument("--settle", type=float, default=SETTLE_DELAY, help="Wartezeit bis eine Datei als fertig gilt (s)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Abfrageintervall (s)")
+    parser.add_argument("--polling", action="store_true", help="Polling statt inotify verwenden")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl der Worker-Prozesse")
+    args = parser.parse_args()
+
+    initialize_database(database_path)
+    watcher = FolderWatcher(
+        args.directories, settle_delay=args.settle, poll_interval=args.interval,
+        use_inotify=not args.polling, workers=args.workers,
+        queue_callback=lambda depth: print(f"Warteschlange: {depth}"),
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("Überwachung beendet.")
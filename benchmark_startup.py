@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+from frontend.gui_main import STARTUP_BENCHMARK_ENV
+
+# Module, die beim Start der GUI (vor dem ersten Zeichnen) nicht geladen sein sollen
+HEAVY_MODULES = ["networkx", "vispy", "matplotlib", "scipy", "numpy"]
+
+# Ablage der Messreihen (eine JSON-Zeile pro Lauf)
+RESULTS_PATH = os.path.join("temp_uploads", ".cache", "startup_benchmark.jsonl")
+
+# Ein Lauf gilt als Regression, wenn er um diesen Faktor langsamer ist als der Median der Vorläufe
+REGRESSION_FACTOR = 1.5
+
+IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import frontend.gui_main
+elapsed = time.perf_counter() - start
+heavy = [m for m in {modules!r} if m in sys.modules]
+print(json.dumps({{"import_seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+
+def measure_import(python=sys.executable):
+    """
+    Importzeit von frontend.gui_main in einem frischen Interpreter und die dabei bereits
+    geladenen schweren Module.
+    """
+    code = IMPORT_PROBE.format(modules=HEAVY_MODULES)
+    output = subprocess.run([python, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_paint(python=sys.executable, timeout=120):
+    """
+    Startet start.py als eigenen Prozess und misst die Zeit bis zum ersten Zeichnen des
+    Fensters sowie bis der sichtbare Tab fertig aufgebaut ist (inkl. Interpreterstart).
+    """
+    env = dict(os.environ)
+    env[STARTUP_BENCHMARK_ENV] = "1"
+    launched = time.time()
+    result = subprocess.run([python, "start.py"], capture_output=True, text=True, env=env, timeout=timeout)
+
+    marks = {}
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP "):
+            name, value = line[len("STARTUP "):].split("=", 1)
+            marks[name] = float(value)
+    if "first_paint" not in marks:
+        raise RuntimeError(f"Kein Zeitstempel für das erste Zeichnen erhalten:\n{result.stderr}")
+    return {
+        "first_paint_seconds": marks["first_paint"] - launched,
+        "tab_ready_seconds": marks.get("tab_ready", marks["first_paint"]) - launched,
+    }
+
+
+def load_history(path=RESULTS_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_regression(record, history, factor=REGRESSION_FACTOR):
+    """
+    Vergleicht einen Lauf mit dem Median der bisherigen Läufe.
+
+    Rückgabe:
+      list: Beschreibungen der gefundenen Regressionen (leer, wenn alles in Ordnung ist).
+    """
+    problems = []
+    if record["heavy_modules"]:
+        problems.append(f"Schwere Module beim Import geladen: {', '.join(record['heavy_modules'])}")
+    for key in ("import_seconds", "first_paint_seconds"):
+        previous = [run[key] for run in history if key in run]
+        if not previous or key not in record:
+            continue
+        reference = statistics.median(previous)
+        if record[key] > reference * factor:
+            problems.append(f"{key}: {record[key]:.3f}s (Median bisher {reference:.3f}s)")
+    return problems
+
+
+def run_benchmark(repeat=3, gui=True, results_path=RESULTS_PATH):
+    """
+    Führt die Messungen mehrfach aus, speichert den besten Lauf und prüft auf Regressionen.
+    """
+    imports = [measure_import() for _ in range(repeat)]
+    record = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "import_seconds": min(run["import_seconds"] for run in imports),
+        "heavy_modules": imports[-1]["heavy_modules"],
+    }
+    if gui:
+        paints = [measure_first_paint() for _ in range(repeat)]
+        record["first_paint_seconds"] = min(run["first_paint_seconds"] for run in paints)
+        record["tab_ready_seconds"] = min(run["tab_ready_seconds"] for run in paints)
+
+    history = load_history(results_path)
+    problems = check_regression(record, history)
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record, problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Misst Importzeit und Zeit bis zum ersten Zeichnen der GUI.")
+    parser.add_argument("--repeat", type=int, default=3, help="Anzahl der Messläufe (bester Lauf zählt)")
+    parser.add_argument("--no-gui", action="store_true", help="Nur die Importzeit messen")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Datei für die Messreihe (JSON Lines)")
+    args = parser.parse_args()
+
+    record, problems = run_benchmark(repeat=args.repeat, gui=not args.no_gui, results_path=args.output)
+    print(f"Import frontend.gui_main: {record['import_seconds']:.3f}s")
+    if "first_paint_seconds" in record:
+        print(f"Erstes Zeichnen:          {record['first_paint_seconds']:.3f}s")
+        print(f"Tab aufgebaut:            {record['tab_ready_seconds']:.3f}s")
+    if problems:
+        print("Regression erkannt:")
+        for problem in problems:
+            print(" -", problem)
+        sys.exit(1)
+    print("Keine Regression gegenüber den bisherigen Läufen.")
@@ -11,10 +11,14 @@ from PyQt5.QtWidgets import (
     QLineEdit, QGroupBox, QFormLayout, QLabel, QComboBox, QSpinBox, QSlider,
     QCheckBox, QHBoxLayout, QToolButton, QMenu, QAction, QAbstractItemView, QFileDialog, QMessageBox
 )
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal, Qt
 from backend.export_handler import export_single_record_to_json
+from backend.database_handler import get_thumbnails
+from backend.archives import source_exists
+from backend.metrics import LAZY_METRICS, EXTRA_COLUMNS
+from backend import lazy_metrics
 from PyQt5.QtWidgets import QToolTip
-from PyQt5.QtGui import QCursor
+from PyQt5.QtGui import QCursor, QIcon
 from PyQt5.QtWidgets import QHeaderView
 
 
@@ -22,6 +26,9 @@ from PyQt5.QtWidgets import QHeaderView
 
 DATABASE_PATH = "./network_analysis.db"
 
+# Abfrageintervall (ms) für im Hintergrund berechnete Metriken
+LAZY_POLL_INTERVAL = 1000
+
 
 # Worker-class für asynchrone DB-Abfragen
 
@@ -74,11 +81,18 @@ class AnalysisSection(QWidget):
             "Project_name", "File_name", "is_directed",
             "number_of_nodes", "number_of_edges",
             "is_connected", "is_strongly_connected", "is_weakly_connected",
+            "number_of_components", "largest_component_size", "component_sizes", "strong_component_sizes",
             "node_connectivity", "edge_connectivity",
-            "global_efficiency", "local_efficiency",
-            "graph_center", "degree_centrality", "betweenness_centrality",
-            "closeness_centrality", "pagerank",
+            "node_connectivity_method", "edge_connectivity_method",
+            "global_efficiency", "local_efficiency", "average_clustering", "transitivity",
+            "graph_center", "degree_centrality", "betweenness_centrality", "edge_betweenness",
+            "closeness_centrality", "pagerank", "eigenvector_centrality",
+            "coreness", "degeneracy", "rich_club", "degree_assortativity",
+            "communities", "modularity", "number_of_communities",
             "diameter", "radius", "periphery", "density",
+            "algebraic_connectivity", "spectral_radius", "spectral_gap", "natural_connectivity",
+            "effective_diameter", "effective_diameter_error", "average_distance", "average_distance_error",
+            "approx_global_efficiency", "approx_global_efficiency_error", "hop_plot", "hop_plot_error",
             "is_tree", "is_forest", "is_bipartite", "is_planar", "is_multigraph"
         ]
 
@@ -100,18 +114,47 @@ class AnalysisSection(QWidget):
             "is_connected": "True, wenn der ungerichtete Graph vollständig zusammenhängend ist",
             "is_strongly_connected": "True, wenn im gerichteten Graph jeder Knoten von jedem anderen aus erreichbar ist",
             "is_weakly_connected": "True, wenn der gerichtete Graph nach Ignorieren der Richtungen verbunden ist",
+            "number_of_components": "Anzahl der (schwach) zusammenhängenden Komponenten",
+            "largest_component_size": "Knoten der größten (stark) zusammenhängenden Komponente, auf der Durchmesser, Radius, Zentrum und Peripherie berechnet werden",
+            "component_sizes": "Größenverteilung der (schwach) zusammenhängenden Komponenten als [Größe, Anzahl]",
+            "strong_component_sizes": "Größenverteilung der stark zusammenhängenden Komponenten (nur gerichtete Graphen)",
             "node_connectivity": "Minimale Anzahl an Knoten, deren Entfernung den Graph in isolierte Teile trennt",
             "edge_connectivity": "Minimale Anzahl an Kanten, deren Entfernung den Graph trennt",
+            "node_connectivity_method": "Rechenweg der Knotenkonnektivität (z. B. disconnected, articulation_point, min_degree, max_flow)",
+            "edge_connectivity_method": "Rechenweg der Kantenkonnektivität (z. B. disconnected, bridge, min_degree, max_flow)",
             "global_efficiency": "Maß für den mittleren Informationsfluss zwischen allen Knoten",
             "local_efficiency": "Wie effizient Nachbarn bei Knotenausfall miteinander kommunizieren",
+            "average_clustering": "Mittlerer Anteil verbundener Nachbarpaare je Knoten (lokales Clustering)",
+            "transitivity": "Anteil geschlossener Dreiecke an allen Dreierketten im Graph",
             "graph_center": "Knoten mit der geringsten maximalen Entfernung zu allen anderen",
             "degree_centrality": "Anzahl der direkten Verbindungen eines Knotens",
             "betweenness_centrality": "Wie oft ein Knoten auf kürzesten Pfaden liegt (Vermittlerrolle)",
+            "edge_betweenness": "Wie oft eine Kante auf kürzesten Pfaden liegt (Liste [u, v, Wert] je Kante)",
             "closeness_centrality": "Durchschnittliche Entfernung eines Knotens zu allen anderen",
             "pagerank": "Wichtigkeit eines Knotens basierend auf eingehenden Verbindungen",
+            "eigenvector_centrality": "Wichtigkeit eines Knotens über die Wichtigkeit seiner Nachbarn (führender Eigenvektor)",
             "diameter": "Größte kürzeste Entfernung zwischen zwei beliebigen Knoten",
             "radius": "Kleinster maximaler Abstand eines Knotens im Graph",
             "periphery": "Knoten mit größter Entfernung zu anderen (höchste Exzentrizität)",
+            "coreness": "Kernzahl je Knoten: größtes k, für das der Knoten im k-Core (alle Knoten mit Grad ≥ k) liegt",
+            "degeneracy": "Größte Kernzahl im Graph (innerster k-Core)",
+            "rich_club": "Rich-Club-Koeffizient φ(k): Kantendichte unter den Knoten mit Grad > k, für k = 0, 1, 2, …",
+            "degree_assortativity": "Korrelation der Grade verbundener Knoten; negativ = Hubs hängen an kleinen Knoten",
+            "communities": "Community je Knoten (0 = größte), per Louvain/Leiden-Verfahren bestimmt",
+            "modularity": "Güte der Community-Aufteilung: Anteil der Kanten innerhalb der Communities abzüglich des Zufallserwartungswerts",
+            "number_of_communities": "Anzahl der gefundenen Communities (isolierte Knoten bilden eigene)",
+            "algebraic_connectivity": "Zweitkleinster Laplace-Eigenwert; 0 bei getrenntem Graph, größer = schwerer zu zerschneiden",
+            "spectral_radius": "Größter Eigenwert der Adjazenzmatrix (Ausbreitungsschwelle, z. B. für Epidemien)",
+            "spectral_gap": "Abstand der beiden größten Adjazenz-Eigenwerte; groß = gut vermischender Graph",
+            "natural_connectivity": "Gemittelte Anzahl geschlossener Wege, ln(Spur(exp(A)) / n) (große Graphen per Lanczos geschätzt)",
+            "effective_diameter": "Hops, innerhalb derer 90 % der erreichbaren Knotenpaare liegen (interpoliert)",
+            "effective_diameter_error": "Standardfehler des effektiven Durchmessers (0 = exakt berechnet)",
+            "average_distance": "Mittlere kürzeste Entfernung über alle erreichbaren Knotenpaare",
+            "average_distance_error": "Standardfehler der mittleren Distanz (0 = exakt berechnet)",
+            "approx_global_efficiency": "Globale Effizienz aus der Distanzverteilung (große Graphen per HyperANF geschätzt)",
+            "approx_global_efficiency_error": "Standardfehler der geschätzten globalen Effizienz (0 = exakt berechnet)",
+            "hop_plot": "Anzahl der Knotenpaare mit Entfernung ≤ t für t = 0, 1, 2, … (Hop-Plot)",
+            "hop_plot_error": "Relativer Standardfehler der Paarzahlen im Hop-Plot (0 = exakt berechnet)",
             "density": "Verhältnis tatsächlicher Kanten zur maximal möglichen Anzahl",
             "is_tree": "True, wenn der Graph ein zusammenhängender, zyklenfreier Baum ist",
             "is_forest": "True, wenn der Graph aus mehreren getrennten Bäumen besteht",
@@ -306,6 +349,18 @@ class AnalysisSection(QWidget):
 
         # Worker
         self.worker = None
+        self.append_worker = None
+        self.append_pending = False
+
+        # Bereits angezeigte Zeilen (ids) für das inkrementelle Nachladen
+        self.loaded_ids = set()
+        self.last_loaded_id = 0
+        # id je Tabellenzeile und Zustand der zurückgestellten Metriken ((id, Metrik) -> (Zustand, Fehler))
+        self.row_ids = []
+        self.metric_states = {}
+        self.lazy_timer = QTimer(self)
+        self.lazy_timer.setInterval(LAZY_POLL_INTERVAL)
+        self.lazy_timer.timeout.connect(self.poll_lazy_metrics)
 
         # Start
         self.load_analysis_results()
@@ -337,6 +392,8 @@ class AnalysisSection(QWidget):
             action.setChecked(col_name in self.selected_columns or col_name in self.forced_columns)
 
             tooltip = self.metric_tooltips.get(col_name.lower())
+            if tooltip and col_name in LAZY_METRICS:
+                tooltip += "\n(Aufwendig: wird beim Einblenden im Hintergrund berechnet)"
 
             if tooltip:
                 # Tooltip beim Mouse-Hover über das Menüelement
@@ -374,19 +431,11 @@ class AnalysisSection(QWidget):
     
     # Filter-Logik
     
-    def load_analysis_results(self):
+    def build_filter_conditions(self):
         """
-        Baut die SQL-Abfrage dynamisch (Filter) und wählt IMMER alle Spalten.
-        Zeigt in der Tabelle nur self.selected_columns (inkl. forced_columns).
+        Sammelt die WHERE-Bedingungen und Parameter aus den aktuellen Filtereinstellungen.
         """
-        self.status_label.setText("Lade Ergebnisse...")
         params = []
-
-        # SELECT-Liste = alle Spalten
-        select_clause = ", ".join(self.all_columns)
-        query = f"SELECT {select_clause} FROM analysis_results"
-
-        # Bedingungen
         conditions = []
         search_text = self.search_input.text().strip()
         if search_text:
@@ -461,6 +510,22 @@ class AnalysisSection(QWidget):
             conditions.append("is_multigraph = ?")
             params.append(1)
 
+        return conditions, params
+
+    def load_analysis_results(self):
+        """
+        Baut die SQL-Abfrage dynamisch (Filter) und wählt IMMER alle Spalten.
+        Zeigt in der Tabelle nur self.selected_columns (inkl. forced_columns).
+        Die id wird als letzte Spalte mitgelesen, damit später nur neue Zeilen nachgeladen werden.
+        """
+        self.status_label.setText("Lade Ergebnisse...")
+
+        # SELECT-Liste = alle Spalten
+        select_clause = ", ".join(self.all_columns)
+        query = f"SELECT {select_clause}, id FROM analysis_results"
+
+        conditions, params = self.build_filter_conditions()
+
         # Zusammensetzen
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
@@ -491,6 +556,12 @@ class AnalysisSection(QWidget):
         """
         print("update_table wird aufgerufen mit Ergebnissen:", results)
 
+        # Letzte Spalte ist die id
+        self.loaded_ids = {row[-1] for row in results}
+        self.last_loaded_id = max(self.loaded_ids, default=0)
+        self.row_ids = [row[-1] for row in results]
+        results = [tuple(row[:-1]) for row in results]
+
         # forced_columns sind sowieso in selected_columns, da wir die Actions disabled haben gemacht 
         displayed_cols = [c for c in self.all_columns if c in self.selected_columns]
 
@@ -508,19 +579,200 @@ class AnalysisSection(QWidget):
                 header_item.setToolTip(tooltip)
             self.data_table.setHorizontalHeaderItem(col_idx, header_item)
 
+        thumbnails = self.load_thumbnails()
+        self.metric_states = self.load_metric_states(self.row_ids)
+        self.request_visible_metrics(self.row_ids, displayed_cols)
+
         for row_idx, row_data in enumerate(results):
-            for col_idx, col_name in enumerate(displayed_cols):
-                full_index = self.all_columns.index(col_name)
-                value = row_data[full_index]
-                item = QTableWidgetItem(str(value))
-                self.data_table.setItem(row_idx, col_idx, item)
-        
+            self.fill_row(row_idx, row_data, displayed_cols, thumbnails, self.row_ids[row_idx])
 
         # Speichere das komplette Ergebnis (alle Spalten) für den Einzelexport
         self.full_results = results
 
         self.status_label.setText(f"Ergebnisse geladen: {len(results)} Einträge gefunden.")
 
+    def fill_row(self, row_idx, row_data, displayed_cols, thumbnails, result_id=None):
+        for col_idx, col_name in enumerate(displayed_cols):
+            full_index = self.all_columns.index(col_name)
+            value = row_data[full_index]
+            state = self.metric_states.get((result_id, col_name))
+            if value is None and state is not None:
+                item = self.lazy_metric_item(*state)
+            else:
+                item = QTableWidgetItem(str(value))
+            if col_name == "File_name":
+                self.apply_thumbnail(item, thumbnails, value)
+            self.data_table.setItem(row_idx, col_idx, item)
+
+    
+    # Zurückgestellte Metriken (Ingest-Profil "structural", siehe backend/lazy_metrics.py)
+    
+    def lazy_metric_item(self, state, error=None):
+        """
+        Zelle einer noch nicht berechneten Metrik: ausstehend oder fehlgeschlagen.
+        """
+        if state == lazy_metrics.FAILED:
+            item = QTableWidgetItem("⚠ Fehler")
+            item.setToolTip(f"Berechnung fehlgeschlagen: {error}")
+        else:
+            item = QTableWidgetItem("⏳ ausstehend")
+            item.setToolTip("Wird im Hintergrund berechnet...")
+        return item
+
+    def load_metric_states(self, result_ids):
+        try:
+            return lazy_metrics.get_metric_states(DATABASE_PATH, result_ids)
+        except sqlite3.Error:
+            return {}
+
+    def request_visible_metrics(self, result_ids, displayed_cols):
+        """
+        Fordert die zurückgestellten Metriken der sichtbaren Spalten für die angegebenen
+        Zeilen an und startet die Worker. Berechnete Werte trägt poll_lazy_metrics nach.
+        """
+        metrics = [c for c in displayed_cols if c in LAZY_METRICS]
+        ids = set(result_ids)
+        deferred = [key for key, (state, _) in self.metric_states.items()
+                    if state == lazy_metrics.DEFERRED and key[0] in ids and key[1] in metrics]
+        if deferred:
+            try:
+                lazy_metrics.request_metrics(DATABASE_PATH, metrics, {key[0] for key in deferred})
+            except sqlite3.Error as e:
+                self.handle_error(str(e))
+                return
+            for key in deferred:
+                self.metric_states[key] = (lazy_metrics.PENDING, None)
+            self.start_workers()
+        if any(state == lazy_metrics.PENDING for state, _ in self.metric_states.values()):
+            self.lazy_timer.start()
+
+    def start_workers(self):
+        """
+        Die Jobs arbeitet der Worker-Pool des Upload-Panels ab.
+        """
+        upload_panel = getattr(self.window(), "upload_panel", None)
+        if upload_panel is not None:
+            upload_panel.worker_pool.start()
+
+    def poll_lazy_metrics(self):
+        """
+        Übernimmt inzwischen berechnete (oder fehlgeschlagene) Metriken in die Tabelle.
+        """
+        pending = {key for key, (state, _) in self.metric_states.items()
+                   if state == lazy_metrics.PENDING and key[0] in self.loaded_ids}
+        if not pending:
+            self.lazy_timer.stop()
+            return
+        states = self.load_metric_states({key[0] for key in pending})
+        finished = {key: states[key] for key in pending
+                    if key in states and states[key][0] != lazy_metrics.PENDING}
+        if not finished:
+            self.start_workers()
+            return
+        try:
+            values = lazy_metrics.get_metric_values(DATABASE_PATH, finished)
+        except sqlite3.Error as e:
+            self.handle_error(str(e))
+            return
+
+        displayed_cols = [c for c in self.all_columns if c in self.selected_columns]
+        for (result_id, metric), state in finished.items():
+            self.metric_states[(result_id, metric)] = state
+            if result_id not in self.row_ids:
+                continue
+            row_idx = self.row_ids.index(result_id)
+            row_data = list(self.full_results[row_idx])
+            # Auch die Zusatzspalte aktualisieren (z. B. Rechenweg der Konnektivität)
+            for column in (metric, EXTRA_COLUMNS.get(metric)):
+                if column not in self.all_columns:
+                    continue
+                value = values.get((result_id, column))
+                row_data[self.all_columns.index(column)] = value
+                if column in displayed_cols:
+                    if value is None and column == metric:
+                        item = self.lazy_metric_item(*state)
+                    else:
+                        item = QTableWidgetItem(str(value))
+                    self.data_table.setItem(row_idx, displayed_cols.index(column), item)
+            self.full_results[row_idx] = tuple(row_data)
+
+    
+    # Inkrementelles Nachladen während einer Batch-Analyse
+    
+    def append_new_results(self):
+        """
+        Lädt nur die seit dem letzten Laden hinzugekommenen Zeilen (id > letzte id),
+        die den aktuellen Filtern entsprechen, und hängt sie an die Tabelle an.
+        """
+        if self.append_worker is not None and self.append_worker.isRunning():
+            # Nach Abschluss der laufenden Abfrage erneut nachladen
+            self.append_pending = True
+            return
+        self.append_pending = False
+
+        conditions, params = self.build_filter_conditions()
+        conditions.append("id > ?")
+        params.append(self.last_loaded_id)
+        select_clause = ", ".join(self.all_columns)
+        query = (f"SELECT {select_clause}, id FROM analysis_results "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY id")
+
+        self.append_worker = DatabaseWorker(query, params)
+        self.append_worker.results_ready.connect(self.append_rows)
+        self.append_worker.error_occurred.connect(self.handle_error)
+        self.append_worker.finished.connect(self.on_append_worker_finished)
+        self.append_worker.start()
+
+    def on_append_worker_finished(self):
+        if self.append_pending:
+            self.append_new_results()
+
+    def append_rows(self, results):
+        new_rows = [row for row in results if row[-1] not in self.loaded_ids]
+        if not new_rows:
+            return
+        displayed_cols = [c for c in self.all_columns if c in self.selected_columns]
+        thumbnails = self.load_thumbnails()
+        if not hasattr(self, "full_results"):
+            self.full_results = []
+        new_ids = [row[-1] for row in new_rows]
+        self.metric_states.update(self.load_metric_states(new_ids))
+        self.request_visible_metrics(new_ids, displayed_cols)
+
+        for row in new_rows:
+            self.loaded_ids.add(row[-1])
+            self.last_loaded_id = max(self.last_loaded_id, row[-1])
+            row_data = tuple(row[:-1])
+            row_idx = self.data_table.rowCount()
+            self.data_table.insertRow(row_idx)
+            self.fill_row(row_idx, row_data, displayed_cols, thumbnails, row[-1])
+            self.full_results.append(row_data)
+            self.row_ids.append(row[-1])
+
+        self.status_label.setText(f"Ergebnisse geladen: {len(self.full_results)} Einträge gefunden.")
+
+    
+    # Vorschaubilder (vom Batch-Renderer in der DB hinterlegt)
+    
+    def load_thumbnails(self):
+        """
+        Liest die gespeicherten Vorschaubilder (file_path -> (graph_hash, thumbnail_path)).
+        """
+        try:
+            return get_thumbnails(DATABASE_PATH)
+        except sqlite3.Error:
+            return {}
+
+    def apply_thumbnail(self, item, thumbnails, file_name):
+        """
+        Zeigt das Vorschaubild einer Datei als Icon und vergrößert als Tooltip.
+        """
+        path = os.path.normpath(os.path.join("temp_uploads", str(file_name)))
+        entry = thumbnails.get(path)
+        if entry and entry[1] and os.path.exists(entry[1]):
+            item.setIcon(QIcon(entry[1]))
+            item.setToolTip(f'<img src="{entry[1]}">')
+
     
     # Erweiterte Filterpanel ein-/ausblenden
     
@@ -586,8 +838,8 @@ class AnalysisSection(QWidget):
         base_dir = "temp_uploads"
         full_path = os.path.join(base_dir, filename)
 
-        # Existenz und Format-Checks
-        if not os.path.exists(full_path):
+        # Existenz und Format-Checks (Archivmitglieder: "archiv.zip!datei.graphml")
+        if not source_exists(full_path):
             self.status_label.setText(f"Die Datei {filename} wurde nicht gefunden.")
             return
         if not filename.lower().endswith('.graphml'):
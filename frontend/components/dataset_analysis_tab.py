@@ -13,6 +13,9 @@ from PyQt5.QtWidgets import (
 )
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.transforms import blended_transform_factory
+
+from backend.database_handler import get_data_version
 
 
 #  Globale Datenbankpfad
@@ -20,6 +23,153 @@ from matplotlib.figure import Figure
 DATABASE_PATH = "./network_analysis.db"
 
 
+#  Balkendiagramm mit zwischengespeicherten Artists und Blitting
+
+class BlittedBarChart:
+    """
+    Hält die Balken-Artists eines Diagramms für eine Datenversion vor.
+    Das Ein-/Ausblenden von Metriken ändert nur Sichtbarkeit und Position der Balken
+    und wird per Blitting gezeichnet; ein vollständiges Neuzeichnen (inkl. tight_layout)
+    erfolgt nur beim Aufbau für neue Daten oder wenn die y-Achse angepasst werden muss.
+    """
+
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.key = None
+        self.ax = None
+        self.mode = None
+        self.metrics = []
+        self.bars = {}
+        self.labels = {}
+        self.values = {}
+        self.group_x = np.zeros(0)
+        self.bar_width = 0.8
+        self.legend = None
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _reset(self, key, title, ylabel):
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_title(title)
+        self.ax.set_ylabel(ylabel)
+        self.key = key
+        self.bars = {}
+        self.labels = {}
+        self.values = {}
+        self.legend = None
+        self.background = None
+
+    def build_single(self, key, metrics, values, color, title, ylabel):
+        """
+        Ein Balken pro Metrik; die Beschriftungen sind eigene Text-Artists, damit sie
+        beim Umschalten ohne Neuzeichnen der Achsen mitverschoben werden können.
+        """
+        self._reset(key, title, ylabel)
+        self.mode = "single"
+        self.metrics = list(metrics)
+        self.bar_width = 0.8
+        self.ax.set_xticks([])
+        label_transform = blended_transform_factory(self.ax.transData, self.ax.transAxes)
+        for i, (metric, value) in enumerate(zip(metrics, values)):
+            self.bars[metric] = list(self.ax.bar(i, value, self.bar_width, color=color, animated=True))
+            self.labels[metric] = self.ax.text(
+                i, -0.02, metric, transform=label_transform, rotation=45,
+                ha="right", va="top", animated=True
+            )
+            self.values[metric] = np.array([value], dtype=float)
+        self.figure.subplots_adjust(bottom=0.35)
+
+    def build_grouped(self, key, groups, metrics, values, colors, bar_width, title, xlabel, ylabel):
+        """
+        Gruppierte Balken: eine Gruppe pro Datensatz, ein Balken pro Metrik.
+        """
+        self._reset(key, title, ylabel)
+        self.mode = "grouped"
+        self.metrics = list(metrics)
+        self.bar_width = bar_width
+        self.group_x = np.arange(len(groups))
+        for metric in metrics:
+            self.bars[metric] = list(self.ax.bar(
+                self.group_x, values[metric], bar_width, label=metric,
+                color=colors[metric], animated=True
+            ))
+            self.values[metric] = np.asarray(values[metric], dtype=float)
+        self.ax.set_xticks(self.group_x)
+        self.ax.set_xticklabels(groups, rotation=45, ha="right")
+        self.ax.set_xlabel(xlabel)
+        self.figure.tight_layout()
+
+    def show_metrics(self, selected):
+        """
+        Blendet die gewählten Metriken ein, ordnet die Balken neu an und zeichnet per Blitting.
+        """
+        if self.ax is None:
+            return
+        visible = [m for m in self.metrics if m in selected]
+        for metric in self.metrics:
+            shown = metric in selected
+            for rect in self.bars[metric]:
+                rect.set_visible(shown)
+            if metric in self.labels:
+                self.labels[metric].set_visible(shown)
+
+        if self.mode == "single":
+            for i, metric in enumerate(visible):
+                self.bars[metric][0].set_x(i - self.bar_width / 2)
+                self.labels[metric].set_x(i)
+            self.ax.set_xlim(-0.6, max(len(visible), 1) - 0.4)
+        else:
+            # Gruppen zentriert um die (festen) x-Ticks anordnen
+            for i, metric in enumerate(visible):
+                offset = (i - (len(visible) - 1) / 2) * self.bar_width
+                for x, rect in zip(self.group_x, self.bars[metric]):
+                    rect.set_x(x + offset - self.bar_width / 2)
+            if self.legend is not None:
+                self.legend.remove()
+                self.legend = None
+            if visible:
+                self.legend = self.ax.legend(
+                    [self.bars[m][0] for m in visible], visible, title="Metriken"
+                )
+                self.legend.set_animated(True)
+
+        # Achsenbereich nur bei Bedarf ändern (erfordert vollständiges Neuzeichnen)
+        ymax = max((self.values[m].max() for m in visible if len(self.values[m])), default=0.0)
+        top = self.ax.get_ylim()[1]
+        if self.background is None or ymax > top or (ymax > 0 and ymax < 0.5 * top):
+            self.ax.set_ylim(0, ymax * 1.05 if ymax > 0 else 1)
+            self.canvas.draw()
+        else:
+            self.blit()
+
+    def blit(self):
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+    def _animated_artists(self):
+        for metric in self.metrics:
+            yield from self.bars[metric]
+            if metric in self.labels:
+                yield self.labels[metric]
+        if self.legend is not None:
+            yield self.legend
+
+    def _draw_animated(self):
+        for artist in self._animated_artists():
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def _on_draw(self, event):
+        # Hintergrund (Achsen ohne Balken) sichern und die Balken darüber zeichnen
+        if self.ax is None:
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+
 #  Asynchroner DatabaseWorker
 
 class DatabaseWorker(QThread):
@@ -141,6 +291,22 @@ class DatasetAnalysisTab(QWidget):
         )
         self.diag_tabwidget.addTab(self.tab2, "Diagramm (Reelle Zahlen)")
 
+        # Tab 3: Hop-Plot (Anteil der erreichbaren Knotenpaare innerhalb von t Hops)
+        self.tab3 = QWidget()
+        self.tab3_layout = QVBoxLayout(self.tab3)
+        self.fig3 = Figure(figsize=(5,3))
+        self.canvas3 = FigureCanvas(self.fig3)
+        self.tab3_layout.addWidget(self.canvas3)
+        self.canvas3.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.canvas3.customContextMenuRequested.connect(
+            lambda pos: self._show_context_menu(self.canvas3, pos)
+        )
+        self.diag_tabwidget.addTab(self.tab3, "Hop-Plot")
+
+        # Diagramm-Artists werden pro Datenversion zwischengespeichert
+        self.chart1 = BlittedBarChart(self.fig1, self.canvas1)
+        self.chart2 = BlittedBarChart(self.fig2, self.canvas2)
+
         self.diag_tabwidget.currentChanged.connect(self.on_diagram_tab_changed)
 
     
@@ -156,18 +322,19 @@ class DatasetAnalysisTab(QWidget):
 
         # Metrik-Definitionen
 
-        # Diagramm 1 ([0..1]) hat 13 Metriken
+        # Diagramm 1 ([0..1]) hat 14 Metriken
         self.metrics_diagram1 = [
             "is_connected_avg", "density_avg", "is_tree_avg", "is_forest_avg",
             "is_bipartite_avg", "is_planar_avg", "is_multigraph_avg",
             "global_efficiency", "local_efficiency",
             "degree_centrality", "betweenness_centrality",
-            "closeness_centrality", "pagerank"
+            "closeness_centrality", "pagerank", "approx_global_efficiency"
         ]
-        # Diagramm 2 (Reelle Zahlen) hat 6 Metriken
+        # Diagramm 2 (Reelle Zahlen) hat 8 Metriken
         self.metrics_diagram2 = [
             "node_connectivity", "edge_connectivity",
-            "diameter", "radius", "number_of_nodes", "number_of_edges"
+            "diameter", "radius", "number_of_nodes", "number_of_edges",
+            "effective_diameter", "average_distance"
         ]
 
         # Standard-Auswahl
@@ -186,17 +353,51 @@ class DatasetAnalysisTab(QWidget):
         self.last_results = []  # Kann mehrere Zeilen enthalten, wenn Alle gewählt
         self.single_row_mode = True  # True = nur 1 Datensatz, False = mehrere
 
+        # Abfrage-Cache pro Datensatz: Quelle -> (Datenversion, Zeilen)
+        self.query_cache = {}
+        self.results_key = None
+        self._pending_query = None
+        # Hop-Plots pro Datensatz: Quelle -> (Datenversion, Zeilen)
+        self.hop_cache = {}
+        self.hop_rows = []
+        self.hop_key = None
+        self.hop_plot_key = None
+
         # Beim Start
         self.on_diagram_tab_changed(0)
 
     #   DB-Abfrage (Single und Alle)
     def load_analysis(self):
         selected_source = self.dataset_combo.currentText()
+        try:
+            version = get_data_version(DATABASE_PATH)
+        except sqlite3.Error:
+            version = None
+
+        # Unveränderte Daten: zwischengespeichertes Ergebnis ohne erneute Abfrage verwenden
+        self.load_hop_plots(selected_source, version)
+
+        cached = self.query_cache.get(selected_source)
+        if version is not None and cached and cached[0] == version:
+            self._pending_query = (selected_source, version)
+            if selected_source == "Alle":
+                self.on_results_ready_all(cached[1])
+            else:
+                self.on_results_ready_single(cached[1])
+            return
+
+        self._pending_query = (selected_source, version)
         if selected_source == "Alle":
             self.load_all_datasets_grouped()
         else:
             self.load_single_dataset(selected_source)
 
+    def _remember_results(self, rows):
+        source, version = self._pending_query or (self.dataset_combo.currentText(), None)
+        if version is not None:
+            self.query_cache[source] = (version, rows)
+        self.results_key = (source, version)
+
     def load_all_datasets_grouped(self):
         query = """
         SELECT
@@ -227,7 +428,11 @@ class DatasetAnalysisTab(QWidget):
           SUM(CAST(is_forest AS INT)) as forest_count,
           SUM(CAST(is_bipartite AS INT)) as bipartite_count,
           SUM(CAST(is_multigraph AS INT)) as multigraph_count,
-          SUM(CAST(is_planar AS INT)) as planar_count
+          SUM(CAST(is_planar AS INT)) as planar_count,
+
+          AVG(effective_diameter) as effective_diameter,
+          AVG(average_distance) as average_distance,
+          AVG(approx_global_efficiency) as approx_global_efficiency
         FROM analysis_results
         GROUP BY Project_name
         """
@@ -240,6 +445,7 @@ class DatasetAnalysisTab(QWidget):
         if not rows:
             QMessageBox.information(self, "Info", "Keine Datensätze gefunden (Alle).")
             return
+        self._remember_results(rows)
         self.last_results = rows
         self.single_row_mode = False
         self.update_charts_all()
@@ -277,7 +483,12 @@ class DatasetAnalysisTab(QWidget):
             AVG(diameter) as diameter,
             AVG(radius) as radius,
             AVG(number_of_nodes) as number_of_nodes,
-            AVG(number_of_edges) as number_of_edges
+            AVG(number_of_edges) as number_of_edges,
+
+            /* Distanzverteilung (backend/hyperanf.py) */
+            AVG(effective_diameter) as effective_diameter,
+            AVG(average_distance) as average_distance,
+            AVG(approx_global_efficiency) as approx_global_efficiency
         FROM analysis_results
         WHERE Project_name = ?
         """
@@ -291,6 +502,7 @@ class DatasetAnalysisTab(QWidget):
             QMessageBox.information(self, "Info", "Keine Daten gefunden.")
             return
 
+        self._remember_results(rows)
         row = rows[0]
         safe = lambda x: x if x is not None else 0
         self.single_row_mode = True
@@ -322,6 +534,10 @@ class DatasetAnalysisTab(QWidget):
             "radius":             safe(row[22]),
             "number_of_nodes":    safe(row[23]),
             "number_of_edges":    safe(row[24]),
+
+            "effective_diameter": safe(row[25]),
+            "average_distance":   safe(row[26]),
+            "approx_global_efficiency": safe(row[27]),
         }]
         self.update_charts_single()
         # Interpretation Methoden entfernt auch hier 
@@ -335,57 +551,37 @@ class DatasetAnalysisTab(QWidget):
         if not self.last_results:
             return
         single_dict = self.last_results[0]
+        key = ("single", self.results_key)
 
         current_tab = self.diag_tabwidget.currentIndex()
         if current_tab == 0:
             # Diagramm 1 ([0..1]) => grünes Balkendiagramm
-            self.fig1.clear()
-            ax1 = self.fig1.add_subplot(111)
-
-            selected = self.selected_metrics_diagram1
-            data_dict = {m: single_dict[m] for m in selected if m in single_dict}
-
-            names = list(data_dict.keys())
-            values = list(data_dict.values())
-
-            ax1.bar(names, values, color='green')
-            ax1.set_title("Diagramm [0..1] (Ein Datensatz)")
-            ax1.set_ylabel("Wert")
-            ax1.set_xticks(range(len(names)))
-            ax1.set_xticklabels(names, rotation=45, ha="right")
-
-            self.fig1.tight_layout()
-            self.canvas1.draw()
+            if self.chart1.key != key:
+                self.chart1.build_single(
+                    key, self.metrics_diagram1,
+                    [single_dict.get(m, 0) for m in self.metrics_diagram1],
+                    'green', "Diagramm [0..1] (Ein Datensatz)", "Wert"
+                )
+            self.chart1.show_metrics(self.selected_metrics_diagram1)
         else:
             # Diagramm 2 (Reelle Zahlen) => blaues Balkendiagramm
-            self.fig2.clear()
-            ax2 = self.fig2.add_subplot(111)
-
-            selected = self.selected_metrics_diagram2
-            data_dict = {m: single_dict[m] for m in selected if m in single_dict}
-
-            names = list(data_dict.keys())
-            values = list(data_dict.values())
-
-            ax2.bar(names, values, color='blue')
-            ax2.set_title("Diagramm (Reelle Zahlen) (Ein Datensatz)")
-            ax2.set_ylabel("Wert")
-            ax2.set_xticks(range(len(names)))
-            ax2.set_xticklabels(names, rotation=45, ha="right")
-
-            self.fig2.tight_layout()
-            self.canvas2.draw()
+            if self.chart2.key != key:
+                self.chart2.build_single(
+                    key, self.metrics_diagram2,
+                    [single_dict.get(m, 0) for m in self.metrics_diagram2],
+                    'blue', "Diagramm (Reelle Zahlen) (Ein Datensatz)", "Wert"
+                )
+            self.chart2.show_metrics(self.selected_metrics_diagram2)
 
     def update_charts_all(self):
         if not self.last_results:
             return
+        key = ("all", self.results_key)
+        project_names = [row[0] for row in self.last_results]
 
         current_tab = self.diag_tabwidget.currentIndex()
         if current_tab == 0:
             # Diagramm 1 ([0..1])
-            self.fig1.clear()
-            ax1 = self.fig1.add_subplot(111)
-
             metric_map = {
                 "is_connected_avg":       1,
                 "density_avg":            2,
@@ -400,36 +596,21 @@ class DatasetAnalysisTab(QWidget):
                 "betweenness_centrality": 11,
                 "closeness_centrality":   12,
                 "pagerank":               13,
+                "approx_global_efficiency": 28,
             }
-            project_names = [row[0] for row in self.last_results]
-            x = np.arange(len(project_names))
-
-            selected = sorted(m for m in self.selected_metrics_diagram1 if m in metric_map)
-            bar_width = 0.08
-            color_map = self.get_color_map(selected)
-
-            for i, metric in enumerate(selected):
-                offset = i * bar_width
-                col_idx = metric_map[metric]
-                values = [row[col_idx] if row[col_idx] else 0 for row in self.last_results]
-                ax1.bar(x + offset, values, bar_width, label=metric, color=color_map[metric])
-
-            ax1.set_xticks(x + bar_width*(len(selected)-1)/2 if selected else 0)
-            ax1.set_xticklabels(project_names, rotation=45, ha="right")
-            ax1.set_xlabel("Datensätze")
-            ax1.set_ylabel("Wert (0..1)")
-            ax1.set_title("Gruppierte Diagramme (Alle) [0..1]")
-
-            if selected:
-                ax1.legend(title="Metriken")
-
-            self.fig1.tight_layout()
-            self.canvas1.draw()
+            if self.chart1.key != key:
+                metrics = sorted(metric_map)
+                values = {
+                    m: [row[idx] if row[idx] else 0 for row in self.last_results]
+                    for m, idx in metric_map.items()
+                }
+                self.chart1.build_grouped(
+                    key, project_names, metrics, values, self.get_color_map(metrics), 0.08,
+                    "Gruppierte Diagramme (Alle) [0..1]", "Datensätze", "Wert (0..1)"
+                )
+            self.chart1.show_metrics(self.selected_metrics_diagram1)
         else:
             # Diagramm 2 (Reelle Zahlen)
-            self.fig2.clear()
-            ax2 = self.fig2.add_subplot(111)
-
             metric_map = {
                 "node_connectivity": 14,
                 "edge_connectivity": 15,
@@ -437,42 +618,118 @@ class DatasetAnalysisTab(QWidget):
                 "radius":            17,
                 "number_of_nodes":   18,
                 "number_of_edges":   19,
+                "effective_diameter": 26,
+                "average_distance":  27,
             }
-            project_names = [row[0] for row in self.last_results]
-            x = np.arange(len(project_names))
-
-            selected = sorted(m for m in self.selected_metrics_diagram2 if m in metric_map)
-            bar_width = 0.12
-            color_map = self.get_color_map(selected)
-
-            for i, metric in enumerate(selected):
-                offset = i * bar_width
-                col_idx = metric_map[metric]
-                values = [row[col_idx] if row[col_idx] else 0 for row in self.last_results]
-                ax2.bar(x + offset, values, bar_width, label=metric, color=color_map[metric])
-
-            ax2.set_xticks(x + bar_width*(len(selected)-1)/2 if selected else 0)
-            ax2.set_xticklabels(project_names, rotation=45, ha="right")
-            ax2.set_xlabel("Datensätze")
-            ax2.set_ylabel("Wert")
-            ax2.set_title("Gruppierte Diagramme (Alle) (Reelle Zahlen)")
-
-            if selected:
-                ax2.legend(title="Metriken")
+            if self.chart2.key != key:
+                metrics = sorted(metric_map)
+                values = {
+                    m: [row[idx] if row[idx] else 0 for row in self.last_results]
+                    for m, idx in metric_map.items()
+                }
+                self.chart2.build_grouped(
+                    key, project_names, metrics, values, self.get_color_map(metrics), 0.12,
+                    "Gruppierte Diagramme (Alle) (Reelle Zahlen)", "Datensätze", "Wert"
+                )
+            self.chart2.show_metrics(self.selected_metrics_diagram2)
 
-            self.fig2.tight_layout()
-            self.canvas2.draw()
+    # Hop-Plot (Distanzverteilung, backend/hyperanf.py)
+    def load_hop_plots(self, source, version):
+        """
+        Lädt die gespeicherten Hop-Plots der gewählten Datenquelle (bzw. aller) im Hintergrund.
+        """
+        cached = self.hop_cache.get(source)
+        if version is not None and cached and cached[0] == version:
+            self.on_hop_plots_ready(cached[1], (source, version))
+            return
+        query = """
+        SELECT Project_name, hop_plot, hop_plot_error
+        FROM analysis_results
+        WHERE hop_plot IS NOT NULL
+        """
+        params = []
+        if source != "Alle":
+            query += " AND Project_name = ?"
+            params = [source]
+        self.hop_worker = DatabaseWorker(query, params)
+        self.hop_worker.results_ready.connect(lambda rows: self.on_hop_plots_ready(rows, (source, version)))
+        self.hop_worker.error_occurred.connect(self.on_error)
+        self.hop_worker.start()
+
+    def on_hop_plots_ready(self, rows, key):
+        source, version = key
+        if version is not None:
+            self.hop_cache[source] = (version, rows)
+        self.hop_rows = rows
+        self.hop_key = key
+        if self.diag_tabwidget.currentIndex() == 2:
+            self.update_hop_plot()
+
+    def update_hop_plot(self):
+        """
+        Eine Kurve je Datensatz: mittlerer Anteil der erreichbaren Knotenpaare mit Distanz ≤ t,
+        mit Band für den relativen Standardfehler der Schätzung (HyperANF).
+        """
+        if self.hop_plot_key == self.hop_key:
+            return
+        self.hop_plot_key = self.hop_key
+        curves = {}
+        for project, hop_plot, error in self.hop_rows:
+            try:
+                pairs = np.asarray(json.loads(hop_plot), dtype=float)
+            except (TypeError, ValueError):
+                continue
+            if len(pairs) < 2 or pairs[-1] <= 0:
+                continue
+            curves.setdefault(project, []).append((pairs / pairs[-1], error or 0.0))
+
+        self.fig3.clear()
+        ax = self.fig3.add_subplot(111)
+        ax.set_title("Hop-Plot (Anteil erreichbarer Paare)")
+        ax.set_xlabel("Hops t")
+        ax.set_ylabel("Anteil der Paare mit Distanz ≤ t")
+        colors = self.get_color_map(sorted(curves))
+        for project, entries in sorted(curves.items()):
+            length = max(len(fractions) for fractions, _ in entries)
+            fractions = np.array([np.pad(f, (0, length - len(f)), constant_values=1.0) for f, _ in entries])
+            mean = fractions.mean(axis=0)
+            error = np.mean([e for _, e in entries])
+            hops = np.arange(length)
+            ax.plot(hops, mean, marker="o", markersize=3, color=colors[project],
+                    label=f"{project} ({len(entries)})")
+            if error > 0:
+                ax.fill_between(hops, mean * (1 - error), np.minimum(mean * (1 + error), 1.0),
+                                color=colors[project], alpha=0.2)
+        # Effektiver Durchmesser: 90 % der Paare
+        ax.axhline(0.9, color="gray", linestyle="--", linewidth=0.8)
+        ax.set_ylim(0, 1.05)
+        if curves:
+            ax.legend(title="Datensätze")
+        self.fig3.tight_layout()
+        self.canvas3.draw()
 
     # Dynamische Metrik-Liste
     def on_diagram_tab_changed(self, index):
         self.rebuild_metric_menu(index)
-        if self.dataset_combo.currentText() == "Alle":
-            self.update_charts_all()
-        else:
+        self.refresh_charts()
+
+    def refresh_charts(self):
+        """
+        Zeigt die Diagramme der zuletzt geladenen Daten; aufgebaut wird nur bei neuer Datenversion.
+        """
+        if self.diag_tabwidget.currentIndex() == 2:
+            self.update_hop_plot()
+        elif self.single_row_mode:
             self.update_charts_single()
+        else:
+            self.update_charts_all()
 
     def rebuild_metric_menu(self, diagram_index):
         self.metric_menu.clear()
+        # Der Hop-Plot hat keine Metrikauswahl
+        self.metric_button.setEnabled(diagram_index != 2)
+        if diagram_index == 2:
+            return
 
         if diagram_index == 0:
             metrics = self.metrics_diagram1
@@ -501,30 +758,20 @@ class DatasetAnalysisTab(QWidget):
             else:
                 self.selected_metrics_diagram2.discard(metric)
 
-        if self.dataset_combo.currentText() == "Alle":
-            self.update_charts_all()
-            # Interpretation-Aufruf entfernt hier auc
-        else:
-            self.update_charts_single()
-            # Interpretation-Aufruf entfernt ****
+        self.refresh_charts()
 
     def on_reset_metrics(self):
         self.selected_metrics_diagram1 = set(self.default_selected_diagram1)
         self.selected_metrics_diagram2 = set(self.default_selected_diagram2)
+ 
         self.rebuild_metric_menu(self.diag_tabwidget.currentIndex())
-
-        if self.dataset_combo.currentText() == "Alle":
-            self.update_charts_all()
-            # Interpretation-Aufruf entfernt hier 
-        else:
-            self.update_charts_single()
-            # Interpretation-Aufruf entfernt hier 
+        self.refresh_charts()
 
     # Farbcodierung
     def get_color_map(self, metrics):
         colors = [
             "red", "orange", "gold", "green", "cyan", "blue", "purple", 
-            "magenta", "pink", "lime", "chocolate", "gray", "olive",
+            "magenta", "pink", "lime", "chocolate", "gray", "olive", "teal",
         ]
         color_map = {}
         for i, m in enumerate(metrics):
@@ -577,6 +824,9 @@ class DatasetAnalysisTab(QWidget):
                     d["bipartite_count"]   = row[23]
                     d["multigraph_count"]  = row[24]
                     d["planar_count"]      = row[25]
+                    d["effective_diameter"] = row[26]
+                    d["average_distance"]  = row[27]
+                    d["approx_global_efficiency"] = row[28]
                     output.append(d)
 
                 data = {
@@ -604,6 +854,10 @@ class DatasetAnalysisTab(QWidget):
             if hasattr(self, 'canvas2') and self.canvas2:
                 pixmap2 = self.canvas2.grab()
                 images.append(pixmap2.toImage())
+            # Export Hop-Plot
+            if hasattr(self, 'canvas3') and self.canvas3:
+                pixmap3 = self.canvas3.grab()
+                images.append(pixmap3.toImage())
         except Exception as e:
             print("Fehler beim Exportieren der Bilder:", e)
         return images
@@ -617,7 +871,7 @@ class DatasetAnalysisTab(QWidget):
         if action == save_act:
             # bestimme, welches Bild gespeichert werden soll
             images = self.get_generated_images()
-            img = images[0] if canvas is self.canvas1 else images[1]
+            img = images[[self.canvas1, self.canvas2, self.canvas3].index(canvas)]
             if img:
                 fname, _ = QFileDialog.getSaveFileName(
                     self,
@@ -1,11 +1,59 @@
 import os
 import json
 import datetime
-from PyQt5.QtWidgets import QToolBar, QAction, QFileDialog, QMessageBox, QMenu, QToolButton
+from PyQt5.QtWidgets import QToolBar, QAction, QFileDialog, QMessageBox, QMenu, QToolButton, QLabel
 from PyQt5.QtGui import QImage
-from PyQt5.QtCore import QSize
+from PyQt5.QtCore import QSize, QThread, pyqtSignal, QSettings
 
-from backend.export_handler import fetch_dataset
+from backend.export_handler import fetch_dataset, DATABASE_PATH
+
+
+class ThumbnailThread(QThread):
+    """
+    Rendert die Vorschaubilder aller analysierten Graphen im Hintergrund.
+    """
+    finished_summary = pyqtSignal(dict)
+
+    def run(self):
+        from backend.thumbnail_renderer import render_all_thumbnails
+        try:
+            summary = render_all_thumbnails(DATABASE_PATH)
+        except Exception as e:
+            print("Fehler beim Erzeugen der Vorschaubilder:", e)
+            summary = {"error": str(e)}
+        self.finished_summary.emit(summary)
+
+
+class WatchThread(QThread):
+    """
+    Führt die Ordnerüberwachung (backend.watcher) im Hintergrund aus.
+    """
+    queue_changed = pyqtSignal(int)
+    file_event = pyqtSignal(dict)
+
+    def __init__(self, directories):
+        super().__init__()
+        self.directories = directories
+        self.watcher = None
+        self._stopped = False
+
+    def run(self):
+        from backend.watcher import FolderWatcher
+        try:
+            self.watcher = FolderWatcher(
+                self.directories, DATABASE_PATH,
+                progress_callback=self.file_event.emit,
+                queue_callback=self.queue_changed.emit,
+            )
+            if not self._stopped:
+                self.watcher.run()
+        except Exception as e:
+            print("Fehler in der Ordnerüberwachung:", e)
+
+    def stop(self):
+        self._stopped = True
+        if self.watcher is not None:
+            self.watcher.stop()
 
 
 class Toolbar(QToolBar):
@@ -42,6 +90,21 @@ class Toolbar(QToolBar):
         self.export_images_action.triggered.connect(self.export_images)
         self.addAction(self.export_images_action)
 
+        # Vorschaubilder für alle analysierten Graphen erzeugen (headless, parallel)
+        self.thumbnails_action = QAction("🖼 Vorschaubilder erzeugen", self)
+        self.thumbnails_action.triggered.connect(self.generate_thumbnails)
+        self.addAction(self.thumbnails_action)
+        self.thumbnail_thread = None
+
+        # Ordner überwachen: neue/geänderte Dateien werden automatisch analysiert
+        self.watch_action = QAction("👁 Ordner überwachen", self)
+        self.watch_action.setCheckable(True)
+        self.watch_action.toggled.connect(self.toggle_watch)
+        self.addAction(self.watch_action)
+        self.watch_thread = None
+        self.stopping_watchers = []
+        self.queue_label = None
+
         # Theme-Auswahl 
         self.theme_action = QAction("🎨 Theme", self)
         theme_menu = QMenu()
@@ -121,8 +184,8 @@ class Toolbar(QToolBar):
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Exportiere Bilder aus dem DatasetAnalysisTab (auch Zeitstempel)
-        if hasattr(self.parent, "dataset_tab"):
-            dataset_tab = self.parent.dataset_tab
+        dataset_tab = getattr(self.parent, "dataset_tab", None)
+        if dataset_tab is not None:
             if hasattr(dataset_tab, "get_generated_images"):
                 images = dataset_tab.get_generated_images()
                 if images:
@@ -133,8 +196,8 @@ class Toolbar(QToolBar):
                             saved_images += 1
 
         # Exportiere das Visualisierungsbild aus dem SingleGraphTab
-        if hasattr(self.parent, "single_graph_tab"):
-            sg_tab = self.parent.single_graph_tab
+        sg_tab = getattr(self.parent, "single_graph_tab", None)
+        if sg_tab is not None:
             if hasattr(sg_tab, "visualization_section"):
                 viz_section = sg_tab.visualization_section
                 if hasattr(viz_section, "get_generated_image"):
@@ -156,6 +219,85 @@ class Toolbar(QToolBar):
             QMessageBox.warning(self, "Fehler", "Keine Bilder zum Speichern gefunden!")
 
 
+    def generate_thumbnails(self):
+        if self.thumbnail_thread and self.thumbnail_thread.isRunning():
+            return
+        self.thumbnails_action.setEnabled(False)
+        if hasattr(self.parent, "status_bar"):
+            self.parent.status_bar.showMessage("Vorschaubilder werden erzeugt...")
+        self.thumbnail_thread = ThumbnailThread()
+        self.thumbnail_thread.finished_summary.connect(self.on_thumbnails_finished)
+        self.thumbnail_thread.start()
+
+    def on_thumbnails_finished(self, summary):
+        self.thumbnails_action.setEnabled(True)
+        if "error" in summary:
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Erzeugen der Vorschaubilder: {summary['error']}")
+            return
+        if hasattr(self.parent, "status_bar"):
+            self.parent.status_bar.showMessage(
+                f"Vorschaubilder: {summary['rendered']} erzeugt, {summary['skipped']} unverändert, "
+                f"{summary['failed']} fehlgeschlagen."
+            )
+        if getattr(self.parent, "single_graph_tab", None) is not None:
+            self.parent.single_graph_tab.analysis_section.load_analysis_results()
+
+    def toggle_watch(self, checked):
+        if checked:
+            self.start_watch()
+        else:
+            self.stop_watch()
+
+    def start_watch(self):
+        settings = QSettings("MyCompany", "MyApp")
+        last_directory = settings.value("watch_directory", "")
+        directory = QFileDialog.getExistingDirectory(self, "Zu überwachenden Ordner auswählen", last_directory)
+        if not directory:
+            self.watch_action.setChecked(False)
+            return
+        settings.setValue("watch_directory", directory)
+
+        if self.queue_label is None and hasattr(self.parent, "status_bar"):
+            self.queue_label = QLabel()
+            self.parent.status_bar.addPermanentWidget(self.queue_label)
+        self.on_watch_queue_changed(0)
+
+        self.watch_thread = WatchThread([directory])
+        self.watch_thread.queue_changed.connect(self.on_watch_queue_changed)
+        self.watch_thread.file_event.connect(self.on_watch_file_event)
+        self.watch_thread.start()
+        if hasattr(self.parent, "status_bar"):
+            self.parent.status_bar.showMessage(f"Überwache {directory}")
+
+    def stop_watch(self):
+        if self.watch_thread is not None:
+            # Nicht blockieren: ein laufender Stapel wird noch abgeschlossen
+            thread = self.watch_thread
+            thread.stop()
+            self.stopping_watchers.append(thread)
+            thread.finished.connect(lambda: self.stopping_watchers.remove(thread))
+            self.watch_thread = None
+        if self.queue_label is not None:
+            self.queue_label.setText("")
+        if hasattr(self.parent, "status_bar"):
+            self.parent.status_bar.showMessage("Ordnerüberwachung beendet.")
+
+    def on_watch_queue_changed(self, depth):
+        if self.queue_label is not None:
+            self.queue_label.setText(f"👁 Warteschlange: {depth}")
+
+    def on_watch_file_event(self, event):
+        if event["event"] != "finished":
+            return
+        name = os.path.basename(event["file_path"])
+        if hasattr(self.parent, "status_bar"):
+            if event["status"] == "ok":
+                self.parent.status_bar.showMessage(f"Automatisch analysiert: {name}")
+            else:
+                self.parent.status_bar.showMessage(f"Fehler bei {name}: {event['error']}")
+        if event["status"] == "ok" and getattr(self.parent, "single_graph_tab", None) is not None:
+            self.parent.single_graph_tab.analysis_section.append_new_results()
+
     def apply_dark_mode(self):
         self.parent.apply_theme("dark")
 
@@ -1,13 +1,20 @@
 import os
-import shutil
 from PyQt5.QtWidgets import (
     QWidget, QPushButton, QLabel, QVBoxLayout, QFileDialog, QHBoxLayout,
     QTableWidget, QTableWidgetItem, QHeaderView, QMenu
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from backend import pipeline
+from PyQt5.QtCore import Qt, QTimer
+from backend.staging import stage_file
+from backend.archives import is_archive
+from backend.export_handler import DATABASE_PATH
+from backend import job_queue, catalog
+
+# Abfrageintervall (ms) für den Zustand der eingereihten Jobs
+JOB_POLL_INTERVAL = 500
 
 def guess_data_source_by_extension(filename):
+    if is_archive(filename):
+        return "Archiv"
     ext = os.path.splitext(filename)[1].lower()
     mapping = {
         ".graphml": "TopologyZoo",
@@ -17,17 +24,6 @@ def guess_data_source_by_extension(filename):
     }
     return mapping.get(ext, "Unbekannt")
 
-class AnalysisThread(QThread):
-    finished = pyqtSignal()
-
-    def __init__(self, file_paths):
-        super().__init__()
-        self.file_paths = file_paths
-
-    def run(self):
-        pipeline.process_files(self.file_paths)
-        self.finished.emit()
-
 class UploadPanel(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -69,8 +65,8 @@ class UploadPanel(QWidget):
         self.content_layout.addWidget(self.status_label)
 
         self.files_table = QTableWidget()
-        self.files_table.setColumnCount(3)
-        self.files_table.setHorizontalHeaderLabels(["Dateiname", "Quelle", "Status"])
+        self.files_table.setColumnCount(4)
+        self.files_table.setHorizontalHeaderLabels(["Dateiname", "Quelle", "Status", "Größe"])
         header = self.files_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.setDefaultSectionSize(102)
@@ -98,6 +94,16 @@ class UploadPanel(QWidget):
 
         self.update_overlay_visibility()
 
+        # Analysen laufen über die persistente Job-Queue in eigenen Worker-Prozessen
+        self.worker_pool = job_queue.WorkerPool(DATABASE_PATH)
+        self.batch_jobs = {}     # Job-ID -> Dateipfad des laufenden Stapels
+        self.job_states = {}     # Job-ID -> zuletzt angezeigter Zustand
+        self.job_timer = QTimer(self)
+        self.job_timer.setInterval(JOB_POLL_INTERVAL)
+        self.job_timer.timeout.connect(self.poll_jobs)
+        # Nach einem Neustart liegengebliebene Jobs weiter abarbeiten
+        QTimer.singleShot(1000, self.resume_queue)
+
     def toggle_panel(self):
         if self.parent and hasattr(self.parent, "handle_toggle_sidebar"):
             self.parent.handle_toggle_sidebar()
@@ -107,30 +113,65 @@ class UploadPanel(QWidget):
     def upload_files(self):
         files, _ = QFileDialog.getOpenFileNames(
             self, "Dateien auswählen", "",
-            "Unterstützte Dateien (*.graphml *.xml *.cch *.txt);;Alle Dateien (*)"
+            "Unterstützte Dateien (*.graphml *.xml *.cch *.txt *.zip *.tar.gz *.tgz *.tar.bz2 *.tbz2);;Alle Dateien (*)"
         )
         if files:
-            destination_folder = "temp_uploads"
-            if not os.path.exists(destination_folder):
-                os.makedirs(destination_folder)
+            deduplicated = 0
             for file_path in files:
                 base_name = os.path.basename(file_path)
-                destination_path = os.path.join(destination_folder, base_name)
                 try:
-                    shutil.copy(file_path, destination_path)
-                    self.uploaded_files.append(destination_path)
-                    guessed_source = guess_data_source_by_extension(base_name)
-                    self.add_file_to_table(base_name, guessed_source, "Bereit")
+                    if self.stage_upload(file_path)["deduplicated"]:
+                        deduplicated += 1
                 except Exception as e:
-                    self.status_label.setText(f"⚠ Fehler beim Kopieren von {base_name}: {e}")
+                    self.status_label.setText(f"⚠ Fehler beim Bereitstellen von {base_name}: {e}")
                     return
-            self.status_label.setText(f"✅ {len(files)} Datei(en) erfolgreich gespeichert.")
+            message = f"✅ {len(files)} Datei(en) erfolgreich gespeichert."
+            if deduplicated:
+                message += f" ({deduplicated} bereits vorhanden)"
+            self.status_label.setText(message)
             self.update_overlay_visibility() 
 
-    def add_file_to_table(self, filename, source, status):
+    def stage_upload(self, src):
+        """
+        Stellt eine Datei inhaltsadressiert in temp_uploads/ bereit (eigene Kopie bzw.
+        Reflink, gleiche Inhalte nur einmal) und trägt sie in die Tabelle ein.
+        """
+        staged = stage_file(src, DATABASE_PATH)
+        path = staged["path"]
+        if path not in self.uploaded_files:
+            self.uploaded_files.append(path)
+        if self.find_file_row(path) < 0:
+            name = os.path.basename(path)
+            self.add_file_to_table(name, guess_data_source_by_extension(name), "Bereit", path)
+            self.show_catalog_entry(path)
+        return staged
+
+    def show_catalog_entry(self, file_path):
+        """
+        Erfasst Knoten- und Kantenzahl der Datei im Katalog (schnelles Zählen, ohne den
+        Graphen aufzubauen) und zeigt sie in der Spalte "Größe" an.
+        """
+        row = self.find_file_row(file_path)
+        if row < 0:
+            return
+        try:
+            entry = catalog.scan_file(DATABASE_PATH, file_path)
+        except Exception as e:
+            item = QTableWidgetItem("–")
+            item.setToolTip(f"Datei konnte nicht erfasst werden: {e}")
+            self.files_table.setItem(row, 3, item)
+            return
+        item = QTableWidgetItem(catalog.describe(entry))
+        item.setToolTip(f"{entry['format']}, {entry['size']:,} Bytes".replace(",", "."))
+        self.files_table.setItem(row, 3, item)
+
+    def add_file_to_table(self, filename, source, status, file_path=None):
         row = self.files_table.rowCount()
         self.files_table.insertRow(row)
-        self.files_table.setItem(row, 0, QTableWidgetItem(filename))
+        name_item = QTableWidgetItem(filename)
+        # Vollständiger Pfad, um Pipeline-Ereignisse der richtigen Zeile zuzuordnen
+        name_item.setData(Qt.UserRole, file_path)
+        self.files_table.setItem(row, 0, name_item)
         self.files_table.setItem(row, 1, QTableWidgetItem(source))
         self.files_table.setItem(row, 2, QTableWidgetItem(status))
         self.update_overlay_visibility() 
@@ -139,38 +180,165 @@ class UploadPanel(QWidget):
         if not self.uploaded_files:
             self.status_label.setText("⚠ Keine Datei hochgeladen!")
             return
+        batch = list(self.uploaded_files)
+        for file_path in batch:
+            self.set_file_status(file_path, "⏳ wartet")
+        # Interaktiv gestartete Dateien werden vor laufenden Stapeln (z. B. CLI) bearbeitet
+        job_ids = job_queue.enqueue_files(DATABASE_PATH, batch, priority=job_queue.INTERACTIVE_PRIORITY)
+        if not self.batch_jobs:
+            self.batch_done = 0
+            self.batch_failed = 0
+            self.archive_done = {}
+            self.archive_failed = {}
+        self.batch_jobs.update(zip(job_ids, batch))
+        self.uploaded_files = [p for p in self.uploaded_files if p not in batch]
+        self.worker_pool.start()
+        self.job_timer.start()
+        self.status_label.setText(f"🔍 Analyse gestartet (0/{len(self.batch_jobs)})...")
+
+    def resume_queue(self):
+        """
+        Startet die Worker, falls in der Queue noch wartende oder abgebrochene Jobs liegen.
+        """
+        job_queue.requeue_expired(DATABASE_PATH)
+        counts = job_queue.queue_counts(DATABASE_PATH)
+        pending = counts[job_queue.QUEUED] + counts[job_queue.RUNNING]
+        if pending:
+            self.worker_pool.start()
+            self.status_label.setText(f"🔄 {pending} Job(s) aus der letzten Sitzung werden fortgesetzt.")
+
+    def poll_jobs(self):
+        """
+        Liest den Zustand der Jobs des laufenden Stapels und übersetzt Änderungen in
+        Pipeline-Ereignisse für on_file_event.
+        """
+        jobs = job_queue.get_jobs(DATABASE_PATH, self.batch_jobs)
+        total = len(self.batch_jobs)
+        finished = sum(job["state"] in (job_queue.DONE, job_queue.FAILED) for job in jobs.values())
+        for job_id, job in jobs.items():
+            file_path = self.batch_jobs[job_id]
+            state = job["state"]
+            if is_archive(file_path):
+                self.update_archive_progress(file_path, job)
+            if self.job_states.get(job_id) == state:
+                continue
+            self.job_states[job_id] = state
+            if state == job_queue.RUNNING:
+                self.on_file_event({"event": "started", "file_path": file_path})
+            elif state == job_queue.QUEUED and job["attempts"]:
+                self.set_file_status(file_path, f"⏳ erneuter Versuch {job['attempts'] + 1}/{job['max_attempts']}",
+                                     job["error"])
+            elif state == job_queue.QUEUED and job["converted_file"]:
+                # Großer Graph: Metriken laufen als Teil-Jobs auf mehreren Workern
+                self.set_file_status(file_path, "🔀 Metriken werden parallel berechnet...")
+            elif state in (job_queue.DONE, job_queue.FAILED):
+                self.on_file_event({
+                    "event": "finished", "file_path": file_path, "index": finished - 1, "total": total,
+                    "status": "ok" if state == job_queue.DONE else "error", "error": job["error"],
+                    "convert_seconds": job["convert_seconds"] or 0.0,
+                    "analysis_seconds": job["analysis_seconds"] or 0.0,
+                })
+
+        if finished == total:
+            self.analysis_finished()
+        elif not self.worker_pool.is_running():
+            # Worker beendet, obwohl Jobs offen sind (z. B. Wartezeit vor erneutem Versuch)
+            self.worker_pool.start()
+
+    def update_archive_progress(self, archive_path, job):
+        done, failed = job["progress_done"] or 0, job["progress_failed"] or 0
+        if (done, failed) == (self.archive_done.get(archive_path, 0), self.archive_failed.get(archive_path, 0)):
+            return
+        self.archive_done[archive_path] = done
+        self.archive_failed[archive_path] = failed
+        if job["state"] == job_queue.RUNNING:
+            self.set_file_status(archive_path, f"🔄 {done + failed} Dateien ({failed} Fehler)")
+        if getattr(self.parent, "single_graph_tab", None) is not None:
+            self.parent.single_graph_tab.analysis_section.append_new_results()
+
+    def shutdown_workers(self):
+        """
+        Beendet die Worker beim Schließen; abgebrochene Jobs bleiben in der Queue
+        und werden beim nächsten Start fortgesetzt.
+        """
+        self.job_timer.stop()
+        self.worker_pool.stop()
+
+    def find_file_row(self, file_path):
         for row in range(self.files_table.rowCount()):
-            self.files_table.setItem(row, 2, QTableWidgetItem("🔄 in Analyse..."))
-        self.analysis_thread = AnalysisThread(self.uploaded_files)
-        self.analysis_thread.finished.connect(self.analysis_finished)
-        self.analysis_thread.start()
-        self.status_label.setText("🔍 Analyse gestartet...")
+            item = self.files_table.item(row, 0)
+            if item is not None and item.data(Qt.UserRole) == file_path:
+                return row
+        return -1
+
+    def set_file_status(self, file_path, status, tooltip=None):
+        row = self.find_file_row(file_path)
+        if row < 0:
+            return
+        item = QTableWidgetItem(status)
+        if tooltip:
+            item.setToolTip(tooltip)
+        self.files_table.setItem(row, 2, item)
+
+    def on_file_event(self, event):
+        """
+        Aktualisiert die Zeile der Datei und hängt neue Ergebnisse direkt an die Ergebnistabelle an.
+        """
+        file_path = event["file_path"]
+        if event["event"] == "started":
+            self.set_file_status(file_path, "🔄 in Analyse...")
+            return
+
+        seconds = event["convert_seconds"] + event["analysis_seconds"]
+        timing = (f"Konvertierung: {event['convert_seconds']:.2f} s, "
+                  f"Analyse: {event['analysis_seconds']:.2f} s")
+        if event["status"] == "ok" and is_archive(file_path):
+            self.batch_done += 1
+            done = self.archive_done.get(file_path, 0)
+            failed = self.archive_failed.get(file_path, 0)
+            self.set_file_status(file_path, f"✔️ {done} analysiert, {failed} Fehler ({seconds:.1f} s)", timing)
+        elif event["status"] == "ok":
+            self.batch_done += 1
+            self.set_file_status(file_path, f"✔️ analysiert ({seconds:.1f} s)", timing)
+        else:
+            self.batch_failed += 1
+            self.set_file_status(file_path, "⚠ Fehler", f"{event['error']}\n{timing}")
+
+        self.status_label.setText(
+            f"🔍 Analyse läuft: {event['index'] + 1}/{event['total']} verarbeitet"
+            + (f", {self.batch_failed} Fehler" if self.batch_failed else "")
+        )
+        if event["status"] == "ok" and getattr(self.parent, "single_graph_tab", None) is not None:
+            self.parent.single_graph_tab.analysis_section.append_new_results()
 
     def analysis_finished(self):
-        self.status_label.setText("✅ Analyse abgeschlossen!")
-        for row in range(self.files_table.rowCount()):
-            self.files_table.setItem(row, 2, QTableWidgetItem("✔️ analysiert"))
-        if hasattr(self.parent, "single_graph_tab") and hasattr(self.parent.single_graph_tab, "analysis_section"):
-            self.parent.single_graph_tab.analysis_section.load_analysis_results()
-        self.uploaded_files.clear()
+        from backend import scheduler
+
+        if self.batch_failed:
+            message = f"✅ Analyse abgeschlossen: {self.batch_done} analysiert, {self.batch_failed} fehlgeschlagen."
+        else:
+            message = "✅ Analyse abgeschlossen!"
+        self.status_label.setText(message)
+        # Vorhergesagte und tatsächliche Gesamtlaufzeit des Stapels (Kostenmodell des Schedulers)
+        report = scheduler.makespan_report(DATABASE_PATH, list(self.batch_jobs), self.worker_pool.workers)
+        if report:
+            print(scheduler.format_makespan(report))
+            self.status_label.setToolTip(scheduler.format_makespan(report))
+        self.job_timer.stop()
+        self.batch_jobs = {}
+        self.job_states = {}
 
     def handle_dropped_files(self, file_paths):
-        destination_folder = "temp_uploads"
-        os.makedirs(destination_folder, exist_ok=True)
         valid_files = []
 
         for src in file_paths:
             ext = os.path.splitext(src)[1].lower()
-            if ext not in self.allowed_extensions:
+            if ext not in self.allowed_extensions and not is_archive(src):
                 continue  
 
             name = os.path.basename(src)
-            dst = os.path.join(destination_folder, name)
             try:
-                shutil.copy(src, dst)
-                self.uploaded_files.append(dst)
-                quelle = guess_data_source_by_extension(name)
-                self.add_file_to_table(name, quelle, "Bereit")
+                self.stage_upload(src)
                 valid_files.append(name)
             except Exception as e:
                 self.status_label.setText(f"⚠ Fehler: {e}")
@@ -179,7 +347,7 @@ class UploadPanel(QWidget):
         if valid_files:
             self.status_label.setText(f"✅ {len(valid_files)} gültige Datei(en) bereit zur Analyse.")
         else:
-            self.status_label.setText("⚠ Keine gültigen Dateien (erlaubt: .graphml, .xml, .cch, .txt)")
+            self.status_label.setText("⚠ Keine gültigen Dateien (erlaubt: .graphml, .xml, .cch, .txt, .zip, .tar.gz, .tar.bz2)")
         
         self.update_overlay_visibility()
 
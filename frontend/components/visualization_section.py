@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 import networkx as nx
 import numpy as np
 
@@ -7,31 +8,31 @@ from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
 from PyQt5.QtGui import QImage
 
-from vispy import scene
+from vispy import app, scene
 from vispy.scene import visuals, cameras
 from vispy.scene import transforms
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QMenu, QFileDialog
+from PyQt5.QtWidgets import QMenu, QFileDialog, QInputDialog
+
+from backend.layouts import compute_layout, compute_geo_layout, compute_community_layout, geo_coverage, GEO_MIN_COVERAGE
+from backend.communities import node_communities
+from backend.adjacency_index import AdjacencyIndex, load_cached_index, build_cached_index
+from backend.archives import read_graph
+from backend.graph_sampling import (
+    top_k_nodes, ego_nodes, degree_preserving_sample, induced_subgraph,
+    FOCUS_NODE_THRESHOLD, FOCUS_MAX_NODES, FOCUS_EXPAND_LIMIT,
+)
 
 # Funktionen zum Einlesen der GraphML-Datei
 def load_graph(graphml_path):
     try:
-        G = nx.read_graphml(graphml_path)
+        G = read_graph(graphml_path)
         print(f"Graph geladen: {G.number_of_nodes()} Knoten, {G.number_of_edges()} Kanten")
         return G
     except Exception as e:
         print("Fehler beim Laden der GraphML-Datei:", e)
         return None
 
-#  Funktion zur Layout-Berechnung 
-def compute_layout(G, k=0.1, iterations=50):
-    try:
-        pos = nx.spring_layout(G, k=k, iterations=iterations)
-        return pos
-    except Exception as e:
-        print("Fehler bei der Layout-Berechnung:", e)
-        return None
-
 #  QThread für asynchrone Layout-Berechnung 
 class LayoutWorker(QThread):
     layout_ready = pyqtSignal(dict)
@@ -51,9 +52,31 @@ class LayoutWorker(QThread):
     def stop(self):
         self._stop_requested = True
 
-#  VisPy-Canvas mit permanenten Labels und Drag & Drop (optimiert) 
+#  Level-of-Detail-Parameter 
+# Zielzeit für eine LOD-Aktualisierung (Sekunden); wird sie überschritten,
+# wird die Detailstufe automatisch gröber eingestellt.
+LOD_FRAME_TIME_TARGET = 1 / 30
+# Minimaler mittlerer Bildschirmabstand (Pixel) zwischen sichtbaren Knoten,
+# ab dem alle sichtbaren Knoten beschriftet werden.
+LOD_LABEL_MIN_SPACING_PX = 60
+# Anzahl der wichtigsten Knoten, die bei zu dichter Ansicht beschriftet bleiben
+LOD_LABEL_TOP_K = 30
+# Ab dieser Kantenanzahl werden Kanten beim Herauszoomen aggregiert
+LOD_EDGE_THRESHOLD = 2000
+# Rasterweite (Pixel) für die Kantenaggregation
+LOD_EDGE_CELL_PX = 4
+
+# Farben der Communities (nach Größe; ab der zwölften Community wiederholt)
+COMMUNITY_COLORS = [
+    (0.12, 0.47, 0.71, 1.0), (1.00, 0.50, 0.05, 1.0), (0.17, 0.63, 0.17, 1.0), (0.84, 0.15, 0.16, 1.0),
+    (0.58, 0.40, 0.74, 1.0), (0.55, 0.34, 0.29, 1.0), (0.89, 0.47, 0.76, 1.0), (0.50, 0.50, 0.50, 1.0),
+    (0.74, 0.74, 0.13, 1.0), (0.09, 0.75, 0.81, 1.0), (0.68, 0.78, 0.91, 1.0), (1.00, 0.73, 0.47, 1.0),
+]
+
+
+#  VisPy-Canvas mit Level-of-Detail-Labels/Kanten und Drag & Drop (optimiert) 
 class NetworkCanvas(scene.SceneCanvas):
-    def __init__(self, G, pos, highlight_nodes=None, highlight_periphery=None, parent=None):
+    def __init__(self, G, pos, highlight_nodes=None, highlight_periphery=None, label_metric=None, parent=None):
         super().__init__(keys='interactive', show=True, parent=parent, bgcolor='white')
         self.unfreeze()
 
@@ -63,7 +86,23 @@ class NetworkCanvas(scene.SceneCanvas):
         self._node_list = list(G.nodes())
         self.highlight_nodes = set(highlight_nodes or [])
         self.highlight_periphery = set(highlight_periphery or [])
+        # Knoten -> Community; gesetzt, wenn nach Communities gefärbt wird (siehe set_communities)
+        self.communities = None
         self.picked_node = None
+        # Callback bei Doppelklick auf einen Knoten (z. B. Erweiterung in der Fokusansicht)
+        self.node_activated = None
+
+        # Level-of-Detail: Arrays für Positionen/Kanten, Label-Metrik, Qualitätsfaktor
+        self._positions = np.zeros((0, 2))
+        self._edge_index = np.zeros((0, 2), dtype=np.int64)
+        self._label_metric = label_metric
+        self._label_scores = np.zeros(0)
+        # Marker-Farben je Knotenposition (beim Ziehen wiederverwendet)
+        self._face_colors = []
+        self._lod_scale = 1.0
+        # Kamera-Änderungen werden gebündelt (höchstens eine Aktualisierung pro Frame-Zielzeit)
+        self._lod_timer = app.Timer(interval=LOD_FRAME_TIME_TARGET, connect=self._apply_lod,
+                                    iterations=1, start=False)
 
         # View & Camera (Zoom & Pan)
         self.view = self.central_widget.add_view()
@@ -73,6 +112,8 @@ class NetworkCanvas(scene.SceneCanvas):
 
         # Graph, Marker, Kanten, Labels initial zeichnen
         self._draw_graph()
+        # Kamera auf den gezeichneten Graphen ausrichten (Basis für das Label-/Kanten-Culling)
+        self.view.camera.set_range()
         # Legende einrichten
         # Node im Canvas-Raum (unabhängig von Pan/Zoom)
         self.legend_node = scene.Node(parent=self.scene)
@@ -87,6 +128,7 @@ class NetworkCanvas(scene.SceneCanvas):
         self.events.mouse_press.connect(self.on_mouse_press)
         self.events.mouse_move.connect(self.on_mouse_move)
         self.events.mouse_release.connect(self.on_mouse_release)
+        self.events.mouse_double_click.connect(self.on_mouse_double_click)
 
         self.freeze()
 
@@ -94,35 +136,20 @@ class NetworkCanvas(scene.SceneCanvas):
         nodes     = self._node_list
         positions = np.array([self._pos[n] for n in nodes])
 
-        # Marker-Farben
-        center_color    = (0.20, 0.60, 0.86, 1.0)  # Blau
-        periphery_color = (0.95, 0.61, 0.07, 1.0)  # Orange
-        default_color   = (0.56, 0.27, 0.68, 1.0)  # Purpur
-        colors = [
-            center_color    if n in self.highlight_nodes
-            else periphery_color if n in self.highlight_periphery
-            else default_color
-            for n in nodes
-        ]
-
         # Marker-Visual
         self.node_visual = visuals.Markers()
-        self.node_visual.set_data(positions, face_color=colors, size=10)
+        self._face_colors = self._node_colors(nodes)
+        self.node_visual.set_data(positions, face_color=self._face_colors, size=10)
         self.view.add(self.node_visual)
 
-        # Kanten-Visual
-        edge_lines = []
-        for u, v in self._G.edges():
-            edge_lines.extend([self._pos[u], self._pos[v], [np.nan, np.nan]])
-        self.edge_visual = visuals.Line(np.array(edge_lines), color='gray', width=2)
+        # Kanten-Visual (Segmente; Inhalt wird von _apply_lod gesetzt)
+        self.edge_visual = visuals.Line(color='gray', width=2, connect='segments')
         self.view.add(self.edge_visual)
 
-        # Ein einziges Text-Visual für alle Labels
-        labels    = [str(n) for n in nodes]
-        label_pos = positions + np.array([0.0, 0.04])
+        # Ein einziges Text-Visual für die sichtbaren Labels
         self.label_visual = visuals.Text(
-            text=labels,
-            pos=label_pos,
+            text=[""],
+            pos=np.zeros((1, 2)),
             color='black',
             font_size=10,
             anchor_x='center',
@@ -130,6 +157,12 @@ class NetworkCanvas(scene.SceneCanvas):
             parent=self.view.scene
         )
 
+        # LOD-Daten aufbauen und bei jeder Kamera-Änderung neu bewerten
+        self._prepare_lod_data()
+        self.camera.transform.changed.connect(self._schedule_lod)
+        self.events.resize.connect(self._schedule_lod)
+        self._apply_lod()
+
     def update_graph(self, G, pos):
         # Neue Daten übernehmen
         self._G = G
@@ -140,50 +173,195 @@ class NetworkCanvas(scene.SceneCanvas):
         positions = np.array([self._pos[n] for n in nodes])
 
         # Marker-Farben aktualisieren
+        self._face_colors = self._node_colors(nodes)
+        self.node_visual.set_data(positions, face_color=self._face_colors, size=10)
+
+        # Kanten und Labels gemäß aktueller Detailstufe aktualisieren
+        self._prepare_lod_data()
+        self._apply_lod()
+
+        self.update()
+
+    def _node_colors(self, nodes):
+        """
+        Marker-Farbe je Knoten: nach Community, falls gesetzt, sonst Zentrum/Peripherie/Standard.
+        """
+        if self.communities is not None:
+            return [COMMUNITY_COLORS[self.communities.get(n, 0) % len(COMMUNITY_COLORS)] for n in nodes]
         center_color    = (0.20, 0.60, 0.86, 1.0)  # Blau
         periphery_color = (0.95, 0.61, 0.07, 1.0)  # Orange
         default_color   = (0.56, 0.27, 0.68, 1.0)  # Purpur
-
-        colors = [
+        return [
             center_color    if n in self.highlight_nodes
             else periphery_color if n in self.highlight_periphery
             else default_color
             for n in nodes
         ]
-        self.node_visual.set_data(positions, face_color=colors, size=10)
 
-        # Kanten aktualisieren
-        edge_lines = []
-        for u, v in self._G.edges():
-            edge_lines.extend([self._pos[u], self._pos[v], [np.nan, np.nan]])
-        self.edge_visual.set_data(np.array(edge_lines))
+    def set_communities(self, communities):
+        """
+        Färbt die Knoten nach Community (dict Knoten -> Community). None = Standardfarben
+        mit Zentrum und Peripherie; deren Legende wird bei Community-Färbung ausgeblendet.
+        """
+        self.communities = communities
+        self.legend_node.visible = communities is None
+        self._face_colors = self._node_colors(self._node_list)
+        self.node_visual.set_data(self._positions, face_color=self._face_colors, size=10)
+        self.update()
+
+    def set_label_metric(self, values):
+        """
+        Setzt die Metrik (dict Knoten -> Wert), nach der bei dichter Ansicht die
+        Top-k-Knoten beschriftet werden. None = Knotengrad.
+        """
+        self._label_metric = values
+        self._prepare_lod_data()
+        self._apply_lod()
+
+    #  Level-of-Detail 
+    def _prepare_lod_data(self):
+        """
+        Baut die NumPy-Arrays für Positionen, Kantenindizes und Label-Bewertung,
+        damit _apply_lod ohne Python-Schleifen über den Graphen auskommt.
+        """
+        nodes = self._node_list
+        index = {n: i for i, n in enumerate(nodes)}
+        self._positions = np.array([self._pos[n] for n in nodes], dtype=float).reshape(-1, 2)
+        self._edge_index = np.array(
+            [(index[u], index[v]) for u, v in self._G.edges()], dtype=np.int64
+        ).reshape(-1, 2)
+
+        if self._label_metric:
+            scores = [self._label_metric.get(n, 0) for n in nodes]
+        else:
+            scores = [d for _, d in self._G.degree(nodes)]
+        self._label_scores = np.asarray(scores, dtype=float)
+
+    def _schedule_lod(self, event=None):
+        # Kamera-Events kommen in schneller Folge; gebündelt auswerten
+        if not self._lod_timer.running:
+            self._lod_timer.start()
+
+    def _apply_lod(self, event=None):
+        """
+        Aktualisiert Labels und Kanten passend zum aktuellen Kamera-Ausschnitt:
+          - Labels nur für Knoten im Ausschnitt, sofern sie auf dem Bildschirm weit genug
+            auseinanderliegen, sonst nur für die Top-k-Knoten nach der gewählten Metrik.
+          - Kanten werden bei vielen Kanten auf ein Bildschirmraster aggregiert
+            (eine Linie pro Zellenpaar) und außerhalb des Ausschnitts verworfen.
+        Überschreitet die Aktualisierung LOD_FRAME_TIME_TARGET, wird die Detailstufe gröber.
+        """
+        start = time.perf_counter()
+        positions = self._positions
+        if len(positions) == 0:
+            return
 
-        # Labels aktualisieren 
-        labels    = [str(n) for n in nodes]
-        label_pos = positions + np.array([0.0, 0.04])
-        self.label_visual.text = labels
-        self.label_visual.pos  = label_pos
+        rect = self.camera.rect
+        left, right = sorted((rect.left, rect.right))
+        bottom, top = sorted((rect.bottom, rect.top))
+        width_px, height_px = self.size
+        px_per_unit = width_px / max(right - left, 1e-12)
 
+        # Labels 
+        inside = (
+            (positions[:, 0] >= left) & (positions[:, 0] <= right) &
+            (positions[:, 1] >= bottom) & (positions[:, 1] <= top)
+        )
+        visible = np.flatnonzero(inside)
+        if len(visible):
+            spacing_px = np.sqrt(width_px * height_px / len(visible))
+            if spacing_px < LOD_LABEL_MIN_SPACING_PX * self._lod_scale:
+                k = max(1, int(LOD_LABEL_TOP_K / self._lod_scale))
+                if len(visible) > k:
+                    top_k = np.argpartition(-self._label_scores[visible], k - 1)[:k]
+                    visible = visible[top_k]
+        if len(visible):
+            self.label_visual.text = [str(self._node_list[i]) for i in visible]
+            self.label_visual.pos = positions[visible] + np.array([0.0, 12.0 / px_per_unit])
+            self.label_visual.visible = True
+        else:
+            self.label_visual.visible = False
+
+        # Kanten 
+        edges = self._edge_index
+        p0 = positions[edges[:, 0]]
+        p1 = positions[edges[:, 1]]
+        # Kanten, deren Bounding-Box den Ausschnitt nicht schneidet, verwerfen
+        in_view = (
+            (np.minimum(p0[:, 0], p1[:, 0]) <= right) & (np.maximum(p0[:, 0], p1[:, 0]) >= left) &
+            (np.minimum(p0[:, 1], p1[:, 1]) <= top) & (np.maximum(p0[:, 1], p1[:, 1]) >= bottom)
+        )
+        p0, p1 = p0[in_view], p1[in_view]
+        width = 2
+
+        if len(edges) > LOD_EDGE_THRESHOLD and len(p0):
+            # Endpunkte auf Rasterzellen abbilden und parallele Kanten zusammenfassen
+            cell = LOD_EDGE_CELL_PX * self._lod_scale / px_per_unit
+            c0 = np.floor(p0 / cell).astype(np.int64)
+            c1 = np.floor(p1 / cell).astype(np.int64)
+            a = c0[:, 0] * 2_000_003 + c0[:, 1]
+            b = c1[:, 0] * 2_000_003 + c1[:, 1]
+            keep = a != b
+            pairs = np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1)[keep]
+            _, first = np.unique(pairs, axis=0, return_index=True)
+            p0 = (c0[keep][first] + 0.5) * cell
+            p1 = (c1[keep][first] + 0.5) * cell
+            width = 1
+
+        if len(p0):
+            segments = np.empty((2 * len(p0), 2))
+            segments[0::2] = p0
+            segments[1::2] = p1
+            self.edge_visual.set_data(pos=segments, width=width)
+            self.edge_visual.visible = True
+        else:
+            self.edge_visual.visible = False
+
+        # Frame-Zeit-Ziel: Detailstufe adaptiv anpassen
+        elapsed = time.perf_counter() - start
+        if elapsed > LOD_FRAME_TIME_TARGET:
+            self._lod_scale = min(self._lod_scale * 1.5, 8.0)
+        elif elapsed < LOD_FRAME_TIME_TARGET / 2:
+            self._lod_scale = max(self._lod_scale / 1.25, 1.0)
         self.update()
 
+    def _node_at(self, event):
+        """
+        Index des Knotens unter dem Mauszeiger oder None.
+        """
+        if not self._node_list:
+            return None
+        mapped   = self.view.camera.transform.imap(event.pos)
+        data_pos = np.array(mapped[:2])
+        dists    = np.linalg.norm(self._positions - data_pos, axis=1)
+        idx      = int(np.argmin(dists))
+        return idx if dists[idx] < 0.05 else None
+
     def on_mouse_press(self, event):
         if event.button == 1:
-            mapped   = self.view.camera.transform.imap(event.pos)
-            data_pos = np.array(mapped[:2])
-            coords   = np.array([self._pos[n] for n in self._node_list])
-            dists    = np.linalg.norm(coords - data_pos, axis=1)
-            idx      = int(np.argmin(dists))
-            if dists[idx] < 0.05:
+            idx = self._node_at(event)
+            if idx is not None:
                 self.picked_node       = idx
                 self.camera.interactive = False
 
+    def on_mouse_double_click(self, event):
+        if event.button == 1 and self.node_activated is not None:
+            idx = self._node_at(event)
+            if idx is not None:
+                self.node_activated(self._node_list[idx])
+
     def on_mouse_move(self, event):
+        # Beim Ziehen nur den Knoten verschieben: Kantenindex und Label-Bewertung bleiben
+        # gültig, Kanten und Labels folgen gebündelt über _schedule_lod
         if self.picked_node is not None and event.is_dragging:
             mapped   = self.view.camera.transform.imap(event.pos)
             new_pos  = np.array(mapped[:2])
             node_id  = self._node_list[self.picked_node]
             self._pos[node_id] = new_pos
-            self.update_graph(self._G, self._pos)
+            self._positions[self.picked_node] = new_pos
+            self.node_visual.set_data(self._positions, face_color=self._face_colors, size=10)
+            self._schedule_lod()
+            self.update()
 
     def on_mouse_release(self, event):
         if self.picked_node is not None:
@@ -257,21 +435,114 @@ class VisualizationSection(QWidget):
         self.worker = None
         self._highlight_nodes = set()
         self._highlight_periphery = set()
+        # Layout-Modus: "auto" (geografisch, falls genug Koordinaten vorhanden), "geo", "spring"
+        # oder "community" (Communities als grobe Ebene)
+        self.layout_mode = "auto"
+        # Knotenfärbung: "default" (Zentrum/Peripherie) oder "community"
+        self.color_mode = "default"
+        # Partition des aktuell geladenen Graphen (Knoten -> Community), bei Bedarf berechnet
+        self._communities = None
+        self._graphml_path = None
+        # Fokusansicht für große Graphen: Adjazenzindex + aktuell dargestellte Knotenpositionen
+        self.focus_index = None
+        self._focus_ids = np.zeros(0, dtype=np.int64)
+
+    def _communities_for(self, G):
+        """
+        Knoten -> Community für den geladenen Graphen (in der Fokusansicht die Partition des
+        vollständigen Graphen); backend/communities.py hält die Partition je Graph im Cache.
+        """
+        if self._communities is None:
+            index = self.focus_index if self.focus_index is not None else AdjacencyIndex.from_graph(G)
+            self._communities = node_communities(index)
+        return self._communities
+
+    def _initial_layout(self, G):
+        """
+        Wählt das Start-Layout gemäß self.layout_mode.
+        Rückgabe: (Positionen, True falls geografisch oder nach Communities – dann entfällt das Feintuning).
+        """
+        if self.layout_mode == "community":
+            pos = compute_community_layout(G, self._communities_for(G))
+            if pos is not None:
+                return pos, True
+        use_geo = self.layout_mode == "geo" or (
+            self.layout_mode == "auto" and geo_coverage(G) >= GEO_MIN_COVERAGE
+        )
+        if use_geo:
+            pos = compute_geo_layout(G)
+            if pos is not None:
+                return pos, True
+            print("Keine Koordinaten gefunden – verwende Force-Directed-Layout.")
+        return compute_layout(G, k=0.1, iterations=50), False
+
+    def set_color_mode(self, mode):
+        """
+        Setzt die Knotenfärbung ("default" oder "community") für den dargestellten Graphen.
+        """
+        self.color_mode = mode
+        if self.canvas is not None:
+            self.canvas.set_communities(self._communities_for(self.canvas._G) if mode == "community" else None)
+
+    def set_layout_mode(self, mode):
+        """
+        Setzt den Layout-Modus und zeichnet den aktuell geladenen Graphen neu.
+        """
+        self.layout_mode = mode
+        if self._graphml_path:
+            self.load_graph_from_path(self._graphml_path, self._highlight_nodes, self._highlight_periphery)
 
     def load_graph_from_path(self, graphml_path, highlight_nodes=None, highlight_periphery=None):
+        self._highlight_nodes = set(highlight_nodes or [])
+        self._highlight_periphery = set(highlight_periphery or [])
+        self._communities = None
+
+        # Große Graphen: nur einen begrenzten Ausschnitt aus dem (gecachten) Adjazenzindex darstellen
+        index = load_cached_index(graphml_path)
+        if index is not None and index.number_of_nodes > FOCUS_NODE_THRESHOLD:
+            self._graphml_path = graphml_path
+            self.enter_focus_mode(index)
+            return
+
         G = load_graph(graphml_path)
         if G is None:
             return
-        pos0 = compute_layout(G, k=0.1, iterations=50)
+        if G.number_of_nodes() > FOCUS_NODE_THRESHOLD:
+            self._graphml_path = graphml_path
+            self.enter_focus_mode(build_cached_index(graphml_path, G))
+            return
+
+        self.focus_index = None
+        pos0, is_geo = self._initial_layout(G)
         if pos0 is None:
             return
+        self._graphml_path = graphml_path
+        self._show_graph(G, pos0)
 
-        self._highlight_nodes = set(highlight_nodes or [])
-        self._highlight_periphery = set(highlight_periphery or [])
+        # Asynchrones Feintuning (entfällt beim geografischen Layout)
+        self._stop_worker()
+        if is_geo:
+            print("Graph mit festem Layout (geografisch bzw. nach Communities) geladen.")
+            return
+        self.worker = LayoutWorker(G, k=0.1, iterations=200)
+        self.worker.layout_ready.connect(lambda new_pos: self.canvas.update_graph(G, new_pos))
+        self.worker.start()
 
+        print("Graph & Layout initial geladen; Feintuning läuft.")
+
+    def _stop_worker(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            self.worker.wait()
+
+    def _show_graph(self, G, pos):
+        """
+        Erzeugt den Canvas beim ersten Aufruf, sonst werden Graph und Positionen ersetzt.
+        """
+        communities = self._communities_for(G) if self.color_mode == "community" else None
         if self.canvas is None:
             self.canvas = NetworkCanvas(
-                G, pos0,
+                G, pos,
                 highlight_nodes=self._highlight_nodes,
                 highlight_periphery=self._highlight_periphery,
                 parent=self
@@ -281,21 +552,83 @@ class VisualizationSection(QWidget):
             self.canvas.native.setContextMenuPolicy(Qt.CustomContextMenu)
             #  Signal verbinden
             self.canvas.native.customContextMenuRequested.connect(self._show_context_menu)
+            # Doppelklick auf einen Knoten erweitert die Fokusansicht
+            self.canvas.node_activated = self.expand_focus_node
+            if communities is not None:
+                self.canvas.set_communities(communities)
 
         else:
             self.canvas.highlight_nodes = self._highlight_nodes
             self.canvas.highlight_periphery = self._highlight_periphery
-            self.canvas.update_graph(G, pos0)
+            self.canvas.communities = communities
+            self.canvas.legend_node.visible = communities is None
+            self.canvas.update_graph(G, pos)
 
-        # Asynchrones Feintuning
-        if self.worker and self.worker.isRunning():
-            self.worker.stop()
-            self.worker.wait()
-        self.worker = LayoutWorker(G, k=0.1, iterations=200)
-        self.worker.layout_ready.connect(lambda new_pos: self.canvas.update_graph(G, new_pos))
-        self.worker.start()
+    #  Fokusansicht (begrenzter Ausschnitt großer Graphen) 
+    def enter_focus_mode(self, index, mode="degree"):
+        """
+        Zeigt statt des vollständigen Graphen einen Ausschnitt mit höchstens FOCUS_MAX_NODES Knoten.
+        mode: "degree" / "pagerank" (Top-k-Knoten) oder "sample" (gradtreue Stichprobe).
+        """
+        if index is not self.focus_index:
+            self._communities = None
+        self.focus_index = index
+        if mode == "sample":
+            ids = degree_preserving_sample(index, FOCUS_MAX_NODES)
+        else:
+            ids = top_k_nodes(index, FOCUS_MAX_NODES, metric=mode)
+        print(f"Fokusansicht ({mode}): {len(ids)} von {index.number_of_nodes} Knoten.")
+        self._show_focus(ids)
 
-        print("Graph & Layout initial geladen; Feintuning läuft.")
+    def focus_on_node(self, node, hops=1):
+        """
+        Zeigt das k-Hop-Ego-Netz eines gesuchten Knotens.
+        """
+        if self.focus_index is None:
+            if self.canvas is None:
+                return
+            self.focus_index = AdjacencyIndex.from_graph(self.canvas._G)
+        center = self.focus_index.position(node)
+        if center is None:
+            print(f"Knoten {node} nicht gefunden.")
+            return
+        self._show_focus(ego_nodes(self.focus_index, center, hops=hops, max_nodes=FOCUS_MAX_NODES))
+
+    def _show_focus(self, ids, pos=None):
+        self._stop_worker()
+        self._focus_ids = np.unique(ids)
+        H = induced_subgraph(self.focus_index, self._focus_ids)
+        if pos is None and self.layout_mode == "community":
+            pos = compute_community_layout(H, self._communities_for(H))
+        pos = compute_layout(H, k=0.1, iterations=50) if pos is None else pos
+        if pos is not None:
+            self._show_graph(H, pos)
+
+    def expand_focus_node(self, node):
+        """
+        Lädt die Nachbarn eines angeklickten Knotens aus dem Adjazenzindex nach
+        (höchstens FOCUS_EXPAND_LIMIT, insgesamt nie mehr als FOCUS_MAX_NODES).
+        """
+        if self.focus_index is None:
+            return
+        index = self.focus_index
+        center = index.position(node)
+        room = min(FOCUS_EXPAND_LIMIT, FOCUS_MAX_NODES - len(self._focus_ids))
+        if center is None or room <= 0:
+            print("Fokusansicht hat die maximale Größe erreicht.")
+            return
+        new = np.setdiff1d(index.neighbors(center), self._focus_ids)
+        new = new[np.argsort(-index.degree[new], kind="stable")[:room]]
+        if len(new) == 0:
+            return
+
+        # Bisherige Positionen behalten, neue Knoten im Kreis um den angeklickten Knoten anordnen
+        pos = dict(self.canvas._pos)
+        angles = np.linspace(0, 2 * np.pi, len(new), endpoint=False)
+        ring = np.column_stack([np.cos(angles), np.sin(angles)]) * 0.1
+        for i, offset in zip(new, ring):
+            pos[index.nodes[i]] = np.asarray(pos[node]) + offset
+        self._show_focus(np.concatenate([self._focus_ids, new]), pos=pos)
 
     def get_generated_image(self):
         """
@@ -322,9 +655,54 @@ class VisualizationSection(QWidget):
     def _show_context_menu(self, pos):
         menu = QMenu(self)
         save_act = menu.addAction("Bild speichern…")
+        # Metrik für die Top-k-Beschriftung bei dichter Ansicht
+        label_menu = menu.addMenu("Beschriftung nach")
+        degree_act = label_menu.addAction("Knotengrad")
+        pagerank_act = label_menu.addAction("PageRank")
+        # Layout-Modus
+        layout_menu = menu.addMenu("Layout")
+        layout_actions = {}
+        for mode, label in (("auto", "Automatisch"), ("geo", "Geografisch"), ("spring", "Force-Directed"),
+                            ("community", "Nach Communities")):
+            act = layout_menu.addAction(label)
+            act.setCheckable(True)
+            act.setChecked(self.layout_mode == mode)
+            layout_actions[act] = mode
+        # Knotenfärbung
+        color_menu = menu.addMenu("Färbung")
+        color_actions = {}
+        for mode, label in (("default", "Zentrum/Peripherie"), ("community", "Nach Communities")):
+            act = color_menu.addAction(label)
+            act.setCheckable(True)
+            act.setChecked(self.color_mode == mode)
+            color_actions[act] = mode
+        # Fokusansicht für große Graphen
+        focus_menu = menu.addMenu("Fokus")
+        focus_actions = {}
+        if self.focus_index is not None:
+            for mode, label in (("degree", "Top-k nach Grad"), ("pagerank", "Top-k nach PageRank"),
+                                ("sample", "Gradtreue Stichprobe")):
+                focus_actions[focus_menu.addAction(label)] = mode
+        ego_act = focus_menu.addAction("Ego-Netz eines Knotens…")
         # Menü 
         action = menu.exec_(self.canvas.native.mapToGlobal(pos))
-        if action == save_act:
+        if action in layout_actions:
+            self.set_layout_mode(layout_actions[action])
+        elif action in color_actions:
+            self.set_color_mode(color_actions[action])
+        elif action in focus_actions:
+            self.enter_focus_mode(self.focus_index, focus_actions[action])
+        elif action == ego_act:
+            node, ok = QInputDialog.getText(self, "Ego-Netz", "Knotenname:")
+            if ok and node:
+                hops, ok = QInputDialog.getInt(self, "Ego-Netz", "Anzahl Hops:", 1, 1, 5)
+                if ok:
+                    self.focus_on_node(node.strip(), hops)
+        elif action == degree_act:
+            self.canvas.set_label_metric(None)
+        elif action == pagerank_act:
+            self.canvas.set_label_metric(nx.pagerank(self.canvas._G))
+        elif action == save_act:
             img = self.get_generated_image()
             if img is not None:
                 # Speichern-Dialog
@@ -1,21 +1,52 @@
+import os
 import sys
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QTabWidget, QStatusBar, QSplitter
 )
-from PyQt5.QtCore import Qt, QSettings
+from PyQt5.QtCore import Qt, QSettings, QTimer
 
 from frontend.components.styles import apply_dark_fusion_palette, apply_light_fusion_palette
 from frontend.components.toolbar import Toolbar
 from frontend.components.upload_panel import UploadPanel
-from frontend.components.single_graph_tab import SingleGraphTab
-from frontend.components.dataset_analysis_tab import DatasetAnalysisTab
+
+# Ist diese Umgebungsvariable gesetzt, meldet die GUI die Startzeitpunkte und beendet sich
+# danach wieder (siehe benchmark_startup.py).
+STARTUP_BENCHMARK_ENV = "NETWORK_ANALYZER_STARTUP_BENCHMARK"
+
+
+class LazyTab(QWidget):
+    """
+    Platzhalter für einen Tab, dessen eigentliches Widget erst bei der ersten Aktivierung
+    erzeugt wird. Die schweren Importe (NetworkX, vispy, Matplotlib) stecken in der Factory
+    und werden so erst nach dem ersten Zeichnen des Fensters ausgeführt.
+    """
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self):
+        if self.widget is None:
+            self.widget = self.factory(self)
+            self.layout().addWidget(self.widget)
+        return self.widget
 
 
 class NetworkAnalysisGUI(QMainWindow):
     def __init__(self):
         super().__init__()
 
+        # Tabs werden bei Bedarf erzeugt; bis dahin sind die Attribute None
+        self.single_graph_tab = None
+        self.dataset_tab = None
+        self._first_paint_done = False
+        self._benchmark = bool(os.environ.get(STARTUP_BENCHMARK_ENV))
+
         self.setWindowTitle("Netzwerkanalyse-Tool (neue HCI-GUI)")
         self.setGeometry(100, 100, 1200, 800)
 
@@ -60,11 +91,10 @@ class NetworkAnalysisGUI(QMainWindow):
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(self.splitter)
 
-        # Tabs initialisieren
-        self.single_graph_tab = SingleGraphTab(self)
-        self.tabs.addTab(self.single_graph_tab, "Einzelgraph-Analyse")
-        self.dataset_tab = DatasetAnalysisTab(self)
-        self.tabs.addTab(self.dataset_tab, "Datensatz-Analyse")
+        # Tabs initialisieren (Aufbau erst bei der ersten Aktivierung)
+        self.tabs.addTab(LazyTab(self._create_single_graph_tab), "Einzelgraph-Analyse")
+        self.tabs.addTab(LazyTab(self._create_dataset_tab), "Datensatz-Analyse")
+        self.tabs.currentChanged.connect(self._build_tab)
 
         # Toolbar hinzufügen
         self._init_toolbar()
@@ -85,6 +115,50 @@ class NetworkAnalysisGUI(QMainWindow):
         # Verbinde Signal splitterMoved, um Inhalt bei manueller Anpassung zu kontrollieren
         self.splitter.splitterMoved.connect(self.on_splitter_moved)
 
+    def _create_single_graph_tab(self, parent):
+        from frontend.components.single_graph_tab import SingleGraphTab
+        self.single_graph_tab = SingleGraphTab(parent)
+        return self.single_graph_tab
+
+    def _create_dataset_tab(self, parent):
+        from frontend.components.dataset_analysis_tab import DatasetAnalysisTab
+        self.dataset_tab = DatasetAnalysisTab(parent)
+        return self.dataset_tab
+
+    def _build_tab(self, index):
+        tab = self.tabs.widget(index)
+        if isinstance(tab, LazyTab) and tab.widget is None:
+            if hasattr(self, "status_bar"):
+                self.status_bar.showMessage("Lade Ansicht...")
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                tab.ensure_built()
+            finally:
+                QApplication.restoreOverrideCursor()
+                if hasattr(self, "status_bar"):
+                    self.status_bar.clearMessage()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._first_paint_done:
+            return
+        # Erst nach dem ersten Zeichnen den sichtbaren Tab aufbauen
+        self._first_paint_done = True
+        if self._benchmark:
+            print(f"STARTUP first_paint={time.time():.6f}", flush=True)
+        QTimer.singleShot(0, self._on_first_paint)
+
+    def _on_first_paint(self):
+        self._build_tab(self.tabs.currentIndex())
+        if self._benchmark:
+            print(f"STARTUP tab_ready={time.time():.6f}", flush=True)
+            QApplication.instance().quit()
+
+    def closeEvent(self, event):
+        # Worker-Prozesse beenden; offene Jobs bleiben in der Queue für den nächsten Start
+        self.upload_panel.shutdown_workers()
+        super().closeEvent(event)
+
     def _init_toolbar(self):
         self.toolbar = Toolbar(self)
         self.addToolBar(self.toolbar)